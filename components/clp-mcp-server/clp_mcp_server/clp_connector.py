@@ -1,11 +1,21 @@
 """ClpConnector: A class to interact with the CLP database and results cache."""
 
 import asyncio
+import logging
 from typing import Any
 
 import aiomysql
 import msgpack
+import redis.asyncio
 from clp_py_utils.clp_config import CLP_DEFAULT_DATASET_NAME, ClpDbNameType
+from clp_py_utils.job_notifications import (
+    AsyncJobNotificationSubscriber,
+    create_async_redis_client,
+    get_query_job_finished_channel,
+    NOTIFIED_JOB_STATUS_POLL_DELAY,
+    publish_job_notification_async,
+    QUERY_JOB_CREATED_CHANNEL,
+)
 from pymongo import AsyncMongoClient
 
 from clp_mcp_server.constants import (
@@ -14,7 +24,9 @@ from clp_mcp_server.constants import (
     QueryJobType,
     SEARCH_MAX_NUM_RESULTS,
 )
-from clp_mcp_server.settings import CLP_DB_PASS, CLP_DB_USER
+from clp_mcp_server.settings import CLP_DB_PASS, CLP_DB_USER, CLP_REDIS_PASS
+
+logger = logging.getLogger(__name__)
 
 
 class ClpConnector:
@@ -37,6 +49,13 @@ class ClpConnector:
 
         self._webui_addr = f"http://{clp_config.webui.host}:{clp_config.webui.port}"
 
+        # Client for job notifications, which are disabled if Redis isn't configured.
+        self._redis_client: redis.asyncio.Redis | None = None
+        if clp_config.redis is not None and CLP_REDIS_PASS:
+            self._redis_client = create_async_redis_client(
+                clp_config.redis.model_copy(update={"password": CLP_REDIS_PASS})
+            )
+
     async def submit_query(
         self, query: str, begin_ts: int | None = None, end_ts: int | None = None
     ) -> str:
@@ -81,6 +100,7 @@ class ClpConnector:
         if query_id is None:
             err_msg = "Failed to retrieve the ID of the submitted query."
             raise RuntimeError(err_msg)
+        await publish_job_notification_async(self._redis_client, QUERY_JOB_CREATED_CHANNEL, logger)
 
         await self._results_cache.create_collection(query_id)
 
@@ -131,24 +151,40 @@ class ClpConnector:
         event_loop = asyncio.get_running_loop()
         start_time = event_loop.time()
 
-        while True:
-            status = await self.read_job_status(query_id)
-            if status == QueryJobStatus.SUCCEEDED:
-                break
-            if status in error_states:
-                err_msg = (
-                    f"Query job with ID {query_id} ended in status {QueryJobStatus(status).name}."
-                )
-                raise RuntimeError(err_msg)
-            if status not in waiting_states:
-                err_msg = f"Query job with ID {query_id} has unknown status {status}."
-                raise RuntimeError(err_msg)
-
-            if timeout and (event_loop.time() - start_time) > timeout:
-                err_msg = f"Timeout waiting for query job with ID {query_id} to complete."
-                raise TimeoutError(err_msg)
-
-            await asyncio.sleep(POLLING_INTERVAL_SECONDS)
+        # Subscribe before the status is first read so that the query's completion can't be missed.
+        job_finished_subscriber = AsyncJobNotificationSubscriber(
+            self._redis_client, [get_query_job_finished_channel(query_id)], logger
+        )
+        await job_finished_subscriber.subscribe()
+        try:
+            while True:
+                status = await self.read_job_status(query_id)
+                if status == QueryJobStatus.SUCCEEDED:
+                    break
+                if status in error_states:
+                    err_msg = (
+                        f"Query job with ID {query_id} ended in status"
+                        f" {QueryJobStatus(status).name}."
+                    )
+                    raise RuntimeError(err_msg)
+                if status not in waiting_states:
+                    err_msg = f"Query job with ID {query_id} has unknown status {status}."
+                    raise RuntimeError(err_msg)
+
+                elapsed_time = event_loop.time() - start_time
+                if timeout and elapsed_time > timeout:
+                    err_msg = f"Timeout waiting for query job with ID {query_id} to complete."
+                    raise TimeoutError(err_msg)
+
+                # Notifications can be lost, so the status is still polled, just less frequently.
+                poll_delay: float = POLLING_INTERVAL_SECONDS
+                if job_finished_subscriber.is_active():
+                    poll_delay = NOTIFIED_JOB_STATUS_POLL_DELAY
+                    if timeout:
+                        poll_delay = min(poll_delay, timeout - elapsed_time)
+                await job_finished_subscriber.wait(poll_delay)
+        finally:
+            await job_finished_subscriber.close()
 
     async def read_results(self, query_id: str) -> list[dict]:
         """
@@ -4,3 +4,4 @@ import os
 
 CLP_DB_USER = os.environ.get("CLP_DB_USER", "clp-user")
 CLP_DB_PASS = os.environ.get("CLP_DB_PASS", "<no_password_set>")
+CLP_REDIS_PASS = os.environ.get("CLP_REDIS_PASS")
@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from clp_py_utils.clp_config import ClpDbNameType
+from clp_py_utils.job_notifications import NOTIFIED_JOB_STATUS_POLL_DELAY
 
 from clp_mcp_server.clp_connector import ClpConnector, QueryJobStatus
 
@@ -20,6 +21,7 @@ def mock_clp_config() -> Any:
         ),
         database=SimpleNamespace(host="database", port=3306, names={ClpDbNameType.CLP: "clp-db"}),
         webui=SimpleNamespace(host="localhost", port=4000),
+        redis=None,
     )
 
 
@@ -86,6 +88,27 @@ async def test_wait_query_completion_succeeded(mock_clp_config: Any) -> None:
         await connector.wait_query_completion("42")
 
 
+@pytest.mark.asyncio
+async def test_wait_query_completion_with_notifications(mock_clp_config: Any) -> None:
+    """Tests that waiting for a query polls less frequently when notified of its completion."""
+    connector = ClpConnector(mock_clp_config)
+    statuses = [QueryJobStatus.RUNNING, QueryJobStatus.SUCCEEDED]
+    connector.read_job_status = AsyncMock(side_effect=statuses)
+    subscriber = MagicMock()
+    subscriber.subscribe = AsyncMock()
+    subscriber.wait = AsyncMock(return_value=True)
+    subscriber.close = AsyncMock()
+    subscriber.is_active.return_value = True
+    with patch(
+        "clp_mcp_server.clp_connector.AsyncJobNotificationSubscriber", return_value=subscriber
+    ):
+        await connector.wait_query_completion("42")
+
+    subscriber.subscribe.assert_awaited_once()
+    subscriber.wait.assert_awaited_once_with(NOTIFIED_JOB_STATUS_POLL_DELAY)
+    subscriber.close.assert_awaited_once()
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     ("fail_status", "exc_type"),
@@ -588,6 +588,9 @@ class BaseController(ABC):
         # Resources
         env_vars |= {
             "CLP_QUERY_WORKER_CONCURRENCY": str(num_workers),
+            "CLP_QUERY_WORKER_PREFETCH_MULTIPLIER": str(
+                self._clp_config.query_worker.prefetch_multiplier
+            ),
         }
 
         return env_vars
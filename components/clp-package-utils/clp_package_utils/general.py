@@ -332,6 +332,9 @@ def generate_worker_config(clp_config: ClpConfig) -> WorkerConfig:
     worker_config.archive_output = clp_config.archive_output.model_copy(deep=True)
     worker_config.tmp_directory = clp_config.tmp_directory
 
+    worker_config.compression_worker = clp_config.compression_worker.model_copy(deep=True)
+    worker_config.query_worker = clp_config.query_worker.model_copy(deep=True)
+
     worker_config.stream_output = clp_config.stream_output
     worker_config.stream_collection_name = clp_config.results_cache.stream_collection_name
 
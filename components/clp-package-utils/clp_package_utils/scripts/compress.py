@@ -11,7 +11,9 @@ from clp_py_utils.clp_config import (
     CLP_DB_USER_ENV_VAR_NAME,
     CLP_DEFAULT_CONFIG_FILE_RELATIVE_PATH,
     CLP_DEFAULT_DATASET_NAME,
+    CLP_REDIS_PASS_ENV_VAR_NAME,
     ClpDbUserType,
+    PartitioningStrategy,
     StorageEngine,
     StorageType,
 )
@@ -28,6 +30,7 @@ from clp_package_utils.general import (
     JobType,
     load_config_file,
     validate_and_load_db_credentials_file,
+    validate_and_load_redis_credentials_file,
     validate_dataset_name,
 )
 
@@ -101,6 +104,9 @@ def _generate_compress_cmd(
         compress_cmd.append("--unstructured")
     if parsed_args.no_progress_reporting is True:
         compress_cmd.append("--no-progress-reporting")
+    if parsed_args.partitioning_strategy is not None:
+        compress_cmd.append("--partitioning-strategy")
+        compress_cmd.append(parsed_args.partitioning_strategy)
 
     compress_cmd.append("--logs-list")
     compress_cmd.append(str(logs_list_path))
@@ -158,6 +164,13 @@ def main(argv):
     args_parser.add_argument(
         "--no-progress-reporting", action="store_true", help="Disables progress reporting."
     )
+    args_parser.add_argument(
+        "--partitioning-strategy",
+        choices=[strategy.value for strategy in PartitioningStrategy],
+        default=None,
+        help="How to split the input into archives. Defaults to"
+        " `archive_output.partitioning_strategy` in the CLP package configuration file.",
+    )
     args_parser.add_argument("paths", metavar="PATH", nargs="*", help="Paths to compress.")
     args_parser.add_argument(
         "-f", "--path-list", dest="path_list", help="A file listing all paths to compress."
@@ -177,6 +190,8 @@ def main(argv):
 
         # Validate and load necessary credentials
         validate_and_load_db_credentials_file(clp_config, clp_home, False)
+        if clp_config.redis is not None:
+            validate_and_load_redis_credentials_file(clp_config, clp_home, False)
     except Exception:
         logger.exception("Failed to load config.")
         return -1
@@ -248,6 +263,9 @@ def main(argv):
         CLP_DB_PASS_ENV_VAR_NAME: credentials[ClpDbUserType.CLP].password,
         CLP_DB_USER_ENV_VAR_NAME: credentials[ClpDbUserType.CLP].username,
     }
+    if clp_config.redis is not None:
+        # Lets the job's client publish and receive job notifications
+        extra_env_vars[CLP_REDIS_PASS_ENV_VAR_NAME] = clp_config.redis.password
     container_start_cmd = generate_container_start_cmd(
         container_name, necessary_mounts, clp_config.container_image_ref, extra_env_vars
     )
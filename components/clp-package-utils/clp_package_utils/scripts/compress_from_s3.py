@@ -11,7 +11,9 @@ from clp_py_utils.clp_config import (
     CLP_DB_USER_ENV_VAR_NAME,
     CLP_DEFAULT_CONFIG_FILE_RELATIVE_PATH,
     CLP_DEFAULT_DATASET_NAME,
+    CLP_REDIS_PASS_ENV_VAR_NAME,
     ClpDbUserType,
+    PartitioningStrategy,
     StorageEngine,
     StorageType,
 )
@@ -29,6 +31,7 @@ from clp_package_utils.general import (
     S3_KEY_PREFIX_COMPRESSION,
     S3_OBJECT_COMPRESSION,
     validate_and_load_db_credentials_file,
+    validate_and_load_redis_credentials_file,
     validate_dataset_name,
 )
 
@@ -105,6 +108,9 @@ def _generate_compress_cmd(
         compress_cmd.append("--unstructured")
     if parsed_args.no_progress_reporting is True:
         compress_cmd.append("--no-progress-reporting")
+    if parsed_args.partitioning_strategy is not None:
+        compress_cmd.append("--partitioning-strategy")
+        compress_cmd.append(parsed_args.partitioning_strategy)
 
     compress_cmd.append("--logs-list")
     compress_cmd.append(str(url_list_path))
@@ -188,6 +194,13 @@ def main(argv):
     args_parser.add_argument(
         "--no-progress-reporting", action="store_true", help="Disables progress reporting."
     )
+    args_parser.add_argument(
+        "--partitioning-strategy",
+        choices=[strategy.value for strategy in PartitioningStrategy],
+        default=None,
+        help="How to split the input into archives. Defaults to"
+        " `archive_output.partitioning_strategy` in the CLP package configuration file.",
+    )
 
     subparsers = args_parser.add_subparsers(dest="subcommand", required=True)
 
@@ -223,6 +236,8 @@ def main(argv):
         clp_config.validate_logs_dir(True)
 
         validate_and_load_db_credentials_file(clp_config, clp_home, False)
+        if clp_config.redis is not None:
+            validate_and_load_redis_credentials_file(clp_config, clp_home, False)
     except Exception:
         logger.exception("Failed to load config.")
         return -1
@@ -302,6 +317,9 @@ def main(argv):
         CLP_DB_PASS_ENV_VAR_NAME: credentials[ClpDbUserType.CLP].password,
         CLP_DB_USER_ENV_VAR_NAME: credentials[ClpDbUserType.CLP].username,
     }
+    if clp_config.redis is not None:
+        # Lets the job's client publish and receive job notifications
+        extra_env_vars[CLP_REDIS_PASS_ENV_VAR_NAME] = clp_config.redis.password
     container_start_cmd = generate_container_start_cmd(
         container_name, necessary_mounts, clp_config.container_image_ref, extra_env_vars
     )
@@ -10,6 +10,7 @@ from clp_py_utils.clp_config import (
     CLP_DB_USER_ENV_VAR_NAME,
     CLP_DEFAULT_CONFIG_FILE_RELATIVE_PATH,
     CLP_DEFAULT_DATASET_NAME,
+    CLP_REDIS_PASS_ENV_VAR_NAME,
     ClpConfig,
     ClpDbUserType,
     StorageEngine,
@@ -32,6 +33,7 @@ from clp_package_utils.general import (
     JobType,
     load_config_file,
     validate_and_load_db_credentials_file,
+    validate_and_load_redis_credentials_file,
     validate_dataset_name,
     validate_path_could_be_dir,
 )
@@ -57,6 +59,8 @@ def validate_and_load_config(
 
         # Validate and load necessary credentials
         validate_and_load_db_credentials_file(clp_config, clp_home, False)
+        if clp_config.redis is not None:
+            validate_and_load_redis_credentials_file(clp_config, clp_home, False)
         return clp_config
     except:
         logger.exception("Failed to load config.")
@@ -217,6 +221,9 @@ def handle_extract_stream_cmd(
         CLP_DB_PASS_ENV_VAR_NAME: credentials[ClpDbUserType.CLP].password,
         CLP_DB_USER_ENV_VAR_NAME: credentials[ClpDbUserType.CLP].username,
     }
+    if clp_config.redis is not None:
+        # Lets the job's client publish and receive job notifications
+        extra_env_vars[CLP_REDIS_PASS_ENV_VAR_NAME] = clp_config.redis.password
     container_start_cmd = generate_container_start_cmd(
         container_name, necessary_mounts, clp_config.container_image_ref, extra_env_vars
     )
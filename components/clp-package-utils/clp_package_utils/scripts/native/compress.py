@@ -14,8 +14,16 @@ from clp_py_utils.clp_config import (
     CLP_DEFAULT_CONFIG_FILE_RELATIVE_PATH,
     ClpConfig,
     COMPRESSION_JOBS_TABLE_NAME,
+    PartitioningStrategy,
+    Redis,
     StorageType,
 )
+from clp_py_utils.job_notifications import (
+    COMPRESSION_JOB_CREATED_CHANNEL,
+    create_redis_client,
+    load_job_notifications_redis_config,
+    publish_job_notification,
+)
 from clp_py_utils.pretty_size import pretty_size
 from clp_py_utils.s3_utils import parse_s3_url
 from clp_py_utils.sql_adapter import SqlAdapter
@@ -114,7 +122,12 @@ def handle_job_update(db, db_cursor, job_id, no_progress_reporting):
         time.sleep(0.5)
 
 
-def handle_job(sql_adapter: SqlAdapter, clp_io_config: ClpIoConfig, no_progress_reporting: bool):
+def handle_job(
+    sql_adapter: SqlAdapter,
+    clp_io_config: ClpIoConfig,
+    no_progress_reporting: bool,
+    job_notifications_redis_config: Redis | None = None,
+):
     with (
         closing(sql_adapter.create_connection(True)) as db,
         closing(db.cursor(dictionary=True)) as db_cursor,
@@ -131,6 +144,9 @@ def handle_job(sql_adapter: SqlAdapter, clp_io_config: ClpIoConfig, no_progress_
             db.commit()
             job_id = db_cursor.lastrowid
             logger.info(f"Compression job {job_id} submitted.")
+            if job_notifications_redis_config is not None:
+                with create_redis_client(job_notifications_redis_config) as redis_client:
+                    publish_job_notification(redis_client, COMPRESSION_JOB_CREATED_CHANNEL, logger)
 
             handle_job_update(db, db_cursor, job_id, no_progress_reporting)
         except Exception as ex:
@@ -350,6 +366,13 @@ def main(argv):
         action="store_true",
         help="Treat all inputs as unstructured text logs.",
     )
+    args_parser.add_argument(
+        "--partitioning-strategy",
+        choices=[strategy.value for strategy in PartitioningStrategy],
+        default=None,
+        help="How to split the input into archives. Defaults to"
+        " `archive_output.partitioning_strategy` in the CLP package configuration file.",
+    )
     parsed_args = args_parser.parse_args(argv[1:])
     if parsed_args.verbose:
         logger.setLevel(logging.DEBUG)
@@ -378,6 +401,10 @@ def main(argv):
         return -1
 
     clp_output_config = OutputConfig.model_validate(clp_config.archive_output.model_dump())
+    if parsed_args.partitioning_strategy is not None:
+        clp_output_config.partitioning_strategy = PartitioningStrategy(
+            parsed_args.partitioning_strategy
+        )
     clp_io_config = ClpIoConfig(input=clp_input_config, output=clp_output_config)
 
     mysql_adapter = SqlAdapter(clp_config.database)
@@ -385,6 +412,7 @@ def main(argv):
         sql_adapter=mysql_adapter,
         clp_io_config=clp_io_config,
         no_progress_reporting=parsed_args.no_progress_reporting,
+        job_notifications_redis_config=load_job_notifications_redis_config(clp_config, logger),
     )
 
 
@@ -17,8 +17,10 @@ from clp_py_utils.clp_config import (
     ClpDbNameType,
     ClpDbUserType,
     Database,
+    Redis,
 )
 from clp_py_utils.clp_metadata_db_utils import get_files_table_name
+from clp_py_utils.job_notifications import load_job_notifications_redis_config
 from clp_py_utils.sql_adapter import SqlAdapter
 from job_orchestration.scheduler.constants import QueryJobStatus, QueryJobType
 from job_orchestration.scheduler.job_config import (
@@ -84,17 +86,20 @@ def submit_and_monitor_extraction_job_in_db(
     db_config: Database,
     job_type: QueryJobType,
     job_config: QueryJobConfig,
+    job_notifications_redis_config: Redis | None,
 ) -> int:
     """
     Submits a stream extraction job to the scheduler and waits until it finishes.
     :param db_config:
     :param job_type:
     :param job_config:
+    :param job_notifications_redis_config: The config of the Redis instance for job notifications,
+        or None if notifications are disabled.
     :return: 0 on success, -1 otherwise.
     """
     sql_adapter = SqlAdapter(db_config)
-    job_id = submit_query_job(sql_adapter, job_config, job_type)
-    job_status = wait_for_query_job(sql_adapter, job_id)
+    job_id = submit_query_job(sql_adapter, job_config, job_type, job_notifications_redis_config)
+    job_status = wait_for_query_job(sql_adapter, job_id, job_notifications_redis_config)
 
     if QueryJobStatus.SUCCEEDED == job_status:
         logger.info(f"Finished extraction job {job_id}.")
@@ -169,6 +174,7 @@ def handle_extract_stream_cmd(
                 clp_config.database,
                 job_type,
                 job_config,
+                load_job_notifications_redis_config(clp_config, logger),
             )
         )
     except asyncio.CancelledError:
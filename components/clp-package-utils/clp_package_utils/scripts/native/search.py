@@ -14,8 +14,10 @@ import pymongo
 from clp_py_utils.clp_config import (
     CLP_DEFAULT_CONFIG_FILE_RELATIVE_PATH,
     Database,
+    Redis,
     ResultsCache,
 )
+from clp_py_utils.job_notifications import load_job_notifications_redis_config
 from clp_py_utils.sql_adapter import SqlAdapter
 from job_orchestration.scheduler.constants import QueryJobStatus, QueryJobType
 from job_orchestration.scheduler.job_config import AggregationConfig, SearchJobConfig
@@ -46,6 +48,7 @@ def create_and_monitor_job_in_db(
     network_address: tuple[str, int] | None,
     do_count_aggregation: bool | None,
     count_by_time_bucket_size: int | None,
+    job_notifications_redis_config: Redis | None,
 ):
     search_config = SearchJobConfig(
         datasets=datasets,
@@ -67,8 +70,13 @@ def create_and_monitor_job_in_db(
         )
 
     sql_adapter = SqlAdapter(db_config)
-    job_id = submit_query_job(sql_adapter, search_config, QueryJobType.SEARCH_OR_AGGREGATION)
-    job_status = wait_for_query_job(sql_adapter, job_id)
+    job_id = submit_query_job(
+        sql_adapter,
+        search_config,
+        QueryJobType.SEARCH_OR_AGGREGATION,
+        job_notifications_redis_config,
+    )
+    job_status = wait_for_query_job(sql_adapter, job_id, job_notifications_redis_config)
 
     if do_count_aggregation is None and count_by_time_bucket_size is None:
         return
@@ -122,6 +130,7 @@ async def do_search_without_aggregation(
     ignore_case: bool,
     path_filter: str | None,
     raw_output: bool,
+    job_notifications_redis_config: Redis | None,
 ):
     host = _get_ipv4_address()
     if host is None:
@@ -153,6 +162,7 @@ async def do_search_without_aggregation(
             (host, port),
             None,
             None,
+            job_notifications_redis_config,
         )
     )
 
@@ -190,6 +200,7 @@ async def do_search(
     do_count_aggregation: bool | None,
     count_by_time_bucket_size: int | None,
     raw_output: bool,
+    job_notifications_redis_config: Redis | None,
 ):
     if do_count_aggregation is None and count_by_time_bucket_size is None:
         await do_search_without_aggregation(
@@ -202,6 +213,7 @@ async def do_search(
             ignore_case,
             path_filter,
             raw_output,
+            job_notifications_redis_config,
         )
     else:
         await run_function_in_process(
@@ -217,6 +229,7 @@ async def do_search(
             None,
             do_count_aggregation,
             count_by_time_bucket_size,
+            job_notifications_redis_config,
         )
 
 
@@ -327,6 +340,7 @@ def main(argv):
                 parsed_args.count,
                 parsed_args.count_by_time,
                 parsed_args.raw,
+                load_job_notifications_redis_config(clp_config, logger),
             )
         )
     except asyncio.CancelledError:
@@ -1,18 +1,33 @@
 import asyncio
+import logging
 import multiprocessing
-import time
 from contextlib import closing
 
 import msgpack
 from clp_py_utils.clp_config import (
     Database,
     QUERY_JOBS_TABLE_NAME,
+    Redis,
 )
 from clp_py_utils.clp_metadata_db_utils import fetch_existing_datasets
+from clp_py_utils.job_notifications import (
+    create_redis_client,
+    get_query_job_finished_channel,
+    JobNotificationSubscriber,
+    NOTIFIED_JOB_STATUS_POLL_DELAY,
+    publish_job_notification,
+    QUERY_JOB_CREATED_CHANNEL,
+)
 from clp_py_utils.sql_adapter import SqlAdapter
 from job_orchestration.scheduler.constants import QueryJobStatus, QueryJobType
 from job_orchestration.scheduler.scheduler_data import QueryJobConfig
 
+logger = logging.getLogger(__file__)
+
+# Interval (in seconds) at which a query job's status is polled when notifications of the job's
+# completion aren't being received
+QUERY_JOB_STATUS_POLL_DELAY = 0.5
+
 
 async def run_function_in_process(function, *args, initializer=None, init_args=None):
     """
@@ -50,13 +65,18 @@ async def run_function_in_process(function, *args, initializer=None, init_args=N
 
 
 def submit_query_job(
-    sql_adapter: SqlAdapter, job_config: QueryJobConfig, job_type: QueryJobType
+    sql_adapter: SqlAdapter,
+    job_config: QueryJobConfig,
+    job_type: QueryJobType,
+    job_notifications_redis_config: Redis | None = None,
 ) -> int:
     """
-    Submits a query job.
+    Submits a query job and notifies the query scheduler of it.
     :param sql_adapter:
     :param job_config:
     :param job_type:
+    :param job_notifications_redis_config: The config of the Redis instance to publish the job's
+        creation to, or None if notifications are disabled.
     :return: The job's ID.
     """
     with (
@@ -69,7 +89,12 @@ def submit_query_job(
             (msgpack.packb(job_config.model_dump()), job_type),
         )
         db_conn.commit()
-        return db_cursor.lastrowid
+        job_id = db_cursor.lastrowid
+
+    if job_notifications_redis_config is not None:
+        with create_redis_client(job_notifications_redis_config) as redis_client:
+            publish_job_notification(redis_client, QUERY_JOB_CREATED_CHANNEL, logger)
+    return job_id
 
 
 def validate_datasets_exist(db_config: Database, datasets: list[str]) -> None:
@@ -94,16 +119,29 @@ def validate_datasets_exist(db_config: Database, datasets: list[str]) -> None:
             raise ValueError(err_msg)
 
 
-def wait_for_query_job(sql_adapter: SqlAdapter, job_id: int) -> QueryJobStatus:
+def wait_for_query_job(
+    sql_adapter: SqlAdapter, job_id: int, job_notifications_redis_config: Redis | None = None
+) -> QueryJobStatus:
     """
     Waits for the query job with the given ID to complete.
     :param sql_adapter:
     :param job_id:
+    :param job_notifications_redis_config: The config of the Redis instance to receive a
+        notification of the job's completion from, or None if notifications are disabled.
     :return: The job's status on completion.
     """
+    redis_client = None
+    if job_notifications_redis_config is not None:
+        redis_client = create_redis_client(job_notifications_redis_config)
+    # NOTE: The subscriber subscribes on creation, before the job's status is first read, so that
+    # the notification can't be missed.
+    job_finished_subscriber = JobNotificationSubscriber(
+        redis_client, [get_query_job_finished_channel(job_id)], logger
+    )
     with (
         closing(sql_adapter.create_connection(True)) as db_conn,
         closing(db_conn.cursor(dictionary=True)) as db_cursor,
+        closing(job_finished_subscriber),
     ):
         # Wait for the job to be marked complete
         while True:
@@ -122,4 +160,8 @@ def wait_for_query_job(sql_adapter: SqlAdapter, job_id: int) -> QueryJobStatus:
             ):
                 return new_status
 
-            time.sleep(0.5)
+            # Notifications can be lost, so the status is still polled, just less frequently.
+            if job_finished_subscriber.is_active():
+                job_finished_subscriber.wait(NOTIFIED_JOB_STATUS_POLL_DELAY)
+            else:
+                job_finished_subscriber.wait(QUERY_JOB_STATUS_POLL_DELAY)
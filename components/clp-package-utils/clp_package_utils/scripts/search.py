@@ -10,6 +10,7 @@ from clp_py_utils.clp_config import (
     CLP_DB_USER_ENV_VAR_NAME,
     CLP_DEFAULT_CONFIG_FILE_RELATIVE_PATH,
     CLP_DEFAULT_DATASET_NAME,
+    CLP_REDIS_PASS_ENV_VAR_NAME,
     ClpDbUserType,
     StorageEngine,
     StorageType,
@@ -26,6 +27,7 @@ from clp_package_utils.general import (
     JobType,
     load_config_file,
     validate_and_load_db_credentials_file,
+    validate_and_load_redis_credentials_file,
     validate_dataset_name,
 )
 
@@ -100,6 +102,8 @@ def main(argv):
 
         # Validate and load necessary credentials
         validate_and_load_db_credentials_file(clp_config, clp_home, False)
+        if clp_config.redis is not None:
+            validate_and_load_redis_credentials_file(clp_config, clp_home, False)
     except:
         logger.exception("Failed to load config.")
         return -1
@@ -139,6 +143,9 @@ def main(argv):
         CLP_DB_PASS_ENV_VAR_NAME: credentials[ClpDbUserType.CLP].password,
         CLP_DB_USER_ENV_VAR_NAME: credentials[ClpDbUserType.CLP].username,
     }
+    if clp_config.redis is not None:
+        # Lets the job's client publish and receive job notifications
+        extra_env_vars[CLP_REDIS_PASS_ENV_VAR_NAME] = clp_config.redis.password
     container_start_cmd = generate_container_start_cmd(
         container_name, necessary_mounts, clp_config.container_image_ref, extra_env_vars
     )
@@ -150,6 +150,30 @@ class OrchestrationType(KebabCaseStrEnum):
 OrchestrationTypeStr = Annotated[OrchestrationType, StrEnumSerializer]
 
 
+class TaskDispatchMode(KebabCaseStrEnum):
+    BATCH = auto()
+    SLIDING_WINDOW = auto()
+
+
+TaskDispatchModeStr = Annotated[TaskDispatchMode, StrEnumSerializer]
+
+
+class PartitioningStrategy(KebabCaseStrEnum):
+    ROUND_ROBIN = auto()
+    LPT = auto()
+
+
+PartitioningStrategyStr = Annotated[PartitioningStrategy, StrEnumSerializer]
+
+
+class QuerySchedulingPolicy(KebabCaseStrEnum):
+    FIFO = auto()
+    FAIR_SHARE = auto()
+
+
+QuerySchedulingPolicyStr = Annotated[QuerySchedulingPolicy, StrEnumSerializer]
+
+
 class QueryEngine(KebabCaseStrEnum):
     CLP = auto()
     CLP_S = auto()
@@ -423,18 +447,43 @@ class CompressionScheduler(BaseModel):
 
     jobs_poll_delay: PositiveFloat = 0.1  # seconds
     max_concurrent_tasks_per_job: NonNegativeInt = UNLIMITED_CONCURRENT_TASKS_PER_JOB
+    task_dispatch_mode: TaskDispatchModeStr = TaskDispatchMode.BATCH
+    streaming_path_discovery: bool = False
     logging_level: LoggingLevel = "INFO"
     type: OrchestrationTypeStr = OrchestrationType.CELERY
 
 
 class QueryScheduler(BaseModel):
     DEFAULT_PORT: ClassVar[int] = 7000
+    UNLIMITED_CONCURRENT_SEARCH_TASKS: ClassVar[NonNegativeInt] = 0
 
     host: DomainStr = "localhost"
     port: Port = DEFAULT_PORT
     jobs_poll_delay: PositiveFloat = 0.1  # seconds
     max_datasets_per_query: PositiveInt | None = 10
     num_archives_to_search_per_sub_job: PositiveInt = 16
+    search_dispatch_mode: TaskDispatchModeStr = TaskDispatchMode.BATCH
+    scheduling_policy: QuerySchedulingPolicyStr = QuerySchedulingPolicy.FIFO
+    max_concurrent_search_tasks: NonNegativeInt = UNLIMITED_CONCURRENT_SEARCH_TASKS
+    # Whether to size each job's sub-jobs based on its progress (e.g., its archive search durations
+    # and, for searches for the latest results, the results it has found) rather than always using
+    # `num_archives_to_search_per_sub_job`
+    adaptive_sub_job_sizing: bool = False
+    # Max number of archives a search task may search, one after another, when the archives'
+    # searches are short enough that each task's overhead matters. A value of 1 disables batching.
+    max_archives_per_search_task: PositiveInt = 8
+    # Whether to route each search task to the query worker that its archive maps to (by consistent
+    # hashing) while that worker has an idle slot, so that repeated searches hit warm caches
+    cache_affinity_routing: bool = False
+    # Whether to select the archives for searches from an in-memory cache of their time ranges
+    # rather than by querying the database
+    cache_archive_time_ranges: bool = False
+    # Whether a search may reuse the results of an earlier search with the same config that are
+    # still in the results cache, only searching the archives the earlier search didn't cover
+    reuse_search_results: bool = False
+    # Port on which to serve metrics on the latency of each stage of query jobs, or None to disable
+    # the metrics endpoint
+    metrics_port: Port | None = None
     logging_level: LoggingLevel = "INFO"
     scheduler_concurrency: PositiveInt = 4
 
@@ -445,10 +494,26 @@ class QueryScheduler(BaseModel):
 
 class CompressionWorker(BaseModel):
     logging_level: LoggingLevel = "INFO"
+    # Number of threads per task that finalize closed archives (upload, metadata insertion, and
+    # indexing) while compression continues
+    archive_pipeline_num_threads: PositiveInt = 2
+    # Max total size of closed archives that are waiting to be finalized before compression pauses
+    archive_pipeline_max_pending_size: PositiveInt = 2 * 1024 * 1024 * 1024  # 2 GiB
 
 
 class QueryWorker(BaseModel):
     logging_level: LoggingLevel = "INFO"
+    # Number of tasks each worker process reserves at a time. Reserved tasks aren't reordered by
+    # priority, so values above 1 weaken priority ordering in exchange for less fetching overhead.
+    prefetch_multiplier: PositiveInt = 1
+    # Max total size of the archives each query worker caches on local disk after downloading them
+    # from S3 (when archives are stored on S3). A value of 0 disables the cache.
+    archive_cache_max_size: NonNegativeInt = 8 * 1024 * 1024 * 1024  # 8 GiB
+    # Whether searches that write their results to files upload the results to S3 in chunks while
+    # they run, rather than after they finish. NOTE: When enabled, a job with `max_num_results` set
+    # stops once its tasks have uploaded that many results in total, which are whichever results
+    # were uploaded first rather than the latest ones; when disabled, every result is uploaded.
+    stream_search_results_upload: bool = False
 
 
 class Redis(BaseModel):
@@ -494,6 +559,9 @@ class Reducer(BaseModel):
     base_port: Port = DEFAULT_PORT
     logging_level: LoggingLevel = "INFO"
     upsert_interval: PositiveInt = 100  # milliseconds
+    # Max number of reducers that each aggregation job's results are partitioned across. A job only
+    # uses the reducers that are idle when it starts, so this is bounded by the reducer concurrency.
+    max_shards_per_job: PositiveInt = 1
 
     def transform_for_container(self):
         self.host = REDUCER_COMPONENT_NAME
@@ -600,6 +668,10 @@ class S3Config(BaseModel):
     bucket: NonEmptyStr
     key_prefix: str
     aws_authentication: AwsAuthentication
+    # Files larger than `upload_part_size` are uploaded in parts (S3's minimum part size is 5 MiB),
+    # with up to `upload_max_concurrency` parts uploaded concurrently.
+    upload_part_size: int = Field(default=64 * 1024 * 1024, ge=5 * 1024 * 1024)  # 64 MiB
+    upload_max_concurrency: PositiveInt = 8
 
 
 class S3IngestionConfig(BaseModel):
@@ -715,6 +787,7 @@ class ArchiveOutput(BaseModel):
     target_encoded_file_size: PositiveInt = 256 * 1024 * 1024  # 256 MiB
     target_segment_size: PositiveInt = 256 * 1024 * 1024  # 256 MiB
     compression_level: ZstdCompressionLevel = 3
+    partitioning_strategy: PartitioningStrategyStr = PartitioningStrategy.ROUND_ROBIN
     retention_period: PositiveInt | None = None
 
     def set_directory(self, directory: pathlib.Path):
@@ -1101,7 +1174,11 @@ class WorkerConfig(BaseModel):
     archive_output: ArchiveOutput = ArchiveOutput()
     tmp_directory: SerializablePath = ClpConfig().tmp_directory
 
+    # Only needed by compression workers.
+    compression_worker: CompressionWorker = CompressionWorker()
+
     # Only needed by query workers.
+    query_worker: QueryWorker = QueryWorker()
     stream_output: StreamOutput = StreamOutput()
     stream_collection_name: str = ResultsCache().stream_collection_name
 
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from mysql.connector.errorcode import ER_DUP_KEYNAME
+
 from clp_py_utils.clp_config import ArchiveOutput, StorageType
 
 # Constants
@@ -33,12 +35,27 @@ def _create_archives_table(db_cursor, archives_table_name: str) -> None:
             `creator_id` VARCHAR(64) NOT NULL,
             `creation_ix` INT NOT NULL,
             KEY `archives_creation_order` (`creator_id`,`creation_ix`) USING BTREE,
+            KEY `archives_time_range` (`end_timestamp`,`begin_timestamp`) USING BTREE,
             UNIQUE KEY `archive_id` (`id`) USING BTREE,
             PRIMARY KEY (`pagination_id`)
         )
         """
     )
 
+    # Add the index to existing tables that were created before it was added to the CREATE TABLE
+    # statement. Ignoring duplicate-key errors makes this idempotent for tables that already have
+    # it.
+    try:
+        db_cursor.execute(
+            f"""
+            ALTER TABLE `{archives_table_name}`
+            ADD KEY `archives_time_range` (`end_timestamp`,`begin_timestamp`) USING BTREE
+            """
+        )
+    except Exception as err:
+        if not (hasattr(err, "errno") and err.errno == ER_DUP_KEYNAME):
+            raise
+
 
 def _create_files_table(db_cursor, table_prefix: str, dataset: str | None) -> None:
     db_cursor.execute(
@@ -1,4 +1,9 @@
+import concurrent.futures
+import errno
+import os
 import pathlib
+import string
+from collections.abc import Generator
 
 import Levenshtein
 
@@ -6,6 +11,10 @@ from clp_py_utils.core import FileMetadata
 
 # Constants
 FILE_GROUPING_MIN_LEVENSHTEIN_RATIO = 0.6
+FS_CRAWLER_DEFAULT_NUM_THREADS = 16
+# Strips the digits from a filename, since they're usually its variable parts (e.g., sequence
+# numbers, dates, times, PIDs)
+FILENAME_TEMPLATE_TRANSLATION_TABLE = str.maketrans("", "", string.digits)
 
 
 class FilesPartition:
@@ -90,6 +99,40 @@ def group_files_by_similar_filenames(files: list[FileMetadata]):
     return groups
 
 
+def get_filename_template(filename: str) -> str:
+    """
+    :param filename:
+    :return: The filename with its digits, and thus most of its variable parts (e.g., sequence
+    numbers, dates and times), stripped.
+    """
+    return filename.translate(FILENAME_TEMPLATE_TRANSLATION_TABLE)
+
+
+class FilenameTemplateGrouper:
+    """
+    Incrementally groups files with similar filenames, where two filenames are considered similar
+    if they have the same template (see `get_filename_template`).
+
+    Unlike `group_files_by_similar_filenames`, each file is assigned to a group exactly once, in
+    time linear in the length of its filename, so files can be grouped as they're discovered.
+    """
+
+    def __init__(self) -> None:
+        self.__group_ids_by_template: dict[str, int] = {}
+
+    def get_group_id(self, file_metadata: FileMetadata) -> int:
+        """
+        :param file_metadata:
+        :return: The ID of the file's group. IDs are assigned sequentially, starting from 0.
+        """
+        template = get_filename_template(file_metadata.path.name)
+        group_id = self.__group_ids_by_template.get(template)
+        if group_id is None:
+            group_id = len(self.__group_ids_by_template)
+            self.__group_ids_by_template[template] = group_id
+        return group_id
+
+
 def validate_path_and_get_info(required_parent_dir: pathlib.Path, path: pathlib.Path):
     file = None
     empty_directory = None
@@ -125,3 +168,152 @@ def validate_path_and_get_info(required_parent_dir: pathlib.Path, path: pathlib.
         file = FileMetadata(path, file_size)
 
     return file, empty_directory
+
+
+def crawl_directory_and_get_info(
+    required_parent_dir: pathlib.Path,
+    path: pathlib.Path,
+    num_threads: int = FS_CRAWLER_DEFAULT_NUM_THREADS,
+) -> Generator[tuple[FileMetadata | None, str | None, str | None], None, None]:
+    """
+    Recursively crawls the given directory and yields the same info that
+    `validate_path_and_get_info` would return for every path under it that `path.rglob("*")` would
+    yield. Symlinks to directories are validated but not crawled.
+
+    Compared to calling `validate_path_and_get_info` on each path, the crawler:
+    - uses `os.scandir`, reusing the file type info each `DirEntry` caches;
+    - resolves the directory once and derives each non-symlink entry's resolved path from it;
+    - scans subdirectories in parallel using a thread pool.
+
+    NOTE: `path` itself isn't validated, so callers should call `validate_path_and_get_info` on it
+    first. Paths are yielded in no particular order.
+
+    :param required_parent_dir:
+    :param path: An absolute path to a directory.
+    :param num_threads: The number of threads to scan directories with.
+    :yield: A tuple of (file, empty_directory, error_msg), exactly one of which is not None:
+        - file: The metadata of a file.
+        - empty_directory: The path of an empty directory.
+        - error_msg: A message describing why a path is invalid, in the same format as the errors
+          that `validate_path_and_get_info` raises.
+    """
+    root_dir = (path, path.resolve(), path.is_relative_to(required_parent_dir))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_threads) as executor:
+        pending_scans = {
+            executor.submit(_scan_directory, required_parent_dir, root_dir, False),
+        }
+        try:
+            while len(pending_scans) > 0:
+                done_scans, pending_scans = concurrent.futures.wait(
+                    pending_scans, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for done_scan in done_scans:
+                    results, subdirs = done_scan.result()
+                    for subdir in subdirs:
+                        pending_scans.add(
+                            executor.submit(_scan_directory, required_parent_dir, subdir, True)
+                        )
+                    yield from results
+        finally:
+            # Don't wait for the remaining scans if the caller stops iterating early
+            for pending_scan in pending_scans:
+                pending_scan.cancel()
+
+
+def _scan_directory(
+    required_parent_dir: pathlib.Path,
+    directory: tuple[pathlib.Path, pathlib.Path, bool],
+    report_if_empty: bool,
+) -> tuple[
+    list[tuple[FileMetadata | None, str | None, str | None]],
+    list[tuple[pathlib.Path, pathlib.Path, bool]],
+]:
+    """
+    Scans a single directory for `crawl_directory_and_get_info`.
+
+    :param required_parent_dir:
+    :param directory: A tuple of (path, resolved_path, is_path_within_required_parent_dir).
+    :param report_if_empty: Whether to report the directory itself if it's empty.
+    :return: A tuple of:
+        - The info of each of the directory's entries, in the format that
+          `crawl_directory_and_get_info` yields.
+        - The subdirectories to scan next, in the same format as `directory`.
+    """
+    dir_path, resolved_dir_path, is_dir_path_within_parent = directory
+    results: list[tuple[FileMetadata | None, str | None, str | None]] = []
+    subdirs: list[tuple[pathlib.Path, pathlib.Path, bool]] = []
+
+    try:
+        with os.scandir(dir_path) as it:
+            entries = list(it)
+    except OSError as ex:
+        # E.g., the directory was removed after its parent was scanned, or it can't be read
+        return [(None, None, _get_os_error_msg(dir_path, ex))], []
+
+    if len(entries) == 0:
+        if report_if_empty:
+            output_path = dir_path if is_dir_path_within_parent else resolved_dir_path
+            results.append((None, str(output_path), None))
+        return results, subdirs
+
+    for entry in entries:
+        entry_path = dir_path / entry.name
+        try:
+            if entry.is_symlink():
+                # Follows the symlink, so this also verifies that its target exists
+                entry_stat = entry.stat()
+                is_dir = entry.is_dir()
+                resolved_entry_path = pathlib.Path(os.path.realpath(entry.path))
+            else:
+                entry_stat = None
+                is_dir = entry.is_dir(follow_symlinks=False)
+                resolved_entry_path = resolved_dir_path / entry.name
+        except OSError as ex:
+            # E.g., the entry was removed, is a symlink loop, or can't be accessed
+            results.append((None, None, _get_os_error_msg(entry_path, ex)))
+            continue
+
+        if not resolved_entry_path.is_relative_to(required_parent_dir):
+            results.append((None, None, f'"{entry_path}" is not within {required_parent_dir}'))
+            continue
+
+        # Convert the path to a path within the required parent dir if necessary (e.g., if the path
+        # is a symlink outside the parent dir, but points to a file/dir inside the parent dir)
+        output_path = entry_path if is_dir_path_within_parent else resolved_entry_path
+
+        if is_dir:
+            if entry_stat is None:
+                subdirs.append((entry_path, resolved_entry_path, is_dir_path_within_parent))
+                continue
+            # Symlinks to directories aren't crawled, but we still need to check if they're empty
+            try:
+                with os.scandir(entry_path) as it:
+                    if next(it, None) is None:
+                        results.append((None, str(output_path), None))
+            except OSError as ex:
+                results.append((None, None, _get_os_error_msg(entry_path, ex)))
+            continue
+
+        try:
+            if entry_stat is None:
+                entry_stat = entry.stat(follow_symlinks=False)
+        except OSError as ex:
+            # E.g., the entry was removed after the directory was scanned
+            results.append((None, None, _get_os_error_msg(entry_path, ex)))
+            continue
+        results.append((FileMetadata(output_path, entry_stat.st_size), None, None))
+
+    return results, subdirs
+
+
+def _get_os_error_msg(path: pathlib.Path, ex: OSError) -> str:
+    """
+    :param path:
+    :param ex: The error raised while accessing `path`.
+    :return: A message describing why `path` is invalid, matching the error that
+        `validate_path_and_get_info` raises for paths that `pathlib.Path.exists` reports as
+        nonexistent (including symlink loops).
+    """
+    if isinstance(ex, FileNotFoundError) or errno.ELOOP == ex.errno:
+        return f'"{path}" does not exist.'
+    return f'"{path}" could not be read: {ex}'
@@ -7,22 +7,34 @@ from yaml.parser import ParserError
 CONTAINER_DIR_FOR_HOST_ROOT = pathlib.Path("/") / "mnt" / "host"
 
 
+GZIP_FILE_EXTENSIONS = (".gz", ".gzip", ".tgz", ".tar.gz")
+ZSTD_FILE_EXTENSIONS = (".zstd", ".zstandard", ".tar.zstd", ".tar.zstandard")
+
+# Fixed estimates of how much files expand when decompressed, used when no better estimate exists
+DEFAULT_GZIP_COMPRESSION_RATIO = 13
+DEFAULT_ZSTD_COMPRESSION_RATIO = 8
+
+
 class FileMetadata:
     __slots__ = ("estimated_uncompressed_size", "path", "size")
 
     def __init__(self, path: pathlib.Path, size: int):
         self.path = path
         self.size = size
-        self.estimated_uncompressed_size = size
-
-        filename = path.name
-        if any(filename.endswith(extension) for extension in [".gz", ".gzip", ".tgz", ".tar.gz"]):
-            self.estimated_uncompressed_size *= 13
-        elif any(
-            filename.endswith(extension)
-            for extension in [".zstd", ".zstandard", ".tar.zstd", ".tar.zstandard"]
-        ):
-            self.estimated_uncompressed_size *= 8
+        self.estimated_uncompressed_size = size * get_default_compression_ratio(path.name)
+
+
+def get_default_compression_ratio(filename: str) -> int:
+    """
+    :param filename:
+    :return: The default estimate of the ratio between the file's uncompressed and on-disk sizes,
+    based on its extension.
+    """
+    if filename.endswith(GZIP_FILE_EXTENSIONS):
+        return DEFAULT_GZIP_COMPRESSION_RATIO
+    if filename.endswith(ZSTD_FILE_EXTENSIONS):
+        return DEFAULT_ZSTD_COMPRESSION_RATIO
+    return 1
 
 
 def get_config_value(config, key):
@@ -8,7 +8,11 @@ from contextlib import closing
 from pydantic import ValidationError
 
 from clp_py_utils.clp_config import ClpConfig, StorageEngine
-from clp_py_utils.clp_metadata_db_utils import create_datasets_table, create_metadata_db_tables
+from clp_py_utils.clp_metadata_db_utils import (
+    create_datasets_table,
+    create_metadata_db_tables,
+    fetch_existing_datasets,
+)
 from clp_py_utils.core import read_yaml_config_file
 from clp_py_utils.sql_adapter import SqlAdapter
 
@@ -58,6 +62,9 @@ def main(argv):
         ):
             if StorageEngine.CLP_S == storage_engine:
                 create_datasets_table(metadata_db_cursor, table_prefix)
+                # Migrate the tables of existing datasets (e.g., to add new indexes)
+                for dataset in fetch_existing_datasets(metadata_db_cursor, table_prefix):
+                    create_metadata_db_tables(metadata_db_cursor, table_prefix, dataset)
             else:
                 create_metadata_db_tables(metadata_db_cursor, table_prefix)
             metadata_db.commit()
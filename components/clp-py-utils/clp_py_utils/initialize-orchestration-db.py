@@ -22,7 +22,7 @@ from clp_py_utils.clp_config import (
 )
 from clp_py_utils.core import read_yaml_config_file
 from clp_py_utils.sql_adapter import SqlAdapter
-from mysql.connector.errorcode import ER_DUP_KEYNAME
+from mysql.connector.errorcode import ER_DUP_FIELDNAME, ER_DUP_KEYNAME
 
 # Setup logging
 # Create logger
@@ -135,6 +135,7 @@ def main(argv):
                     `num_tasks_completed` INT NOT NULL DEFAULT '0',
                     `start_time` DATETIME(3) NULL DEFAULT NULL,
                     `duration` FLOAT NULL DEFAULT NULL,
+                    `stage_durations` JSON NULL DEFAULT NULL,
                     `job_config` MEDIUMBLOB NOT NULL,
                     PRIMARY KEY (`id`) USING BTREE,
                     INDEX `CREATION_TIME` (`creation_time`) USING BTREE,
@@ -151,6 +152,8 @@ def main(argv):
                     `creation_time` DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
                     `start_time` DATETIME(3) NULL DEFAULT NULL,
                     `duration` FLOAT NULL DEFAULT NULL,
+                    `queue_duration` FLOAT NULL DEFAULT NULL,
+                    `execution_duration` FLOAT NULL DEFAULT NULL,
                     `job_id` INT NOT NULL,
                     `archive_id` VARCHAR(255) NULL DEFAULT NULL,
                     PRIMARY KEY (`id`) USING BTREE,
@@ -164,6 +167,30 @@ def main(argv):
                 """
             )
 
+            # Add columns to existing tables that were created before these columns were added to
+            # the CREATE TABLE statements. Ignoring duplicate-column errors makes this idempotent.
+            for table_name, column_definition in (
+                (
+                    QUERY_JOBS_TABLE_NAME,
+                    "`stage_durations` JSON NULL DEFAULT NULL AFTER `duration`",
+                ),
+                (
+                    QUERY_TASKS_TABLE_NAME,
+                    "`queue_duration` FLOAT NULL DEFAULT NULL AFTER `duration`",
+                ),
+                (
+                    QUERY_TASKS_TABLE_NAME,
+                    "`execution_duration` FLOAT NULL DEFAULT NULL AFTER `queue_duration`",
+                ),
+            ):
+                try:
+                    scheduling_db_cursor.execute(
+                        f"ALTER TABLE `{table_name}` ADD COLUMN {column_definition}"
+                    )
+                except Exception as err:
+                    if not (hasattr(err, "errno") and err.errno == ER_DUP_FIELDNAME):
+                        raise
+
             scheduling_db.commit()
     except:
         logger.exception("Failed to create scheduling tables.")
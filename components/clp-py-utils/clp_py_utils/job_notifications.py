@@ -0,0 +1,318 @@
+"""
+Notifications of job events (creation and completion) published through Redis pub/sub, so that
+schedulers and clients can react to the events without waiting for their next poll of the database.
+
+Notifications are best-effort: they're lost if Redis is unavailable, and not every client publishes
+them (e.g., the WebUI). So subscribers must still poll the database, using the notifications only to
+wake up early.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+import redis
+import redis.asyncio
+
+from clp_py_utils.clp_config import ClpConfig, Redis
+
+COMPRESSION_JOB_CREATED_CHANNEL = "clp-compression-job-created"
+QUERY_JOB_CREATED_CHANNEL = "clp-query-job-created"
+QUERY_JOB_FINISHED_CHANNEL_PREFIX = "clp-query-job-finished-"
+
+# Interval (in seconds) at which clients that are notified when a job finishes still poll the
+# database for the job's status, in case a notification is lost
+NOTIFIED_JOB_STATUS_POLL_DELAY = 5.0
+
+# Timeout (in seconds) for connecting to and communicating with Redis, so that publishing a
+# notification can't block for long when Redis is unreachable
+REDIS_SOCKET_TIMEOUT = 1.0
+
+
+def get_query_job_finished_channel(job_id: int | str) -> str:
+    """
+    :param job_id:
+    :return: The channel on which the completion of the given query job is published.
+    """
+    return f"{QUERY_JOB_FINISHED_CHANNEL_PREFIX}{job_id}"
+
+
+def load_job_notifications_redis_config(
+    clp_config: ClpConfig, logger: logging.Logger
+) -> Redis | None:
+    """
+    Loads the config of the Redis instance used for job notifications, with its credentials loaded
+    from the environment.
+
+    :param clp_config:
+    :param logger:
+    :return: The Redis config, or None if notifications are disabled because Redis isn't configured
+    or its credentials aren't available.
+    """
+    if clp_config.redis is None:
+        return None
+    try:
+        clp_config.redis.load_credentials_from_env()
+    except ValueError:
+        logger.info("Redis credentials aren't available; job notifications are disabled.")
+        return None
+    return clp_config.redis
+
+
+def create_redis_client(redis_config: Redis) -> redis.Redis:
+    """
+    :param redis_config: The config of the Redis instance, with its credentials loaded.
+    :return: A client for publishing and subscribing to notifications. The client connects lazily.
+    """
+    return redis.Redis(
+        host=redis_config.host,
+        port=redis_config.port,
+        password=redis_config.password,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+    )
+
+
+def create_async_redis_client(redis_config: Redis) -> redis.asyncio.Redis:
+    """
+    :param redis_config: The config of the Redis instance, with its credentials loaded.
+    :return: An asyncio client for publishing and subscribing to notifications. The client connects
+    lazily.
+    """
+    return redis.asyncio.Redis(
+        host=redis_config.host,
+        port=redis_config.port,
+        password=redis_config.password,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+    )
+
+
+def publish_job_notification(
+    redis_client: redis.Redis | None, channel: str, logger: logging.Logger
+) -> None:
+    """
+    Publishes a notification, logging rather than raising any error since subscribers fall back to
+    polling.
+
+    :param redis_client: The client to publish with, or None if notifications are disabled.
+    :param channel:
+    :param logger:
+    """
+    if redis_client is None:
+        return
+    try:
+        redis_client.publish(channel, "")
+    except redis.RedisError:
+        logger.warning(f"Failed to publish notification on {channel}.", exc_info=True)
+
+
+async def publish_job_notification_async(
+    redis_client: redis.asyncio.Redis | None, channel: str, logger: logging.Logger
+) -> None:
+    """
+    Asyncio version of `publish_job_notification`.
+
+    :param redis_client:
+    :param channel:
+    :param logger:
+    """
+    if redis_client is None:
+        return
+    try:
+        await redis_client.publish(channel, "")
+    except redis.RedisError:
+        logger.warning(f"Failed to publish notification on {channel}.", exc_info=True)
+
+
+class JobNotificationSubscriber:
+    """
+    Waits for notifications on a set of channels. Notifications that arrive between calls to `wait`
+    are buffered, so a caller that subscribes, checks the database, and then waits won't miss a
+    notification published in between.
+
+    If notifications are disabled or Redis is unavailable, `wait` simply waits for the timeout, so
+    the caller degrades to polling.
+    """
+
+    def __init__(
+        self, redis_client: redis.Redis | None, channels: list[str], logger: logging.Logger
+    ) -> None:
+        """
+        :param redis_client: The client to subscribe with, or None if notifications are disabled.
+        :param channels:
+        :param logger:
+        """
+        self.__channels = channels
+        self.__logger = logger
+        self.__pubsub: redis.client.PubSub | None = None
+        if redis_client is not None:
+            self.__pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        self.__is_subscribed = False
+        self.__is_redis_available = True
+        self.subscribe()
+
+    def is_active(self) -> bool:
+        """
+        :return: Whether the subscriber is receiving notifications, i.e., it's subscribed and its
+        last attempt to receive notifications didn't fail.
+        """
+        return self.__is_subscribed and self.__is_redis_available
+
+    def subscribe(self) -> None:
+        """
+        Subscribes to the channels if the subscriber isn't already subscribed (e.g., because Redis
+        was unavailable when it was created).
+        """
+        if self.__pubsub is None or self.__is_subscribed:
+            return
+        try:
+            self.__pubsub.subscribe(*self.__channels)
+            self.__is_subscribed = True
+            self.__is_redis_available = True
+        except redis.RedisError:
+            self.__on_redis_error()
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Waits until a notification arrives or `timeout` seconds elapse. Any other notifications that
+        have already arrived are consumed as well.
+
+        :param timeout:
+        :return: Whether a notification arrived.
+        """
+        deadline = time.monotonic() + timeout
+        self.subscribe()
+        if self.__is_subscribed:
+            try:
+                while True:
+                    remaining_time = deadline - time.monotonic()
+                    if remaining_time <= 0:
+                        self.__is_redis_available = True
+                        return False
+                    # NOTE: `get_message` returns None for subscription confirmations, even if the
+                    # timeout hasn't elapsed.
+                    if self.__pubsub.get_message(timeout=remaining_time) is not None:
+                        while self.__pubsub.get_message(timeout=0) is not None:
+                            pass
+                        self.__is_redis_available = True
+                        return True
+            except redis.RedisError:
+                self.__on_redis_error()
+
+        remaining_time = deadline - time.monotonic()
+        if remaining_time > 0:
+            time.sleep(remaining_time)
+        return False
+
+    def close(self) -> None:
+        if self.__pubsub is not None:
+            self.__pubsub.close()
+
+    def __on_redis_error(self) -> None:
+        # Only log the first error until Redis becomes available again to avoid flooding the logs.
+        if self.__is_redis_available:
+            self.__logger.warning(
+                "Failed to receive job notifications from Redis; falling back to polling.",
+                exc_info=True,
+            )
+        self.__is_redis_available = False
+
+
+class AsyncJobNotificationSubscriber:
+    """
+    Asyncio version of `JobNotificationSubscriber`.
+
+    NOTE: Concurrent calls to `wait` are serialized.
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.asyncio.Redis | None,
+        channels: list[str],
+        logger: logging.Logger,
+    ) -> None:
+        """
+        :param redis_client: The client to subscribe with, or None if notifications are disabled.
+        :param channels:
+        :param logger:
+        """
+        self.__channels = channels
+        self.__logger = logger
+        self.__pubsub: redis.asyncio.client.PubSub | None = None
+        if redis_client is not None:
+            self.__pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        self.__is_subscribed = False
+        self.__is_redis_available = True
+        self.__lock = asyncio.Lock()
+
+    def is_active(self) -> bool:
+        """
+        :return: Whether the subscriber is receiving notifications, i.e., it's subscribed and its
+        last attempt to receive notifications didn't fail.
+        """
+        return self.__is_subscribed and self.__is_redis_available
+
+    async def subscribe(self) -> None:
+        """
+        Subscribes to the channels. This should be called before checking the database for the
+        events of interest so that no notification is missed.
+        """
+        if self.__pubsub is None or self.__is_subscribed:
+            return
+        try:
+            await self.__pubsub.subscribe(*self.__channels)
+            self.__is_subscribed = True
+            self.__is_redis_available = True
+        except redis.RedisError:
+            self.__on_redis_error()
+
+    async def wait(self, timeout: float) -> bool:
+        """
+        Waits until a notification arrives or `timeout` seconds elapse. Any other notifications that
+        have already arrived are consumed as well.
+
+        :param timeout:
+        :return: Whether a notification arrived.
+        """
+        event_loop = asyncio.get_running_loop()
+        deadline = event_loop.time() + timeout
+        async with self.__lock:
+            await self.subscribe()
+            if self.__is_subscribed:
+                try:
+                    while True:
+                        remaining_time = deadline - event_loop.time()
+                        if remaining_time <= 0:
+                            self.__is_redis_available = True
+                            return False
+                        # NOTE: `get_message` returns None for subscription confirmations, even if
+                        # the timeout hasn't elapsed.
+                        message = await self.__pubsub.get_message(timeout=remaining_time)
+                        if message is not None:
+                            while await self.__pubsub.get_message(timeout=0) is not None:
+                                pass
+                            self.__is_redis_available = True
+                            return True
+                except redis.RedisError:
+                    self.__on_redis_error()
+
+        remaining_time = deadline - event_loop.time()
+        if remaining_time > 0:
+            await asyncio.sleep(remaining_time)
+        return False
+
+    async def close(self) -> None:
+        if self.__pubsub is not None:
+            await self.__pubsub.aclose()
+
+    def __on_redis_error(self) -> None:
+        # Only log the first error until Redis becomes available again to avoid flooding the logs.
+        if self.__is_redis_available:
+            self.__logger.warning(
+                "Failed to receive job notifications from Redis; falling back to polling.",
+                exc_info=True,
+            )
+        self.__is_redis_available = False
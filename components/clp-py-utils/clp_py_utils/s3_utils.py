@@ -1,11 +1,15 @@
 import os
 import re
+import threading
+import time
 from collections.abc import Generator
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Final
 
 import boto3
 import botocore
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from job_orchestration.scheduler.job_config import S3InputConfig
 
@@ -36,6 +40,17 @@ AWS_ENV_VAR_SESSION_TOKEN: Final[str] = "AWS_SESSION_TOKEN"
 
 S3_OBJECT_DELETION_BATCH_SIZE_MAX: Final[int] = 1000
 
+# Clients used for uploads and downloads, keyed by the JSON of the `S3Config` fields that affect the
+# client. boto3 clients are thread-safe, so each can be shared by all threads.
+_transfer_clients: dict[str, "_TransferClient"] = {}
+_transfer_clients_lock = threading.Lock()
+
+# Interval (in seconds) at which the static credentials of a cached transfer client are resolved
+# again, so that credentials rotated outside the process (e.g., in a profile or environment
+# variables) are picked up. Refreshable credentials (e.g., from STS or a web identity token) are
+# refreshed by botocore before they expire.
+TRANSFER_CLIENT_CREDENTIALS_CHECK_INTERVAL: Final[float] = 5 * 60
+
 SCHEME_REGEXP = r"(?P<scheme>(http|https))"
 S3_PREFIX_REGEXP = r"(?P<s3>s3)"
 ENDPOINT_REGEXP = r"(?P<endpoint>[a-z0-9.-]+(\:[0-9]+)?)"
@@ -186,12 +201,15 @@ def generate_container_auth_options(
     return config_mount, credentials_env_vars
 
 
-def _create_s3_client(
-    endpoint_url: str | None,
-    region_code: str | None,
-    s3_auth: AwsAuthentication,
-    boto3_config: Config | None = None,
-) -> boto3.client:
+@dataclass
+class _TransferClient:
+    client: boto3.client
+    # The credentials the client was created with, or None if they're refreshed by botocore
+    static_credentials: botocore.credentials.ReadOnlyCredentials | None
+    last_credentials_check_time: float
+
+
+def _create_aws_session(region_code: str | None, s3_auth: AwsAuthentication) -> boto3.Session:
     aws_session: boto3.Session | None
     if AwsAuthType.profile == s3_auth.type:
         aws_session = boto3.Session(
@@ -211,11 +229,72 @@ def _create_s3_client(
         aws_session = boto3.Session(region_name=region_code)
     else:
         raise ValueError(f"Unsupported authentication type: {s3_auth.type}")
+    return aws_session
+
 
+def _create_s3_client(
+    endpoint_url: str | None,
+    region_code: str | None,
+    s3_auth: AwsAuthentication,
+    boto3_config: Config | None = None,
+) -> boto3.client:
+    aws_session = _create_aws_session(region_code, s3_auth)
     s3_client = aws_session.client("s3", endpoint_url=endpoint_url, config=boto3_config)
     return s3_client
 
 
+def _get_static_credentials(
+    aws_session: boto3.Session,
+) -> botocore.credentials.ReadOnlyCredentials | None:
+    """
+    :param aws_session:
+    :return: The session's credentials, or None if they're refreshed by botocore (or there are
+    none).
+    """
+    credentials = aws_session.get_credentials()
+    if credentials is None or isinstance(credentials, botocore.credentials.RefreshableCredentials):
+        return None
+    return credentials.get_frozen_credentials()
+
+
+def _get_transfer_client(s3_config: S3Config) -> boto3.client:
+    """
+    :param s3_config:
+    :return: A cached client for uploads to and downloads from the endpoint, region, and
+    credentials in `s3_config`, created if it doesn't exist yet or if its static credentials have
+    since changed.
+    """
+    client_key = s3_config.model_dump_json(
+        include={"endpoint_url", "region_code", "aws_authentication", "upload_max_concurrency"}
+    )
+    now = time.monotonic()
+    with _transfer_clients_lock:
+        transfer_client = _transfer_clients.get(client_key)
+        if transfer_client is not None and (
+            transfer_client.static_credentials is None
+            or now - transfer_client.last_credentials_check_time
+            < TRANSFER_CLIENT_CREDENTIALS_CHECK_INTERVAL
+        ):
+            return transfer_client.client
+
+        aws_session = _create_aws_session(s3_config.region_code, s3_config.aws_authentication)
+        static_credentials = _get_static_credentials(aws_session)
+        if transfer_client is not None and static_credentials == transfer_client.static_credentials:
+            transfer_client.last_credentials_check_time = now
+            return transfer_client.client
+
+        boto3_config = Config(
+            retries=dict(total_max_attempts=3, mode="adaptive"),
+            # Allow a connection per concurrently uploaded part
+            max_pool_connections=max(10, s3_config.upload_max_concurrency),
+        )
+        s3_client = aws_session.client(
+            "s3", endpoint_url=s3_config.endpoint_url, config=boto3_config
+        )
+        _transfer_clients[client_key] = _TransferClient(s3_client, static_credentials, now)
+    return s3_client
+
+
 def parse_s3_url(s3_url: str) -> tuple[str | None, str | None, str, str]:
     """
     Parses the endpoint_url, region_code, bucket, and key_prefix from the given S3 URL.
@@ -293,9 +372,27 @@ def s3_get_object_metadata(s3_input_config: S3InputConfig) -> list[FileMetadata]
 
     :param s3_input_config:
     :return: A list of `FileMetadata` containing the object's metadata on success.
+    :raise: Propagates `s3_iter_object_metadata`'s exceptions.
+    """
+    return list(s3_iter_object_metadata(s3_input_config))
+
+
+def s3_iter_object_metadata(
+    s3_input_config: S3InputConfig,
+) -> Generator[FileMetadata, None, None]:
+    """
+    Iterates over the metadata of all objects specified by the given input config, yielding each
+    object's metadata as soon as it's listed, so that callers can process objects while the
+    remaining ones are still being listed.
+
+    NOTE: We reuse FileMetadata to store the metadata of S3 objects where the object's key is stored
+    as `path` in FileMetadata.
+
+    :param s3_input_config:
+    :yield: A `FileMetadata` containing the next object's metadata.
     :raise: Propagates `_create_s3_client`'s exceptions.
-    :raise: Propagates `_s3_get_object_metadata_from_single_prefix`'s exceptions.
-    :raise: Propagates `_s3_get_object_metadata_from_keys`'s exceptions.
+    :raise: Propagates `_iter_s3_object_metadata_from_single_prefix`'s exceptions.
+    :raise: Propagates `_iter_s3_object_metadata_from_keys`'s exceptions.
     """
     s3_client = _create_s3_client(
         s3_input_config.endpoint_url,
@@ -304,46 +401,79 @@ def s3_get_object_metadata(s3_input_config: S3InputConfig) -> list[FileMetadata]
     )
 
     if s3_input_config.keys is None:
-        return _s3_get_object_metadata_from_single_prefix(
+        yield from _iter_s3_object_metadata_from_single_prefix(
             s3_client, s3_input_config.bucket, s3_input_config.key_prefix
         )
+        return
 
-    return _s3_get_object_metadata_from_keys(
+    yield from _iter_s3_object_metadata_from_keys(
         s3_client, s3_input_config.bucket, s3_input_config.key_prefix, s3_input_config.keys
     )
 
 
 def s3_put(s3_config: S3Config, src_file: Path, dest_path: str) -> None:
     """
-    Uploads a local file to an S3 bucket using AWS's PutObject operation.
+    Uploads a local file to an S3 bucket. Files larger than `s3_config.upload_part_size` are
+    uploaded using a multipart upload, with up to `s3_config.upload_max_concurrency` parts uploaded
+    concurrently; smaller files are uploaded using a single PutObject operation.
 
     :param s3_config: S3 configuration specifying the upload destination and credentials.
     :param src_file: Local file to upload.
     :param dest_path: The destination path for the uploaded file in the S3 bucket, relative to
     `s3_config.key_prefix` (the file's S3 key will be `s3_config.key_prefix` + `dest_path`).
-    :raises: ValueError if `src_file` doesn't exist, doesn't resolve to a file or is larger than the
-    S3 PutObject limit.
+    :raises: ValueError if `src_file` doesn't exist or doesn't resolve to a file.
     :raises: Propagates `boto3.client`'s exceptions.
-    :raises: Propagates `boto3.client.put_object`'s exceptions.
+    :raises: Propagates `boto3.client.upload_file`'s exceptions.
     """
     if not src_file.exists():
         raise ValueError(f"{src_file} doesn't exist")
     if not src_file.is_file():
         raise ValueError(f"{src_file} is not a file")
-    if src_file.stat().st_size > 5 * 1024 * 1024 * 1024:
-        raise ValueError(
-            f"{src_file} is larger than the limit (5GiB) for a single PutObject operation."
-        )
 
-    boto3_config = Config(retries=dict(total_max_attempts=3, mode="adaptive"))
-    s3_client = _create_s3_client(
-        s3_config.endpoint_url, s3_config.region_code, s3_config.aws_authentication, boto3_config
+    s3_client = _get_transfer_client(s3_config)
+    # NOTE: If the file would need more parts than S3 allows (10,000), the part size is increased.
+    transfer_config = TransferConfig(
+        multipart_threshold=s3_config.upload_part_size + 1,
+        multipart_chunksize=s3_config.upload_part_size,
+        max_concurrency=s3_config.upload_max_concurrency,
+        use_threads=s3_config.upload_max_concurrency > 1,
+    )
+    s3_client.upload_file(
+        str(src_file),
+        s3_config.bucket,
+        s3_config.key_prefix + dest_path,
+        Config=transfer_config,
     )
 
-    with open(src_file, "rb") as file_data:
-        s3_client.put_object(
-            Bucket=s3_config.bucket, Body=file_data, Key=s3_config.key_prefix + dest_path
-        )
+
+def s3_put_bytes(s3_config: S3Config, data: bytes, dest_path: str) -> None:
+    """
+    Uploads the given bytes to an S3 bucket as an object, using a single PutObject operation.
+
+    :param s3_config: S3 configuration specifying the upload destination and credentials.
+    :param data:
+    :param dest_path: The destination path for the object in the S3 bucket, relative to
+    `s3_config.key_prefix` (the object's S3 key will be `s3_config.key_prefix` + `dest_path`).
+    :raises: Propagates `boto3.client`'s exceptions.
+    :raises: Propagates `boto3.client.put_object`'s exceptions.
+    """
+    s3_client = _get_transfer_client(s3_config)
+    s3_client.put_object(Bucket=s3_config.bucket, Key=s3_config.key_prefix + dest_path, Body=data)
+
+
+def s3_get(s3_config: S3Config, src_path: str, dest_file: Path) -> None:
+    """
+    Downloads an object from an S3 bucket to a local file.
+
+    :param s3_config: S3 configuration specifying the object's location and credentials.
+    :param src_path: The path of the object in the S3 bucket, relative to `s3_config.key_prefix`
+    (the object's S3 key is `s3_config.key_prefix` + `src_path`).
+    :param dest_file: Local file to download the object to, which is overwritten if it exists.
+    :raises: Propagates `boto3.client`'s exceptions.
+    :raises: Propagates `boto3.client.download_file`'s exceptions.
+    """
+    s3_client = _get_transfer_client(s3_config)
+    s3_client.download_file(s3_config.bucket, s3_config.key_prefix + src_path, str(dest_file))
 
 
 def s3_delete_by_key_prefix(
@@ -427,36 +557,36 @@ def s3_delete_objects(s3_config: S3Config, object_keys: set[str]) -> None:
         )
 
 
-def _s3_get_object_metadata_from_single_prefix(
+def _iter_s3_object_metadata_from_single_prefix(
     s3_client: boto3.client, bucket: str, key_prefix: str
-) -> list[FileMetadata]:
+) -> Generator[FileMetadata, None, None]:
     """
-    Gets the metadata of all objects under the <`bucket`>/<`key_prefix`>.
+    Iterates over the metadata of all objects under the <`bucket`>/<`key_prefix`>.
 
     :param s3_client:
     :param bucket:
     :param key_prefix:
-    :return: A list of `FileMetadata` containing the object's metadata on success.
+    :yield: A `FileMetadata` containing the next object's metadata.
     :raise: Propagates `_iter_s3_objects`'s exceptions.
     """
-    file_metadata_list: list[FileMetadata] = list()
     for object_key, object_size in _iter_s3_objects(s3_client, bucket, key_prefix):
-        file_metadata_list.append(FileMetadata(Path(object_key), object_size))
-
-    return file_metadata_list
+        yield FileMetadata(Path(object_key), object_size)
 
 
-def _s3_get_object_metadata_from_keys(
+def _iter_s3_object_metadata_from_keys(
     s3_client: boto3.client, bucket: str, key_prefix: str, keys: list[str]
-) -> list[FileMetadata]:
+) -> Generator[FileMetadata, None, None]:
     """
-    Gets the metadata of all objects specified in `keys` under the <`bucket`>.
+    Iterates over the metadata of all objects specified in `keys` under the <`bucket`>.
+
+    NOTE: Since objects are listed lazily, some objects' metadata may be yielded before a missing
+    key is detected.
 
     :param s3_client:
     :param bucket:
     :param key_prefix:
     :param keys:
-    :return: A list of `FileMetadata` containing the object's metadata on success.
+    :yield: A `FileMetadata` containing the next object's metadata.
     :raise: ValueError if `keys` is an empty list.
     :raise: ValueError if any key in `keys` doesn't start with `key_prefix`.
     :raise: ValueError if duplicate keys are found in `keys`.
@@ -480,12 +610,11 @@ def _s3_get_object_metadata_from_keys(
 
     key_iterator = iter(keys)
     first_key = next(key_iterator)
-    file_metadata_list: list[FileMetadata] = []
-    file_metadata_list.append(_s3_get_object_metadata_from_key(s3_client, bucket, first_key))
+    yield _s3_get_object_metadata_from_key(s3_client, bucket, first_key)
 
     next_key = next(key_iterator, None)
     if next_key is None:
-        return file_metadata_list
+        return
 
     for object_key, object_size in _iter_s3_objects(s3_client, bucket, key_prefix, first_key):
         # We need to do both < and > checks since they are handled differently. Ideally, we can do
@@ -495,11 +624,11 @@ def _s3_get_object_metadata_from_keys(
         if object_key > next_key:
             raise ValueError(f"Key `{next_key}` doesn't exist in the bucket `{bucket}`.")
 
-        file_metadata_list.append(FileMetadata(Path(object_key), object_size))
+        yield FileMetadata(Path(object_key), object_size)
         next_key = next(key_iterator, None)
         if next_key is None:
             # Early exit since all keys have been found.
-            return file_metadata_list
+            return
 
     # If control flow reaches here, it means there are still keys left to find.
     absent_keys = []
@@ -90,14 +90,21 @@ class SqlAdapter:
         pool_size: int,
         disable_localhost_socket_connection: bool = False,
         user_type: ClpDbUserType = ClpDbUserType.CLP,
+        max_overflow: int = 0,
+        recycle: int = -1,
     ) -> ConnectionPoolWrapper:
         """
-        Creates a connection pool to the database.
+        Creates a connection pool to the database. Each connection is checked for liveness (and
+        replaced if it's dead) when it's checked out of the pool.
 
         :param logger: The logger to use for logging connection pool errors.
         :param pool_size: The size of the connection pool.
         :param disable_localhost_socket_connection: If true, force TCP connections.
         :param user_type: User type whose credentials should be used to connect.
+        :param max_overflow: The number of connections that can be opened beyond `pool_size` when
+            all pooled connections are in use. Overflow connections are closed when returned.
+        :param recycle: The age (in seconds) after which a connection is replaced when it's checked
+            out, or -1 to never replace connections because of their age.
         :return: The connection pool.
         """
 
@@ -117,7 +124,8 @@ class SqlAdapter:
                 _create_connection,
                 pool_size=pool_size,
                 dialect=dialect,
-                max_overflow=0,
+                max_overflow=max_overflow,
+                recycle=recycle,
                 pre_ping=True,
             ),
             logger,
@@ -1,10 +1,13 @@
 #include "OutputHandler.hpp"
 
+#include <algorithm>
+#include <iostream>
 #include <memory>
 #include <string>
 #include <string_view>
 
 #include <msgpack.hpp>
+#include <nlohmann/json.hpp>
 #include <spdlog/spdlog.h>
 
 #include "../../reducer/CountOperator.hpp"
@@ -100,6 +103,9 @@ ErrorCode ResultsCacheOutputHandler::flush() {
     while (false == m_latest_results.empty()) {
         auto result = std::move(*m_latest_results.top());
         m_latest_results.pop();
+        ++m_num_results_written;
+        m_min_timestamp_written = std::min(m_min_timestamp_written, result.timestamp);
+        m_max_timestamp_written = std::max(m_max_timestamp_written, result.timestamp);
 
         try {
             m_results.emplace_back(
@@ -148,6 +154,14 @@ ErrorCode ResultsCacheOutputHandler::flush() {
     } catch (mongocxx::exception const& e) {
         return ErrorCode::ErrorCode_Failure_DB_Bulk_Write;
     }
+
+    nlohmann::json summary;
+    summary[cResultsCacheKeys::SearchSummary::NumResults] = m_num_results_written;
+    if (m_num_results_written > 0) {
+        summary[cResultsCacheKeys::SearchSummary::MinTimestamp] = m_min_timestamp_written;
+        summary[cResultsCacheKeys::SearchSummary::MaxTimestamp] = m_max_timestamp_written;
+    }
+    std::cout << summary.dump() << std::endl;
     return ErrorCode::ErrorCode_Success;
 }
 
@@ -181,7 +181,10 @@ public:
     ) override;
 
     /**
-     * Flushes any buffered output.
+     * Flushes any buffered output, and then prints a summary of the results written to the results
+     * cache (their number and their earliest and latest timestamps) to stdout, as a JSON object, so
+     * that the scheduler can decide whether a job has found enough results without scanning the
+     * results cache.
      * @return ErrorCode_Success on success
      * @return ErrorCode_Failure_DB_Bulk_Write on failure to write results to the results cache
      */
@@ -213,6 +216,9 @@ private:
     std::vector<bsoncxx::document::value> m_results;
     uint64_t m_batch_size;
     uint64_t m_max_num_results;
+    uint64_t m_num_results_written{0};
+    epochtime_t m_min_timestamp_written{cEpochTimeMax};
+    epochtime_t m_max_timestamp_written{cEpochTimeMin};
     // The search results with the latest timestamps
     std::priority_queue<
             std::unique_ptr<QueryResult>,
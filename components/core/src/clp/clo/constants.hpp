@@ -18,6 +18,12 @@ constexpr char LogEventIx[]{"log_event_ix"};
 constexpr char Timestamp[]{"timestamp"};
 constexpr char Message[]{"message"};
 }  // namespace SearchOutput
+
+namespace SearchSummary {
+constexpr char NumResults[]{"num_results"};
+constexpr char MinTimestamp[]{"min_timestamp"};
+constexpr char MaxTimestamp[]{"max_timestamp"};
+}  // namespace SearchSummary
 }  // namespace clp::clo::cResultsCacheKeys
 
 // NOLINTEND(cppcoreguidelines-avoid-c-arrays, readability-identifier-naming)
@@ -1,5 +1,7 @@
 #include "OutputHandlerImpl.hpp"
 
+#include <algorithm>
+#include <iostream>
 #include <sstream>
 #include <string>
 #include <string_view>
@@ -10,6 +12,7 @@
 #include <mongocxx/instance.hpp>
 #include <mongocxx/uri.hpp>
 #include <msgpack.hpp>
+#include <nlohmann/json.hpp>
 #include <spdlog/spdlog.h>
 
 #include "../clp/networking/socket_utils.hpp"
@@ -93,6 +96,9 @@ ErrorCode ResultsCacheOutputHandler::flush() {
     while (false == m_latest_results.empty()) {
         auto result = std::move(*m_latest_results.top());
         m_latest_results.pop();
+        ++m_num_results_written;
+        m_min_timestamp_written = std::min(m_min_timestamp_written, result.timestamp);
+        m_max_timestamp_written = std::max(m_max_timestamp_written, result.timestamp);
 
         try {
             m_results.emplace_back(
@@ -148,6 +154,17 @@ ErrorCode ResultsCacheOutputHandler::flush() {
     return ErrorCode::ErrorCodeSuccess;
 }
 
+ErrorCode ResultsCacheOutputHandler::finish() {
+    nlohmann::json summary;
+    summary[constants::results_cache::search_summary::cNumResults] = m_num_results_written;
+    if (m_num_results_written > 0) {
+        summary[constants::results_cache::search_summary::cMinTimestamp] = m_min_timestamp_written;
+        summary[constants::results_cache::search_summary::cMaxTimestamp] = m_max_timestamp_written;
+    }
+    std::cout << summary.dump() << std::endl;
+    return ErrorCode::ErrorCodeSuccess;
+}
+
 void ResultsCacheOutputHandler::write(
         string_view message,
         epochtime_t timestamp,
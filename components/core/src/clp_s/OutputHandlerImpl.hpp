@@ -180,6 +180,14 @@ public:
      */
     ErrorCode flush() override;
 
+    /**
+     * Prints a summary of the results written to the results cache (their number and their
+     * earliest and latest timestamps) to stdout, as a JSON object, so that the scheduler can decide
+     * whether a job has found enough results without scanning the results cache.
+     * @return ErrorCodeSuccess
+     */
+    ErrorCode finish() override;
+
     void write(
             std::string_view message,
             epochtime_t timestamp,
@@ -196,6 +204,9 @@ private:
     uint64_t m_batch_size;
     uint64_t m_max_num_results;
     std::string m_dataset;
+    uint64_t m_num_results_written{0};
+    epochtime_t m_min_timestamp_written{cEpochTimeMax};
+    epochtime_t m_max_timestamp_written{cEpochTimeMin};
     std::priority_queue<
             std::unique_ptr<QueryResult>,
             std::vector<std::unique_ptr<QueryResult>>,
@@ -60,5 +60,11 @@ constexpr char cMessage[]{"message"};
 constexpr char cArchiveId[]{"archive_id"};
 constexpr std::string_view cDataset{"dataset"};
 }  // namespace results_cache::search
+
+namespace results_cache::search_summary {
+constexpr char cNumResults[]{"num_results"};
+constexpr char cMinTimestamp[]{"min_timestamp"};
+constexpr char cMaxTimestamp[]{"max_timestamp"};
+}  // namespace results_cache::search_summary
 }  // namespace clp_s::constants
 #endif  // CLP_S_ARCHIVE_CONSTANTS_HPP
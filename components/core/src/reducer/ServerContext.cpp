@@ -158,7 +158,14 @@ void ServerContext::set_up_pipeline(nlohmann::json const& query_config) {
         m_is_timeline_aggregation = true;
     }
 
+    // A reducer that's one of several shards of a job writes its results to a separate collection,
+    // which the query scheduler merges into the job's collection once the job finishes.
     auto collection_name = std::to_string(m_job_id);
+    if (query_config.count(cJobAttributes::ResultsCollectionName) > 0
+        && false == query_config[cJobAttributes::ResultsCollectionName].is_null())
+    {
+        collection_name = query_config[cJobAttributes::ResultsCollectionName].get<std::string>();
+    }
     m_mongodb_results_collection = m_mongodb_results_database[collection_name];
 }
 
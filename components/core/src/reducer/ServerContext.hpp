@@ -26,6 +26,7 @@ enum class ServerStatus : uint8_t {
 namespace cJobAttributes {
 constexpr char JobId[] = "job_id";
 constexpr char TimeBucketSize[] = "count_by_time_bucket_size";
+constexpr char ResultsCollectionName[] = "results_collection_name";
 }  // namespace cJobAttributes
 
 /**
@@ -85,6 +85,7 @@ def main(argv: list[str]) -> int:
                 `creator_id` VARCHAR(64) NOT NULL,
                 `creation_ix` INT NOT NULL,
                 KEY `archives_creation_order` (`creator_id`,`creation_ix`) USING BTREE,
+                KEY `archives_time_range` (`end_timestamp`,`begin_timestamp`) USING BTREE,
                 UNIQUE KEY `archive_id` (`id`) USING BTREE,
                 PRIMARY KEY (`pagination_id`)
             )"""
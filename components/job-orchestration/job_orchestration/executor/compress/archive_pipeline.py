@@ -0,0 +1,126 @@
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+
+class ArchivePipeline:
+    """
+    Finalizes the archives that a compression task closes (e.g., uploads them, inserts their
+    metadata, and indexes them) in a bounded pool of background threads, so that the compressor can
+    keep compressing the next archive in the meantime.
+
+    Backpressure: `submit` blocks while the total size of the submitted archives that haven't been
+    finalized would exceed `max_pending_size`. Since the compressor blocks when its stdout pipe
+    isn't drained, this bounds the local disk used by closed archives.
+
+    Failure: Once finalizing any archive fails, `on_failure` is called, the error is recorded, and
+    the archives submitted after that are cleaned up without being finalized.
+    """
+
+    def __init__(
+        self,
+        finalize_archive: Callable[[dict[str, Any]], None],
+        clean_up_archive: Callable[[dict[str, Any]], None],
+        on_failure: Callable[[], None],
+        num_threads: int,
+        max_pending_size: int,
+        logger,
+    ) -> None:
+        """
+        :param finalize_archive: Finalizes the archive with the given stats. Raises on failure.
+        :param clean_up_archive: Cleans up the archive with the given stats after it has been
+            finalized, regardless of whether finalization succeeded. Raises on failure.
+        :param on_failure: Called (from a pipeline thread) when finalizing an archive first fails.
+        :param num_threads:
+        :param max_pending_size:
+        :param logger:
+        """
+        self.__finalize_archive = finalize_archive
+        self.__clean_up_archive = clean_up_archive
+        self.__on_failure = on_failure
+        self.__max_pending_size = max_pending_size
+        self.__logger = logger
+
+        self.__executor = ThreadPoolExecutor(
+            max_workers=num_threads, thread_name_prefix="archive-pipeline"
+        )
+        self.__condition = threading.Condition()
+        self.__num_pending_archives = 0
+        self.__pending_size = 0
+        self.__finalized_archives_stats: list[dict[str, Any]] = []
+        self.__error_msg: str | None = None
+
+    def submit(self, archive_stats: dict[str, Any]) -> None:
+        """
+        Submits an archive to be finalized, blocking until the pipeline has room for it.
+
+        NOTE: An archive larger than `max_pending_size` is admitted once no other archive is
+        pending.
+
+        :param archive_stats: The archive's stats, as output by the compressor.
+        """
+        archive_size = archive_stats["size"]
+        with self.__condition:
+            while (
+                self.__num_pending_archives > 0
+                and self.__pending_size + archive_size > self.__max_pending_size
+            ):
+                self.__condition.wait()
+            self.__num_pending_archives += 1
+            self.__pending_size += archive_size
+        self.__executor.submit(self.__process_archive, archive_stats)
+
+    def close(self) -> None:
+        """Waits for all submitted archives to be processed, and then shuts down the pipeline."""
+        self.__executor.shutdown(wait=True)
+
+    def get_finalized_archives_stats(self) -> list[dict[str, Any]]:
+        """
+        NOTE: This should only be called after `close`.
+
+        :return: The stats of every archive that was finalized successfully.
+        """
+        return self.__finalized_archives_stats
+
+    def get_error_msg(self) -> str | None:
+        """
+        NOTE: This should only be called after `close`.
+
+        :return: The error message of the first archive that failed to be finalized, if any.
+        """
+        return self.__error_msg
+
+    def __process_archive(self, archive_stats: dict[str, Any]) -> None:
+        archive_id = archive_stats["id"]
+        try:
+            with self.__condition:
+                failed = self.__error_msg is not None
+            if not failed:
+                self.__finalize(archive_stats)
+
+            try:
+                self.__clean_up_archive(archive_stats)
+            except Exception:
+                self.__logger.exception(f"Failed to clean up archive {archive_id}")
+        finally:
+            with self.__condition:
+                self.__num_pending_archives -= 1
+                self.__pending_size -= archive_stats["size"]
+                self.__condition.notify_all()
+
+    def __finalize(self, archive_stats: dict[str, Any]) -> None:
+        try:
+            self.__finalize_archive(archive_stats)
+        except Exception as err:
+            self.__logger.exception(f"Failed to finalize archive {archive_stats['id']}")
+            with self.__condition:
+                is_first_failure = self.__error_msg is None
+                if is_first_failure:
+                    self.__error_msg = str(err)
+            if is_first_failure:
+                self.__on_failure()
+            return
+
+        with self.__condition:
+            self.__finalized_archives_stats.append(archive_stats)
@@ -32,6 +32,8 @@ from clp_py_utils.s3_utils import (
 )
 from clp_py_utils.sql_adapter import SqlAdapter
 
+from job_orchestration.executor.compress.archive_pipeline import ArchivePipeline
+from job_orchestration.executor.utils import get_db_connection
 from job_orchestration.scheduler.constants import CompressionTaskStatus
 from job_orchestration.scheduler.job_config import (
     ClpIoConfig,
@@ -459,96 +461,107 @@ def run_clp(
             compression_cmd, stdout=subprocess.PIPE, stderr=stderr_log_file, env=compression_env
         )
 
-        # Compute the total amount of data compressed
-        last_archive_stats = None
-        last_line_decoded = False
-        total_uncompressed_size = 0
-        total_compressed_size = 0
+        def finalize_archive(archive_stats: dict[str, Any]) -> None:
+            archive_id = archive_stats["id"]
+            archive_path = archive_output_dir / archive_id
+            if enable_s3_write:
+                logger.info(f"Uploading archive {archive_id} to S3...")
+                _upload_archive_to_s3(s3_config, archive_path, archive_id, dataset)
+                logger.info(f"Finished uploading archive {archive_id} to S3.")
+
+            with (
+                closing(get_db_connection(sql_adapter)) as db_conn,
+                closing(db_conn.cursor(dictionary=True)) as db_cursor,
+            ):
+                table_prefix = clp_metadata_db_connection_config["table_prefix"]
+                if StorageEngine.CLP_S == clp_storage_engine:
+                    update_archive_metadata(db_cursor, table_prefix, dataset, archive_stats)
+                update_job_metadata(
+                    db_cursor,
+                    job_id,
+                    archive_stats,
+                )
+                db_conn.commit()
+
+            if StorageEngine.CLP_S == clp_storage_engine:
+                indexer_cmd = [
+                    str(clp_home / "bin" / "indexer"),
+                    *_get_db_connection_args_for_clp_cmd(clp_metadata_db_connection_config),
+                    dataset,
+                    archive_path,
+                ]
+
+                # Set environment variables for database credentials
+                indexer_env = dict(os.environ)
+                indexer_env.update(
+                    _get_db_connection_env_vars_for_clp_cmd(clp_metadata_db_connection_config)
+                )
 
-        # Handle job metadata update and S3 write if enabled
-        s3_error = None
-        while not last_line_decoded:
-            stats: dict[str, Any] | None = None
+                try:
+                    subprocess.run(
+                        indexer_cmd,
+                        stdout=subprocess.DEVNULL,
+                        stderr=stderr_log_file,
+                        check=True,
+                        env=indexer_env,
+                    )
+                except subprocess.CalledProcessError:
+                    logger.exception("Failed to index archive.")
+
+        def clean_up_archive(archive_stats: dict[str, Any]) -> None:
+            if enable_s3_write:
+                (archive_output_dir / archive_stats["id"]).unlink()
+
+        def stop_compression() -> None:
+            # NOTE: It's possible `proc` finishes before we call `terminate` on it, in which case
+            # the process will still return success.
+            proc.terminate()
+
+        # Finalize (upload, record, and index) each archive in the background once the compressor
+        # closes it, so that the compressor's output keeps being drained.
+        compression_worker_config = worker_config.compression_worker
+        archive_pipeline = ArchivePipeline(
+            finalize_archive=finalize_archive,
+            clean_up_archive=clean_up_archive,
+            on_failure=stop_compression,
+            num_threads=compression_worker_config.archive_pipeline_num_threads,
+            max_pending_size=compression_worker_config.archive_pipeline_max_pending_size,
+            logger=logger,
+        )
 
-            line = proc.stdout.readline()
-            if not line:
-                last_line_decoded = True
-            else:
-                stats = json.loads(line.decode("utf-8"))
+        try:
+            last_archive_stats = None
+            last_line_decoded = False
+            while not last_line_decoded:
+                stats: dict[str, Any] | None = None
 
-            if last_archive_stats is not None and (
-                None is stats or stats["id"] != last_archive_stats["id"]
-            ):
-                archive_id = last_archive_stats["id"]
-                archive_path = archive_output_dir / archive_id
-                if enable_s3_write:
-                    if s3_error is None:
-                        logger.info(f"Uploading archive {archive_id} to S3...")
-                        try:
-                            _upload_archive_to_s3(s3_config, archive_path, archive_id, dataset)
-                            logger.info(f"Finished uploading archive {archive_id} to S3.")
-                        except Exception as err:
-                            logger.exception(f"Failed to upload archive {archive_id}")
-                            s3_error = str(err)
-                            # NOTE: It's possible `proc` finishes before we call `terminate` on it,
-                            # in which case the process will still return success.
-                            proc.terminate()
-
-                if s3_error is None:
-                    # We've started a new archive so add the previous archive's last reported size
-                    # to the total
-                    total_uncompressed_size += last_archive_stats["uncompressed_size"]
-                    total_compressed_size += last_archive_stats["size"]
-                    with (
-                        closing(sql_adapter.create_connection(True)) as db_conn,
-                        closing(db_conn.cursor(dictionary=True)) as db_cursor,
-                    ):
-                        table_prefix = clp_metadata_db_connection_config["table_prefix"]
-                        if StorageEngine.CLP_S == clp_storage_engine:
-                            update_archive_metadata(
-                                db_cursor, table_prefix, dataset, last_archive_stats
-                            )
-                        update_job_metadata(
-                            db_cursor,
-                            job_id,
-                            last_archive_stats,
-                        )
-                        db_conn.commit()
-
-                    if StorageEngine.CLP_S == clp_storage_engine:
-                        indexer_cmd = [
-                            str(clp_home / "bin" / "indexer"),
-                            *_get_db_connection_args_for_clp_cmd(clp_metadata_db_connection_config),
-                            dataset,
-                            archive_path,
-                        ]
-
-                        # Set environment variables for database credentials
-                        indexer_env = dict(os.environ)
-                        indexer_env.update(
-                            _get_db_connection_env_vars_for_clp_cmd(
-                                clp_metadata_db_connection_config
-                            )
-                        )
-
-                        try:
-                            subprocess.run(
-                                indexer_cmd,
-                                stdout=subprocess.DEVNULL,
-                                stderr=stderr_log_file,
-                                check=True,
-                                env=indexer_env,
-                            )
-                        except subprocess.CalledProcessError:
-                            logger.exception("Failed to index archive.")
-
-                if enable_s3_write:
-                    archive_path.unlink()
-
-            last_archive_stats = stats
-
-        # Wait for compression to finish
-        return_code = proc.wait()
+                line = proc.stdout.readline()
+                if not line:
+                    last_line_decoded = True
+                else:
+                    stats = json.loads(line.decode("utf-8"))
+
+                if last_archive_stats is not None and (
+                    None is stats or stats["id"] != last_archive_stats["id"]
+                ):
+                    # We've started a new archive, so the previous archive's last reported stats
+                    # are final
+                    archive_pipeline.submit(last_archive_stats)
+
+                last_archive_stats = stats
+
+            # Wait for compression to finish
+            return_code = proc.wait()
+        finally:
+            archive_pipeline.close()
+
+        # Compute the total amount of data compressed
+        total_uncompressed_size = 0
+        total_compressed_size = 0
+        for archive_stats in archive_pipeline.get_finalized_archives_stats():
+            total_uncompressed_size += archive_stats["uncompressed_size"]
+            total_compressed_size += archive_stats["size"]
+        archive_error = archive_pipeline.get_error_msg()
 
         if 0 != return_code:
             logger.error(f"Failed to compress, return_code={return_code!s}")
@@ -565,13 +578,13 @@ def run_clp(
         "total_compressed_size": total_compressed_size,
     }
 
-    if compression_successful and s3_error is None:
+    if compression_successful and archive_error is None:
         return CompressionTaskStatus.SUCCEEDED, worker_output
     error_msgs = []
     if compression_successful is False:
         error_msgs.append(f"See logs {stderr_log_path}")
-    if s3_error is not None:
-        error_msgs.append(s3_error)
+    if archive_error is not None:
+        error_msgs.append(archive_error)
     worker_output["error_message"] = "\n".join(error_msgs)
     return CompressionTaskStatus.FAILED, worker_output
 
@@ -629,7 +642,7 @@ def compression_entry_point(
     logger.info(f"[job_id={job_id} task_id={task_id}] COMPRESSION COMPLETED.")
 
     with (
-        closing(sql_adapter.create_connection(True)) as db_conn,
+        closing(get_db_connection(sql_adapter)) as db_conn,
         closing(db_conn.cursor(dictionary=True)) as db_cursor,
     ):
         update_compression_task_metadata(
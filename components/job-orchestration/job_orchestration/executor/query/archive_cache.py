@@ -0,0 +1,231 @@
+"""
+A size-bounded cache, on the query worker's local disk, of the single-file archives that the worker
+downloaded from S3, so that searches and extractions of recently used archives don't download them
+again.
+
+The cache is shared by all of the worker's processes, so its state is kept entirely on disk:
+
+- Each cached archive is stored at `<cache dir>/<dataset>/<archive ID>`, and its modification time
+  is updated whenever it's used so that the least recently used archives are evicted first.
+- An archive that's in use is held with a shared `flock`, so that it can't be evicted until the
+  command using it finishes.
+- Looking up, adding, and evicting archives is serialized by an exclusive `flock` on a lock file,
+  while downloads happen without holding it.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import fcntl
+import logging
+import os
+import time
+import uuid
+from collections.abc import Generator
+from dataclasses import dataclass
+from pathlib import Path
+
+from clp_py_utils.clp_config import S3Config, StorageEngine, StorageType, WorkerConfig
+from clp_py_utils.s3_utils import s3_get
+
+ARCHIVE_CACHE_DIRECTORY_NAME = "query-worker-archive-cache"
+ARCHIVE_CACHE_LOCK_FILE_NAME = ".lock"
+
+# Prefix of the names of the files that archives are downloaded to before they're added to the cache
+DOWNLOAD_FILE_NAME_PREFIX = ".download-"
+
+# Age (in seconds) after which a download file is assumed to have been left behind by a process that
+# crashed, and is deleted
+STALE_DOWNLOAD_FILE_AGE = 60 * 60
+
+
+@dataclass
+class CachedArchive:
+    path: Path
+    # Whether the archive was already in the cache (rather than downloaded for this use)
+    is_cache_hit: bool
+
+
+class ArchiveCache:
+    def __init__(self, cache_dir: Path, max_size: int, s3_config: S3Config) -> None:
+        """
+        :param cache_dir:
+        :param max_size: The max total size (in bytes) of the cached archives.
+        :param s3_config: The S3 config of the archives' storage.
+        """
+        self.__cache_dir = cache_dir
+        self.__max_size = max_size
+        self.__s3_config = s3_config
+
+    @contextlib.contextmanager
+    def open_archive(
+        self, dataset: str | None, archive_id: str, logger: logging.Logger
+    ) -> Generator[CachedArchive | None, None, None]:
+        """
+        Gets the given archive from the cache, downloading it into the cache if it isn't there, and
+        keeps it from being evicted until the context exits.
+
+        :param dataset:
+        :param archive_id:
+        :param logger:
+        :return: A context manager that yields the cached archive, or None if the archive couldn't
+        be cached (e.g., because it's larger than the cache or its download failed), in which case
+        the caller should read the archive from S3.
+        """
+        archive_relative_path = f"{dataset}/{archive_id}"
+        archive_path = self.__cache_dir / archive_relative_path
+        archive_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self.__lock():
+            archive_fd = _open_and_lock_shared(archive_path)
+        is_cache_hit = archive_fd is not None
+
+        if archive_fd is None:
+            download_path = archive_path.parent / f"{DOWNLOAD_FILE_NAME_PREFIX}{uuid.uuid4()}"
+            try:
+                s3_get(self.__s3_config, archive_relative_path, download_path)
+                archive_size = download_path.stat().st_size
+                if archive_size > self.__max_size:
+                    logger.info(
+                        f"Archive {archive_id} ({archive_size} B) is larger than the archive cache."
+                    )
+                    download_path.unlink()
+                else:
+                    with self.__lock():
+                        self.__evict(self.__max_size - archive_size, logger)
+                        download_path.rename(archive_path)
+                        archive_fd = _open_and_lock_shared(archive_path)
+            except Exception:
+                logger.exception(f"Failed to cache archive {archive_id}.")
+                download_path.unlink(missing_ok=True)
+
+        if archive_fd is None:
+            yield None
+            return
+
+        try:
+            yield CachedArchive(path=archive_path, is_cache_hit=is_cache_hit)
+        finally:
+            os.close(archive_fd)
+
+    @contextlib.contextmanager
+    def __lock(self) -> Generator[None, None, None]:
+        self.__cache_dir.mkdir(parents=True, exist_ok=True)
+        lock_fd = os.open(self.__cache_dir / ARCHIVE_CACHE_LOCK_FILE_NAME, os.O_CREAT | os.O_RDWR)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(lock_fd)
+
+    def __evict(self, target_size: int, logger: logging.Logger) -> None:
+        """
+        Evicts the least recently used archives that aren't in use until the total size of the
+        cached archives is at most `target_size`, or no more archives can be evicted. Also deletes
+        stale download files.
+
+        NOTE: The cache lock must be held. Download files may still be deleted concurrently (e.g.,
+        by the process that downloaded them), so files that disappear are skipped.
+
+        :param target_size:
+        :param logger:
+        """
+        now = time.time()
+        cached_archives: list[tuple[float, int, Path]] = []
+        total_size = 0
+        for dataset_dir in self.__cache_dir.iterdir():
+            if not dataset_dir.is_dir():
+                continue
+            for path in dataset_dir.iterdir():
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                if path.name.startswith(DOWNLOAD_FILE_NAME_PREFIX):
+                    if now - stat.st_mtime > STALE_DOWNLOAD_FILE_AGE:
+                        path.unlink(missing_ok=True)
+                    continue
+                cached_archives.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+
+        cached_archives.sort()
+        for _, size, path in cached_archives:
+            if total_size <= target_size:
+                break
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except FileNotFoundError:
+                total_size -= size
+                continue
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # The archive is in use
+                os.close(fd)
+                continue
+            path.unlink(missing_ok=True)
+            os.close(fd)
+            total_size -= size
+            logger.debug(f"Evicted archive {path.name} from the archive cache.")
+
+
+def create_archive_cache(worker_config: WorkerConfig) -> ArchiveCache | None:
+    """
+    :param worker_config:
+    :return: The worker's archive cache, or None if archives aren't stored on S3 (which only the
+    `clp-s` storage engine supports) or the cache is disabled.
+    """
+    storage_config = worker_config.archive_output.storage
+    max_size = worker_config.query_worker.archive_cache_max_size
+    if (
+        StorageEngine.CLP_S != worker_config.package.storage_engine
+        or StorageType.S3 != storage_config.type
+        or 0 == max_size
+    ):
+        return None
+    return ArchiveCache(
+        worker_config.tmp_directory / ARCHIVE_CACHE_DIRECTORY_NAME,
+        max_size,
+        storage_config.s3_config,
+    )
+
+
+@contextlib.contextmanager
+def open_cached_archive(
+    archive_cache: ArchiveCache | None,
+    dataset: str | None,
+    archive_id: str,
+    logger: logging.Logger,
+) -> Generator[CachedArchive | None, None, None]:
+    """
+    Like `ArchiveCache.open_archive`, except it yields None if `archive_cache` is None.
+
+    :param archive_cache:
+    :param dataset:
+    :param archive_id:
+    :param logger:
+    """
+    if archive_cache is None:
+        yield None
+        return
+    with archive_cache.open_archive(dataset, archive_id, logger) as cached_archive:
+        yield cached_archive
+
+
+def _open_and_lock_shared(path: Path) -> int | None:
+    """
+    Opens the given file and acquires a shared lock on it, which is released when the returned file
+    descriptor is closed. Also marks the file as recently used.
+
+    NOTE: The cache lock must be held, so that the file can't be evicted in between.
+
+    :param path:
+    :return: The file descriptor, or None if the file doesn't exist.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return None
+    fcntl.flock(fd, fcntl.LOCK_SH)
+    os.utime(fd)
+    return fd
@@ -1,16 +1,28 @@
 import os
 
-from job_orchestration.scheduler.constants import SchedulerType
+from job_orchestration.scheduler.constants import (
+    QUERY_TASK_QUEUE_NAME,
+    TASK_QUEUE_HIGHEST_PRIORITY,
+)
 
+# Worker settings
+# By default, workers consume only one task at a time, so that queued tasks are consumed in priority
+# order
+worker_prefetch_multiplier = int(os.getenv("CLP_QUERY_WORKER_PREFETCH_MULTIPLIER", "1"))
+# Have each worker also consume its own queue, so the scheduler can route tasks to the worker that's
+# likely to have their archives cached
+worker_direct = True
 imports = (
     "job_orchestration.executor.query.fs_search_task",
     "job_orchestration.executor.query.extract_stream_task",
 )
 
 task_routes = {
-    "job_orchestration.executor.query.fs_search_task.search": SchedulerType.QUERY,
-    "job_orchestration.executor.query.extract_stream_task.extract_stream": SchedulerType.QUERY,
+    "job_orchestration.executor.query.fs_search_task.search": QUERY_TASK_QUEUE_NAME,
+    "job_orchestration.executor.query.fs_search_task.search_archives": QUERY_TASK_QUEUE_NAME,
+    "job_orchestration.executor.query.extract_stream_task.extract_stream": QUERY_TASK_QUEUE_NAME,
 }
+task_queue_max_priority = TASK_QUEUE_HIGHEST_PRIORITY
 task_create_missing_queues = True
 
 broker_url = os.getenv("BROKER_URL")
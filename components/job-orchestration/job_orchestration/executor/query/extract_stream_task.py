@@ -21,6 +21,10 @@ from clp_py_utils.s3_utils import (
 )
 from clp_py_utils.sql_adapter import SqlAdapter
 
+from job_orchestration.executor.query.archive_cache import (
+    create_archive_cache,
+    open_cached_archive,
+)
 from job_orchestration.executor.query.celery import app
 from job_orchestration.executor.query.utils import (
     report_task_failure,
@@ -84,6 +88,7 @@ def _make_clp_s_command_and_env_vars(
     results_cache_uri: str,
     print_stream_stats: bool,
     dataset: str | None = None,
+    cached_archive_path: Path | None = None,
 ) -> tuple[list[str] | None, dict[str, str] | None]:
     storage_type = worker_config.archive_output.storage.type
     stream_output_dir = worker_config.stream_output.get_directory()
@@ -96,7 +101,15 @@ def _make_clp_s_command_and_env_vars(
         "x",
     ]
 
-    if StorageType.S3 == storage_type:
+    if cached_archive_path is not None:
+        # fmt: off
+        command.extend((
+            str(cached_archive_path),
+            str(stream_output_dir),
+        ))
+        # fmt: on
+        env_vars = None
+    elif StorageType.S3 == storage_type:
         s3_config = worker_config.archive_output.storage.s3_config
         s3_object_key = f"{s3_config.key_prefix}{dataset}/{archive_id}"
         try:
@@ -154,7 +167,20 @@ def _make_command_and_env_vars(
     results_cache_uri: str,
     print_stream_stats: bool,
     dataset: str | None = None,
+    cached_archive_path: Path | None = None,
 ) -> tuple[list[str] | None, dict[str, str] | None]:
+    """
+    :param clp_home:
+    :param worker_config:
+    :param archive_id:
+    :param job_config:
+    :param results_cache_uri:
+    :param print_stream_stats:
+    :param dataset:
+    :param cached_archive_path: The path of the archive in the worker's archive cache, if it's
+        cached.
+    :return: A tuple of the command and its environment variables, or (None, None) on error.
+    """
     storage_engine = worker_config.package.storage_engine
     if StorageEngine.CLP == storage_engine:
         command, env_vars = _make_clp_command_and_env_vars(
@@ -174,6 +200,7 @@ def _make_command_and_env_vars(
             results_cache_uri,
             print_stream_stats,
             dataset,
+            cached_archive_path,
         )
     else:
         logger.error(f"Unsupported storage engine {storage_engine}")
@@ -191,6 +218,7 @@ def extract_stream(
     clp_metadata_db_conn_params: dict,
     results_cache_uri: str,
     dataset: str | None = None,
+    dispatch_time: float | None = None,
 ) -> dict[str, Any]:
     task_name = "Stream Extraction"
 
@@ -226,34 +254,40 @@ def extract_stream(
         s3_config = storage_config.s3_config
         enable_s3_upload = True
 
-    task_command, core_clp_env_vars = _make_command_and_env_vars(
-        clp_home=clp_home,
-        worker_config=worker_config,
-        archive_id=archive_id,
-        job_config=job_config,
-        results_cache_uri=results_cache_uri,
-        print_stream_stats=enable_s3_upload,
-        dataset=dataset,
-    )
-    if not task_command:
-        logger.error(f"Error creating {task_name} command")
-        return report_task_failure(
+    archive_cache = create_archive_cache(worker_config)
+    with open_cached_archive(archive_cache, dataset, archive_id, logger) as cached_archive:
+        task_command, core_clp_env_vars = _make_command_and_env_vars(
+            clp_home=clp_home,
+            worker_config=worker_config,
+            archive_id=archive_id,
+            job_config=job_config,
+            results_cache_uri=results_cache_uri,
+            print_stream_stats=enable_s3_upload,
+            dataset=dataset,
+            cached_archive_path=None if cached_archive is None else cached_archive.path,
+        )
+        if not task_command:
+            logger.error(f"Error creating {task_name} command")
+            return report_task_failure(
+                sql_adapter=sql_adapter,
+                task_id=task_id,
+                start_time=start_time,
+            )
+
+        task_results, task_stdout_str = run_query_task(
             sql_adapter=sql_adapter,
+            logger=logger,
+            clp_logs_dir=clp_logs_dir,
+            task_command=task_command,
+            env_vars=core_clp_env_vars,
+            task_name=task_name,
+            job_id=job_id,
             task_id=task_id,
             start_time=start_time,
+            dispatch_time=dispatch_time,
         )
-
-    task_results, task_stdout_str = run_query_task(
-        sql_adapter=sql_adapter,
-        logger=logger,
-        clp_logs_dir=clp_logs_dir,
-        task_command=task_command,
-        env_vars=core_clp_env_vars,
-        task_name=task_name,
-        job_id=job_id,
-        task_id=task_id,
-        start_time=start_time,
-    )
+    if cached_archive is not None:
+        task_results.archive_cache_hit = cached_archive.is_cache_hit
 
     if enable_s3_upload and QueryTaskStatus.SUCCEEDED == task_results.status:
         logger.info("Uploading streams to S3...")
@@ -1,9 +1,12 @@
 import datetime
+import json
 import os
+import zlib
 from pathlib import Path
 from typing import Any
 
 import msgpack
+import redis
 from celery.app.task import Task
 from celery.utils.log import get_task_logger
 from clp_py_utils.clp_config import (
@@ -20,14 +23,26 @@ from clp_py_utils.s3_utils import (
 )
 from clp_py_utils.sql_adapter import SqlAdapter
 
+from job_orchestration.executor.query.archive_cache import (
+    create_archive_cache,
+    open_cached_archive,
+)
 from job_orchestration.executor.query.celery import app
+from job_orchestration.executor.query.streaming_results_uploader import StreamingResultsUploader
 from job_orchestration.executor.query.utils import (
+    get_queue_duration,
     report_task_failure,
     run_query_task,
+    run_task_command,
+    update_query_tasks_metadata,
 )
 from job_orchestration.executor.utils import load_worker_config
-from job_orchestration.scheduler.job_config import SearchJobConfig
-from job_orchestration.scheduler.scheduler_data import QueryTaskResult, QueryTaskStatus
+from job_orchestration.scheduler.job_config import AggregationConfig, SearchJobConfig
+from job_orchestration.scheduler.scheduler_data import (
+    QueryTaskResult,
+    QueryTaskStatus,
+    SearchResultsSummary,
+)
 
 # Setup logging
 logger = get_task_logger(__name__)
@@ -68,12 +83,16 @@ def _make_core_clp_s_command_and_env_vars(
     archive_id: str,
     search_config: SearchJobConfig,
     dataset: str,
+    cached_archive_path: Path | None,
 ) -> tuple[list[str] | None, dict[str, str] | None]:
     command = [
         str(clp_home / "bin" / "clp-s"),
         "s",
     ]
-    if StorageType.S3 == worker_config.archive_output.storage.type:
+    if cached_archive_path is not None:
+        command.append(str(cached_archive_path))
+        env_vars = None
+    elif StorageType.S3 == worker_config.archive_output.storage.type:
         s3_config = worker_config.archive_output.storage.s3_config
         s3_object_key = f"{s3_config.key_prefix}{dataset}/{archive_id}"
         try:
@@ -105,6 +124,20 @@ def _make_core_clp_s_command_and_env_vars(
     return command, env_vars
 
 
+def _get_reducer_address(aggregation_config: AggregationConfig, archive_id: str) -> tuple[str, int]:
+    """
+    :param aggregation_config:
+    :param archive_id:
+    :return: The address (host and port) of the reducer that the given archive's search results
+    should be sent to. If the job's results are partitioned across several reducer shards, the
+    archive is assigned to a shard by its ID, so that the archives are spread evenly across them.
+    """
+    shard_addresses = aggregation_config.reducer_shard_addresses
+    if shard_addresses is None or 0 == len(shard_addresses):
+        return aggregation_config.reducer_host, aggregation_config.reducer_port
+    return shard_addresses[zlib.crc32(archive_id.encode()) % len(shard_addresses)]
+
+
 def _make_command_and_env_vars(
     clp_home: Path,
     worker_config: WorkerConfig,
@@ -113,7 +146,20 @@ def _make_command_and_env_vars(
     results_cache_uri: str,
     results_collection: str,
     dataset: str | None = None,
+    cached_archive_path: Path | None = None,
 ) -> tuple[list[str] | None, dict[str, str] | None]:
+    """
+    :param clp_home:
+    :param worker_config:
+    :param archive_id:
+    :param search_config:
+    :param results_cache_uri:
+    :param results_collection:
+    :param dataset:
+    :param cached_archive_path: The path of the archive in the worker's archive cache, if it's
+        cached.
+    :return: A tuple of the command and its environment variables, or (None, None) on error.
+    """
     storage_engine = worker_config.package.storage_engine
 
     if StorageEngine.CLP == storage_engine:
@@ -122,7 +168,7 @@ def _make_command_and_env_vars(
         )
     elif StorageEngine.CLP_S == storage_engine:
         command, env_vars = _make_core_clp_s_command_and_env_vars(
-            clp_home, worker_config, archive_id, search_config, dataset
+            clp_home, worker_config, archive_id, search_config, dataset, cached_archive_path
         )
     else:
         logger.error(f"Unsupported storage engine {storage_engine}")
@@ -149,11 +195,12 @@ def _make_command_and_env_vars(
             command.append("--count-by-time")
             command.append(str(aggregation_config.count_by_time_bucket_size))
 
+        reducer_host, reducer_port = _get_reducer_address(aggregation_config, archive_id)
         # fmt: off
         command.extend((
             "reducer",
-            "--host", aggregation_config.reducer_host,
-            "--port", str(aggregation_config.reducer_port),
+            "--host", reducer_host,
+            "--port", str(reducer_port),
             "--job-id", str(aggregation_config.job_id)
         ))
         # fmt: on
@@ -190,6 +237,77 @@ def _make_command_and_env_vars(
     return command, env_vars
 
 
+def _streams_results_to_s3(search_config: SearchJobConfig, worker_config: WorkerConfig) -> bool:
+    return (
+        search_config.write_to_file
+        and StorageType.S3 == worker_config.stream_output.storage.type
+        and worker_config.query_worker.stream_search_results_upload
+    )
+
+
+def _create_streaming_results_uploader(
+    search_config: SearchJobConfig, worker_config: WorkerConfig, job_id: str, archive_id: str
+) -> StreamingResultsUploader | None:
+    """
+    Creates and starts an uploader for the results the search of the given archive writes to a
+    file, if they should be streamed to S3.
+
+    :param search_config:
+    :param worker_config:
+    :param job_id:
+    :param archive_id:
+    :return: The started uploader, or None if the results shouldn't be streamed.
+    :raises: Propagates `StreamingResultsUploader.start`'s exceptions.
+    """
+    if not _streams_results_to_s3(search_config, worker_config):
+        return None
+    # The result backend is Redis, whose client can also count the job's results
+    redis_client = getattr(app.backend, "client", None)
+    if not isinstance(redis_client, redis.Redis):
+        redis_client = None
+    results_uploader = StreamingResultsUploader(
+        fifo_path=worker_config.stream_output.get_directory() / job_id / archive_id,
+        s3_config=worker_config.stream_output.storage.s3_config,
+        dest_path_prefix=f"{job_id}/{archive_id}",
+        job_id=job_id,
+        max_num_results=search_config.max_num_results,
+        redis_client=redis_client,
+        logger=logger,
+    )
+    results_uploader.start()
+    return results_uploader
+
+
+def _outputs_to_results_cache(search_config: SearchJobConfig) -> bool:
+    return (
+        search_config.aggregation_config is None
+        and search_config.network_address is None
+        and not search_config.write_to_file
+    )
+
+
+def _parse_results_summary(task_stdout_str: str) -> SearchResultsSummary | None:
+    """
+    Parses the summary of the results that the search wrote to the results cache, which the search
+    prints to stdout as a JSON object.
+
+    NOTE: A search that finds nothing to search in the archive (e.g., no schemas or timestamp ranges
+    match the query) exits successfully without printing a summary, so empty output is treated as a
+    summary of zero results.
+
+    :param task_stdout_str:
+    :return: The summary, or None if the search printed an invalid summary.
+    """
+    lines = task_stdout_str.splitlines()
+    if len(lines) == 0:
+        return SearchResultsSummary(num_results=0)
+    try:
+        return SearchResultsSummary.model_validate(json.loads(lines[-1]))
+    except Exception:
+        logger.exception(f"`{lines[-1]}` isn't a valid summary of the search's results.")
+        return None
+
+
 def upload_results_to_s3(
     task_results: QueryTaskResult, s3_config: Any, src_file: Path, dest_path: str
 ):
@@ -219,6 +337,7 @@ def search(
     clp_metadata_db_conn_params: dict,
     results_cache_uri: str,
     dataset: str | None = None,
+    dispatch_time: float | None = None,
 ) -> dict[str, Any]:
     task_name = "search"
 
@@ -246,44 +365,239 @@ def search(
     clp_home = Path(os.getenv("CLP_HOME"))
     search_config = SearchJobConfig.model_validate(msgpack.unpackb(job_config_blob))
 
-    task_command, core_clp_env_vars = _make_command_and_env_vars(
-        clp_home=clp_home,
-        worker_config=worker_config,
-        archive_id=archive_id,
-        search_config=search_config,
-        results_cache_uri=results_cache_uri,
-        results_collection=job_id,
-        dataset=dataset,
-    )
-    if not task_command:
-        logger.error(f"Error creating {task_name} command")
-        return report_task_failure(
+    archive_cache = create_archive_cache(worker_config)
+    with open_cached_archive(archive_cache, dataset, archive_id, logger) as cached_archive:
+        task_command, core_clp_env_vars = _make_command_and_env_vars(
+            clp_home=clp_home,
+            worker_config=worker_config,
+            archive_id=archive_id,
+            search_config=search_config,
+            results_cache_uri=results_cache_uri,
+            results_collection=job_id,
+            dataset=dataset,
+            cached_archive_path=None if cached_archive is None else cached_archive.path,
+        )
+        if not task_command:
+            logger.error(f"Error creating {task_name} command")
+            return report_task_failure(
+                sql_adapter=sql_adapter,
+                task_id=task_id,
+                start_time=start_time,
+            )
+        try:
+            results_uploader = _create_streaming_results_uploader(
+                search_config, worker_config, job_id, archive_id
+            )
+        except OSError:
+            logger.exception("Failed to set up streaming upload of the search's results.")
+            return report_task_failure(
+                sql_adapter=sql_adapter,
+                task_id=task_id,
+                start_time=start_time,
+            )
+
+        task_results, task_stdout_str = run_query_task(
             sql_adapter=sql_adapter,
+            logger=logger,
+            clp_logs_dir=clp_logs_dir,
+            task_command=task_command,
+            env_vars=core_clp_env_vars,
+            task_name=task_name,
+            job_id=job_id,
             task_id=task_id,
             start_time=start_time,
+            dispatch_time=dispatch_time,
+            task_proc_observer=results_uploader,
         )
+    if cached_archive is not None:
+        task_results.archive_cache_hit = cached_archive.is_cache_hit
 
-    task_results, _ = run_query_task(
-        sql_adapter=sql_adapter,
-        logger=logger,
-        clp_logs_dir=clp_logs_dir,
-        task_command=task_command,
-        env_vars=core_clp_env_vars,
-        task_name=task_name,
-        job_id=job_id,
-        task_id=task_id,
-        start_time=start_time,
+    _handle_search_output(
+        task_results, task_stdout_str, search_config, worker_config, job_id, archive_id
+    )
+
+    return task_results.model_dump()
+
+
+@app.task(bind=True)
+def search_archives(
+    self: Task,
+    job_id: str,
+    task_ids: list[int],
+    job_config_blob: bytes,
+    archive_ids: list[str],
+    clp_metadata_db_conn_params: dict,
+    results_cache_uri: str,
+    datasets: list[str | None] | None = None,
+    dispatch_time: float | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Searches several archives one after another, each as a separate query task, so that the
+    overhead of a Celery task (e.g., loading the worker's config and updating the tasks' metadata in
+    the database) is amortized over the archives.
+
+    :param self:
+    :param job_id:
+    :param task_ids: The ID of the query task for each archive.
+    :param job_config_blob:
+    :param archive_ids:
+    :param clp_metadata_db_conn_params:
+    :param results_cache_uri:
+    :param datasets: The dataset of each archive, if any.
+    :param dispatch_time: The UNIX timestamp (in seconds) at which the scheduler sent the task to
+        the task queue, if known.
+    :return: The result of each archive's query task, in the same order as `archive_ids`.
+    """
+    task_name = "search"
+
+    # Setup logging to file
+    clp_logs_dir = Path(os.getenv("CLP_LOGS_DIR"))
+    clp_logging_level = os.getenv("CLP_LOGGING_LEVEL")
+    set_logging_level(logger, clp_logging_level)
+
+    logger.info(f"Started {task_name} task for job {job_id} with {len(archive_ids)} archive(s)")
+
+    start_time = datetime.datetime.now()
+    sql_adapter = SqlAdapter(Database.model_validate(clp_metadata_db_conn_params))
+
+    # Load configuration
+    clp_config_path = Path(os.getenv("CLP_CONFIG_PATH"))
+    worker_config = load_worker_config(clp_config_path, logger)
+    if worker_config is None:
+        update_query_tasks_metadata(
+            sql_adapter,
+            {
+                task_id: dict(status=QueryTaskStatus.FAILED, duration=0, start_time=start_time)
+                for task_id in task_ids
+            },
+        )
+        return [
+            QueryTaskResult(task_id=task_id, status=QueryTaskStatus.FAILED, duration=0).model_dump()
+            for task_id in task_ids
+        ]
+
+    clp_home = Path(os.getenv("CLP_HOME"))
+    search_config = SearchJobConfig.model_validate(msgpack.unpackb(job_config_blob))
+    if datasets is None:
+        datasets = [None] * len(archive_ids)
+
+    update_query_tasks_metadata(
+        sql_adapter,
+        {
+            task_id: dict(status=QueryTaskStatus.RUNNING, start_time=start_time)
+            for task_id in task_ids
+        },
     )
 
+    # The time the task waited for its earlier archives' searches is part of the task's execution,
+    # so every archive is attributed the same queue duration
+    queue_duration = get_queue_duration(start_time, dispatch_time)
+    archive_cache = create_archive_cache(worker_config)
+    task_results = []
+    task_metadata_by_task_id = {}
+    for task_id, archive_id, dataset in zip(task_ids, archive_ids, datasets, strict=True):
+        archive_start_time = datetime.datetime.now()
+        execution_duration: float | None = None
+        task_stdout_str = ""
+        clo_log_path: Path | None = None
+        with open_cached_archive(archive_cache, dataset, archive_id, logger) as cached_archive:
+            task_command, core_clp_env_vars = _make_command_and_env_vars(
+                clp_home=clp_home,
+                worker_config=worker_config,
+                archive_id=archive_id,
+                search_config=search_config,
+                results_cache_uri=results_cache_uri,
+                results_collection=job_id,
+                dataset=dataset,
+                cached_archive_path=None if cached_archive is None else cached_archive.path,
+            )
+            results_uploader = None
+            if task_command:
+                try:
+                    results_uploader = _create_streaming_results_uploader(
+                        search_config, worker_config, job_id, archive_id
+                    )
+                except OSError:
+                    logger.exception("Failed to set up streaming upload of the search's results.")
+                    task_command = None
+            if not task_command:
+                logger.error(f"Error creating {task_name} command")
+                task_status = QueryTaskStatus.FAILED
+            else:
+                task_status, execution_duration, task_stdout_str, clo_log_path = run_task_command(
+                    logger,
+                    clp_logs_dir,
+                    task_command,
+                    core_clp_env_vars,
+                    task_name,
+                    job_id,
+                    task_id,
+                    results_uploader,
+                )
+        duration = (datetime.datetime.now() - archive_start_time).total_seconds()
+
+        task_result = QueryTaskResult(
+            status=task_status,
+            task_id=task_id,
+            duration=duration,
+            queue_duration=queue_duration,
+            execution_duration=execution_duration,
+        )
+        if QueryTaskStatus.FAILED == task_status and clo_log_path is not None:
+            task_result.error_log_path = str(clo_log_path)
+        if cached_archive is not None:
+            task_result.archive_cache_hit = cached_archive.is_cache_hit
+        _handle_search_output(
+            task_result, task_stdout_str, search_config, worker_config, job_id, archive_id
+        )
+        task_results.append(task_result.model_dump())
+
+        task_metadata = dict(
+            status=task_result.status, start_time=archive_start_time, duration=duration
+        )
+        if execution_duration is not None:
+            task_metadata["execution_duration"] = execution_duration
+        if queue_duration is not None:
+            task_metadata["queue_duration"] = queue_duration
+        task_metadata_by_task_id[task_id] = task_metadata
+
+    update_query_tasks_metadata(sql_adapter, task_metadata_by_task_id)
+    return task_results
+
+
+def _handle_search_output(
+    task_result: QueryTaskResult,
+    task_stdout_str: str,
+    search_config: SearchJobConfig,
+    worker_config: WorkerConfig,
+    job_id: str,
+    archive_id: str,
+) -> None:
+    """
+    Handles the output of an archive's search: parses the summary of the results it wrote to the
+    results cache, or uploads the results it wrote to a file to S3 (if configured).
+
+    :param task_result: [out] Updated with the results' summary, or marked as failed if the upload
+        fails.
+    :param task_stdout_str:
+    :param search_config:
+    :param worker_config:
+    :param job_id:
+    :param archive_id:
+    """
+    if QueryTaskStatus.SUCCEEDED != task_result.status:
+        return
+
+    if _outputs_to_results_cache(search_config):
+        task_result.results_summary = _parse_results_summary(task_stdout_str)
+
     storage_config = worker_config.stream_output.storage
     if (
         StorageType.S3 == storage_config.type
         and search_config.write_to_file
-        and QueryTaskStatus.SUCCEEDED == task_results.status
+        and not _streams_results_to_s3(search_config, worker_config)
     ):
         s3_config = storage_config.s3_config
         src_file = Path(worker_config.stream_output.get_directory()) / job_id / archive_id
         dest_path = f"{job_id}/{archive_id}"
-        upload_results_to_s3(task_results, s3_config, src_file, dest_path)
-
-    return task_results.model_dump()
+        upload_results_to_s3(task_result, s3_config, src_file, dest_path)
@@ -0,0 +1,252 @@
+"""
+Streaming upload of the results that a search writes to a file, so that the results are uploaded to
+S3 while the search is still writing them (rather than staged on local disk and uploaded after the
+search finishes), and so that the search stops once its job has found enough results.
+
+The search writes its results to a FIFO as a stream of MessagePack-encoded results. The stream is
+split at result boundaries into chunks that are each uploaded as a separate object under the job's
+results prefix, since the job's results are read as all of the objects under that prefix. The number
+of results uploaded by all of a job's tasks is counted in Redis so that every task can stop once the
+job has reached `max_num_results`.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import contextlib
+import fcntl
+import logging
+import os
+import signal
+import subprocess
+import threading
+from pathlib import Path
+
+import msgpack
+import redis
+from clp_py_utils.clp_config import S3Config
+from clp_py_utils.s3_utils import s3_put_bytes
+
+from job_orchestration.executor.query.utils import TaskProcessObserver
+from job_orchestration.scheduler.scheduler_data import QueryTaskStatus
+
+# Min size (in bytes) of each uploaded chunk of results, except the last
+RESULTS_CHUNK_SIZE = 8 * 1024 * 1024  # 8 MiB
+
+# Size (in bytes) of each read from the FIFO
+FIFO_READ_SIZE = 256 * 1024
+
+# Max number of chunks that are uploading or waiting to be uploaded, per upload thread. The search
+# blocks on writing to the FIFO while this is reached, which bounds memory usage.
+MAX_NUM_PENDING_CHUNKS_PER_UPLOAD_THREAD = 2
+
+JOB_NUM_RESULTS_KEY_PREFIX = "clp-search-job-num-results-"
+
+# Time (in seconds) after which a job's result count expires from Redis
+JOB_NUM_RESULTS_KEY_TTL = 24 * 60 * 60
+
+
+class StreamingResultsUploader(TaskProcessObserver):
+    """
+    Reads the results a search writes to a FIFO and uploads them to S3 in chunks while the search
+    runs. Once the search's job has found `max_num_results` results across all its tasks, the search
+    is stopped, and it's treated as having succeeded.
+
+    NOTE: `start` must be called before the search is started. The uploader must then be passed to
+    `run_task_command` so that it's notified when the search starts and exits.
+    """
+
+    def __init__(
+        self,
+        fifo_path: Path,
+        s3_config: S3Config,
+        dest_path_prefix: str,
+        job_id: str,
+        max_num_results: int,
+        redis_client: redis.Redis | None,
+        logger: logging.Logger,
+    ) -> None:
+        """
+        :param fifo_path: The path at which to create the FIFO the search writes its results to.
+        :param s3_config:
+        :param dest_path_prefix: The prefix of the destination path of each chunk in the S3 bucket.
+        :param job_id:
+        :param max_num_results: The max number of results the job needs, or 0 if unlimited.
+        :param redis_client: The client for counting the job's results, or None to not limit them.
+        :param logger:
+        """
+        self.__fifo_path = fifo_path
+        self.__s3_config = s3_config
+        self.__dest_path_prefix = dest_path_prefix
+        self.__max_num_results = max_num_results
+        self.__redis_client = redis_client if max_num_results > 0 else None
+        self.__job_num_results_key = f"{JOB_NUM_RESULTS_KEY_PREFIX}{job_id}"
+        self.__logger = logger
+
+        self.__read_fd: int | None = None
+        # A write end of the FIFO that's held open until the search exits, so that the reader
+        # doesn't see EOF before the search opens the FIFO (or if the search never opens it)
+        self.__placeholder_write_fd: int | None = None
+        self.__reader_thread: threading.Thread | None = None
+        self.__upload_executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self.__pending_chunks_semaphore = threading.BoundedSemaphore(
+            s3_config.upload_max_concurrency * MAX_NUM_PENDING_CHUNKS_PER_UPLOAD_THREAD
+        )
+        self.__num_chunks = 0
+
+        # Set once the job has found `max_num_results` results. It's set while `__lock` is held so
+        # that the search is stopped even if it's started concurrently.
+        self.__result_limit_reached = threading.Event()
+
+        # Guards the state below, which is shared by the reader thread, the upload threads, and the
+        # thread running the search
+        self.__lock = threading.Lock()
+        self.__task_proc: subprocess.Popen | None = None
+        self.__has_failed = False
+
+    def start(self) -> None:
+        """
+        Creates the FIFO and starts reading from it.
+
+        :raises: Propagates `os.mkfifo`'s and `os.open`'s exceptions.
+        """
+        self.__fifo_path.unlink(missing_ok=True)
+        os.mkfifo(self.__fifo_path)
+        # Opening a FIFO blocks until its other end is opened, unless it's opened in non-blocking
+        # mode (which only succeeds for a write end if a read end is open).
+        self.__read_fd = os.open(self.__fifo_path, os.O_RDONLY | os.O_NONBLOCK)
+        self.__placeholder_write_fd = os.open(self.__fifo_path, os.O_WRONLY | os.O_NONBLOCK)
+        read_fd_flags = fcntl.fcntl(self.__read_fd, fcntl.F_GETFL)
+        fcntl.fcntl(self.__read_fd, fcntl.F_SETFL, read_fd_flags & ~os.O_NONBLOCK)
+
+        if self.__get_job_num_results(0) >= self.__max_num_results > 0:
+            self.__logger.info("Job has already found enough results; skipping the search.")
+            self.__result_limit_reached.set()
+
+        self.__upload_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.__s3_config.upload_max_concurrency
+        )
+        self.__reader_thread = threading.Thread(target=self.__read_results, daemon=True)
+        self.__reader_thread.start()
+
+    def on_started(self, task_proc: subprocess.Popen) -> None:
+        with self.__lock:
+            self.__task_proc = task_proc
+            if self.__result_limit_reached.is_set():
+                self.__stop_search()
+
+    def on_exited(self, task_status: QueryTaskStatus) -> QueryTaskStatus:
+        os.close(self.__placeholder_write_fd)
+        self.__reader_thread.join()
+        self.__upload_executor.shutdown(wait=True)
+        self.__fifo_path.unlink(missing_ok=True)
+
+        with self.__lock:
+            if self.__has_failed:
+                return QueryTaskStatus.FAILED
+            if self.__result_limit_reached.is_set():
+                self.__logger.info("Stopped the search since its job has found enough results.")
+                return QueryTaskStatus.SUCCEEDED
+        return task_status
+
+    def __read_results(self) -> None:
+        unpacker = msgpack.Unpacker()
+        buffer = bytearray()
+        # Offset of the start of `buffer` in the stream
+        buffer_offset = 0
+        # Offsets (relative to `buffer`) of the end of each complete result in `buffer`
+        result_end_offsets: list[int] = []
+        try:
+            with os.fdopen(self.__read_fd, "rb", buffering=0) as fifo:
+                while not self.__result_limit_reached.is_set():
+                    data = fifo.read(FIFO_READ_SIZE)
+                    if not data:
+                        break
+                    buffer += data
+                    unpacker.feed(data)
+                    for _ in unpacker:
+                        result_end_offsets.append(unpacker.tell() - buffer_offset)
+                    if len(result_end_offsets) == 0 or result_end_offsets[-1] < RESULTS_CHUNK_SIZE:
+                        continue
+
+                    chunk_size = result_end_offsets[-1]
+                    self.__upload_chunk(bytes(buffer[:chunk_size]), result_end_offsets)
+                    del buffer[:chunk_size]
+                    buffer_offset += chunk_size
+                    result_end_offsets = []
+
+                if len(result_end_offsets) > 0 and not self.__result_limit_reached.is_set():
+                    self.__upload_chunk(bytes(buffer[: result_end_offsets[-1]]), result_end_offsets)
+        except Exception:
+            self.__logger.exception("Failed to read the search's results.")
+            with self.__lock:
+                self.__has_failed = True
+                self.__stop_search()
+
+    def __upload_chunk(self, chunk: bytes, result_end_offsets: list[int]) -> None:
+        """
+        Uploads a chunk of results, truncated to the number of results that the job still needs,
+        stopping the search if the job has then found enough results.
+
+        :param chunk:
+        :param result_end_offsets: The offset of the end of each result in the chunk.
+        """
+        num_results = len(result_end_offsets)
+        job_num_results = self.__get_job_num_results(num_results)
+        if job_num_results >= self.__max_num_results > 0:
+            num_results_needed = num_results - (job_num_results - self.__max_num_results)
+            with self.__lock:
+                self.__result_limit_reached.set()
+                self.__stop_search()
+            if num_results_needed <= 0:
+                return
+            chunk = chunk[: result_end_offsets[num_results_needed - 1]]
+
+        dest_path = f"{self.__dest_path_prefix}.{self.__num_chunks}"
+        self.__num_chunks += 1
+        self.__pending_chunks_semaphore.acquire()
+        future = self.__upload_executor.submit(s3_put_bytes, self.__s3_config, chunk, dest_path)
+        future.add_done_callback(lambda f: self.__on_chunk_uploaded(f, dest_path))
+
+    def __on_chunk_uploaded(self, future: concurrent.futures.Future, dest_path: str) -> None:
+        self.__pending_chunks_semaphore.release()
+        if future.exception() is None:
+            self.__logger.debug(f"Uploaded query results {dest_path} to S3.")
+            return
+        self.__logger.error(f"Failed to upload query results {dest_path}: {future.exception()}")
+        with self.__lock:
+            self.__has_failed = True
+            self.__stop_search()
+
+    def __get_job_num_results(self, num_new_results: int) -> int:
+        """
+        :param num_new_results: The number of results to add to the job's count.
+        :return: The number of results the job has found so far, including the new results, or 0 if
+        the job's results aren't limited or the count isn't available.
+        """
+        if self.__redis_client is None:
+            return 0
+        try:
+            with self.__redis_client.pipeline() as pipeline:
+                pipeline.incrby(self.__job_num_results_key, num_new_results)
+                pipeline.expire(self.__job_num_results_key, JOB_NUM_RESULTS_KEY_TTL)
+                job_num_results, _ = pipeline.execute()
+            return job_num_results
+        except redis.RedisError:
+            self.__logger.warning(
+                "Failed to count the job's results; not limiting them.", exc_info=True
+            )
+            self.__redis_client = None
+            return 0
+
+    def __stop_search(self) -> None:
+        """
+        Kills the search if it's running.
+
+        NOTE: `__lock` must be held.
+        """
+        if self.__task_proc is not None and self.__task_proc.poll() is None:
+            # Kill the process group in case the search process also forked. The process may exit
+            # in between.
+            with contextlib.suppress(ProcessLookupError):
+                os.killpg(os.getpgid(self.__task_proc.pid), signal.SIGTERM)
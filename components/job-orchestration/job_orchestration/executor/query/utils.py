@@ -3,7 +3,10 @@ import os
 import signal
 import subprocess
 import sys
+import time
+from abc import ABC, abstractmethod
 from contextlib import closing
+from enum import IntEnum
 from logging import Logger
 from pathlib import Path
 from typing import Any
@@ -11,6 +14,7 @@ from typing import Any
 from clp_py_utils.clp_config import QUERY_TASKS_TABLE_NAME
 from clp_py_utils.sql_adapter import SqlAdapter
 
+from job_orchestration.executor.utils import get_db_connection
 from job_orchestration.scheduler.scheduler_data import QueryTaskResult, QueryTaskStatus
 
 
@@ -20,6 +24,29 @@ def get_task_log_file_path(clp_logs_dir: Path, job_id: str, task_id: int) -> Pat
     return worker_logs_dir / f"{task_id}-clo.log"
 
 
+class TaskProcessObserver(ABC):
+    """Observes the process of a task's command while `run_task_command` runs it."""
+
+    @abstractmethod
+    def on_started(self, task_proc: subprocess.Popen) -> None:
+        """
+        Called once the process has started.
+
+        :param task_proc:
+        """
+
+    @abstractmethod
+    def on_exited(self, task_status: QueryTaskStatus) -> QueryTaskStatus:
+        """
+        Called once the process has exited, or if it couldn't be started or waited for (in which
+        case `run_task_command` then propagates the error).
+
+        :param task_status: The task's status based on the process' return code (FAILED if the
+            process didn't exit normally).
+        :return: The task's status, which the observer may override.
+        """
+
+
 def report_task_failure(
     sql_adapter: SqlAdapter,
     task_id: int,
@@ -49,71 +76,162 @@ def run_query_task(
     job_id: str,
     task_id: int,
     start_time: datetime.datetime,
+    dispatch_time: float | None = None,
+    task_proc_observer: TaskProcessObserver | None = None,
 ) -> tuple[QueryTaskResult, str]:
-    clo_log_path = get_task_log_file_path(clp_logs_dir, job_id, task_id)
-    clo_log_file = open(clo_log_path, "w")
+    """
+    Runs the given task command, recording the task's status and timings in the database.
+
+    :param sql_adapter:
+    :param logger:
+    :param clp_logs_dir:
+    :param task_command:
+    :param env_vars:
+    :param task_name:
+    :param job_id:
+    :param task_id:
+    :param start_time:
+    :param dispatch_time: The UNIX timestamp (in seconds) at which the scheduler sent the task to
+        the task queue, if known.
+    :param task_proc_observer:
+    :return: A tuple of the task's result and its stdout.
+    """
+    queue_duration = get_queue_duration(start_time, dispatch_time)
 
-    task_status = QueryTaskStatus.RUNNING
     update_query_task_metadata(
-        sql_adapter, task_id, dict(status=task_status, start_time=start_time)
+        sql_adapter, task_id, dict(status=QueryTaskStatus.RUNNING, start_time=start_time)
     )
 
-    logger.info(f"Running: {' '.join(task_command)}")
-    task_proc = subprocess.Popen(
+    task_status, execution_duration, stdout_str, clo_log_path = run_task_command(
+        logger,
+        clp_logs_dir,
         task_command,
-        preexec_fn=os.setpgrp,
-        close_fds=True,
-        stdout=subprocess.PIPE,
-        stderr=clo_log_file,
-        env=env_vars,
+        env_vars,
+        task_name,
+        job_id,
+        task_id,
+        task_proc_observer,
     )
-
-    def sigterm_handler(_signo, _stack_frame):
-        logger.debug("Entered sigterm handler")
-        if task_proc.poll() is None:
-            logger.debug(f"Trying to kill {task_name} process")
-            # Kill the process group in case the task process also forked
-            os.killpg(os.getpgid(task_proc.pid), signal.SIGTERM)
-            os.waitpid(task_proc.pid, 0)
-            logger.info(f"Cancelling {task_name} task.")
-        # Add 128 to follow convention for exit codes from signals
-        # https://tldp.org/LDP/abs/html/exitcodes.html#AEN23549
-        sys.exit(_signo + 128)
-
-    # Register the function to kill the child process at exit
-    signal.signal(signal.SIGTERM, sigterm_handler)
-
-    logger.info(f"Waiting for {task_name} to finish")
-    # `communicate` is equivalent to `wait` in this case, but avoids deadlocks when piping to
-    # stdout/stderr.
-    stdout_data, _ = task_proc.communicate()
-    return_code = task_proc.returncode
-    if 0 != return_code:
-        task_status = QueryTaskStatus.FAILED
-        logger.error(
-            f"{task_name} task {task_id} failed for job {job_id} - return_code={return_code}"
-        )
-    else:
-        task_status = QueryTaskStatus.SUCCEEDED
-        logger.info(f"{task_name} task {task_id} completed for job {job_id}")
-
-    clo_log_file.close()
     duration = (datetime.datetime.now() - start_time).total_seconds()
 
-    update_query_task_metadata(
-        sql_adapter, task_id, dict(status=task_status, start_time=start_time, duration=duration)
+    task_metadata = dict(
+        status=task_status,
+        start_time=start_time,
+        duration=duration,
+        execution_duration=execution_duration,
     )
+    if queue_duration is not None:
+        task_metadata["queue_duration"] = queue_duration
+    update_query_task_metadata(sql_adapter, task_id, task_metadata)
 
     task_result = QueryTaskResult(
         status=task_status,
         task_id=task_id,
         duration=duration,
+        queue_duration=queue_duration,
+        execution_duration=execution_duration,
     )
 
     if QueryTaskStatus.FAILED == task_status:
         task_result.error_log_path = str(clo_log_path)
 
-    return task_result, stdout_data.decode("utf-8")
+    return task_result, stdout_str
+
+
+def get_queue_duration(start_time: datetime.datetime, dispatch_time: float | None) -> float | None:
+    """
+    :param start_time: The time at which the task started.
+    :param dispatch_time: The UNIX timestamp (in seconds) at which the scheduler sent the task to
+        the task queue, if known.
+    :return: The time (in seconds) the task spent queued, or None if unknown.
+    """
+    if dispatch_time is None:
+        return None
+    return max(0.0, start_time.timestamp() - dispatch_time)
+
+
+def run_task_command(
+    logger: Logger,
+    clp_logs_dir: Path,
+    task_command: list[str],
+    env_vars: dict[str, str] | None,
+    task_name: str,
+    job_id: str,
+    task_id: int,
+    task_proc_observer: TaskProcessObserver | None = None,
+) -> tuple[QueryTaskStatus, float, str, Path]:
+    """
+    Runs the given task command, killing it if the task is cancelled.
+
+    :param logger:
+    :param clp_logs_dir:
+    :param task_command:
+    :param env_vars:
+    :param task_name:
+    :param job_id:
+    :param task_id:
+    :param task_proc_observer: An observer to notify when the command's process starts and exits.
+    :return: A tuple of:
+    - The task's status after running the command.
+    - The time (in seconds) spent running the command.
+    - The command's stdout.
+    - The path of the command's log file.
+    """
+    clo_log_path = get_task_log_file_path(clp_logs_dir, job_id, task_id)
+    clo_log_file = open(clo_log_path, "w")
+
+    logger.info(f"Running: {' '.join(task_command)}")
+    execution_start_time = time.monotonic()
+    task_status = QueryTaskStatus.FAILED
+    try:
+        task_proc = subprocess.Popen(
+            task_command,
+            preexec_fn=os.setpgrp,
+            close_fds=True,
+            stdout=subprocess.PIPE,
+            stderr=clo_log_file,
+            env=env_vars,
+        )
+
+        def sigterm_handler(_signo, _stack_frame):
+            logger.debug("Entered sigterm handler")
+            if task_proc.poll() is None:
+                logger.debug(f"Trying to kill {task_name} process")
+                # Kill the process group in case the task process also forked
+                os.killpg(os.getpgid(task_proc.pid), signal.SIGTERM)
+                os.waitpid(task_proc.pid, 0)
+                logger.info(f"Cancelling {task_name} task.")
+            # Add 128 to follow convention for exit codes from signals
+            # https://tldp.org/LDP/abs/html/exitcodes.html#AEN23549
+            sys.exit(_signo + 128)
+
+        # Register the function to kill the child process at exit
+        signal.signal(signal.SIGTERM, sigterm_handler)
+
+        if task_proc_observer is not None:
+            task_proc_observer.on_started(task_proc)
+
+        logger.info(f"Waiting for {task_name} to finish")
+        # `communicate` is equivalent to `wait` in this case, but avoids deadlocks when piping to
+        # stdout/stderr.
+        stdout_data, _ = task_proc.communicate()
+        execution_duration = time.monotonic() - execution_start_time
+        return_code = task_proc.returncode
+        if 0 != return_code:
+            logger.error(
+                f"{task_name} task {task_id} failed for job {job_id} - return_code={return_code}"
+            )
+        else:
+            task_status = QueryTaskStatus.SUCCEEDED
+            logger.info(f"{task_name} task {task_id} completed for job {job_id}")
+    finally:
+        # Notify the observer even if the command couldn't be run, so that it can release its
+        # resources (e.g., stop reading the command's output)
+        if task_proc_observer is not None:
+            task_status = task_proc_observer.on_exited(task_status)
+        clo_log_file.close()
+
+    return task_status, execution_duration, stdout_data.decode("utf-8"), clo_log_path
 
 
 def update_query_task_metadata(
@@ -122,7 +240,7 @@ def update_query_task_metadata(
     kv_pairs: dict[str, Any],
 ):
     with (
-        closing(sql_adapter.create_connection(True)) as db_conn,
+        closing(get_db_connection(sql_adapter)) as db_conn,
         closing(db_conn.cursor(dictionary=True)) as db_cursor,
     ):
         if not kv_pairs or len(kv_pairs) == 0:
@@ -134,3 +252,47 @@ def update_query_task_metadata(
             WHERE id = {task_id}
         """
         db_cursor.execute(query)
+
+
+def update_query_tasks_metadata(
+    sql_adapter: SqlAdapter,
+    kv_pairs_by_task_id: dict[int, dict[str, Any]],
+):
+    """
+    Updates the metadata of several tasks with a single statement.
+
+    :param sql_adapter:
+    :param kv_pairs_by_task_id: A map from task IDs to the columns to update and their values. Each
+        task may update different columns.
+    """
+    if len(kv_pairs_by_task_id) == 0:
+        raise ValueError("No tasks provided to update query task metadata")
+
+    column_names = dict.fromkeys(
+        column_name for kv_pairs in kv_pairs_by_task_id.values() for column_name in kv_pairs
+    )
+    set_clauses = []
+    params = []
+    for column_name in column_names:
+        cases = []
+        for task_id, kv_pairs in kv_pairs_by_task_id.items():
+            if column_name not in kv_pairs:
+                continue
+            value = kv_pairs[column_name]
+            cases.append("WHEN %s THEN %s")
+            params.extend((task_id, int(value) if isinstance(value, IntEnum) else value))
+        set_clauses.append(f"{column_name} = CASE id {' '.join(cases)} ELSE {column_name} END")
+    params.extend(kv_pairs_by_task_id.keys())
+
+    with (
+        closing(get_db_connection(sql_adapter)) as db_conn,
+        closing(db_conn.cursor(dictionary=True)) as db_cursor,
+    ):
+        db_cursor.execute(
+            f"""
+            UPDATE {QUERY_TASKS_TABLE_NAME}
+            SET {", ".join(set_clauses)}
+            WHERE id IN ({", ".join(["%s"] * len(kv_pairs_by_task_id))})
+            """,
+            params,
+        )
@@ -1,8 +1,24 @@
+import threading
 from logging import Logger
 from pathlib import Path
 
 from clp_py_utils.clp_config import WorkerConfig
+from clp_py_utils.clp_logging import get_logger
 from clp_py_utils.core import read_yaml_config_file
+from clp_py_utils.sql_adapter import ConnectionPoolWrapper, SqlAdapter
+
+# Limits on each process's pool of database connections. Overflow connections are opened when
+# concurrent threads (e.g., a compression task's archive pipeline) need more than the pool's size.
+DB_CONNECTION_POOL_SIZE = 2
+DB_CONNECTION_POOL_MAX_OVERFLOW = 8
+# Replace pooled connections before the server's `wait_timeout` (8 hours by default) closes them
+DB_CONNECTION_RECYCLE_INTERVAL = 3600  # seconds
+
+# This process's database connection pools, keyed by the JSON of the database config
+_db_connection_pools: dict[str, ConnectionPoolWrapper] = {}
+_db_connection_pools_lock = threading.Lock()
+
+_db_connection_pool_logger = get_logger("db_connection_pool")
 
 
 def load_worker_config(
@@ -20,3 +36,34 @@ def load_worker_config(
     except Exception:
         logger.exception("Failed to load worker config")
         return None
+
+
+def get_db_connection(sql_adapter: SqlAdapter):
+    """
+    Checks out a connection to `sql_adapter`'s database from a pool that's shared by all tasks
+    executed in the current worker process. The pool is created on first use, checks each
+    connection's liveness when it's checked out, and reconnects if the connection is dead.
+
+    NOTE: Closing the returned connection returns it to the pool (rolling back any uncommitted
+    transaction).
+
+    :param sql_adapter:
+    :return: The connection.
+    :raise: Propagates the database connector's exceptions if a connection can't be established.
+    """
+    pool_key = sql_adapter.database_config.model_dump_json()
+    with _db_connection_pools_lock:
+        db_connection_pool = _db_connection_pools.get(pool_key)
+        if db_connection_pool is None:
+            db_connection_pool = sql_adapter.create_connection_pool(
+                logger=_db_connection_pool_logger,
+                pool_size=DB_CONNECTION_POOL_SIZE,
+                disable_localhost_socket_connection=True,
+                max_overflow=DB_CONNECTION_POOL_MAX_OVERFLOW,
+                recycle=DB_CONNECTION_RECYCLE_INTERVAL,
+            )
+            _db_connection_pools[pool_key] = db_connection_pool
+
+    # NOTE: `ConnectionPoolWrapper.connect` suppresses connection errors, but tasks need them to
+    # fail, so the underlying pool is used directly.
+    return db_connection_pool.pool.connect()
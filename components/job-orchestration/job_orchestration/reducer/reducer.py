@@ -62,6 +62,13 @@ def main(argv: list[str]) -> int:
     reducers = []
     reducer_log_files: list[TextIO] = []
     concurrency = max(int(parsed_args.concurrency), 1)
+    max_shards_per_job = clp_config.reducer.max_shards_per_job
+    if concurrency < max_shards_per_job:
+        logger.warning(
+            f"Reducer concurrency ({concurrency}) is less than reducer.max_shards_per_job"
+            f" ({max_shards_per_job}), so each job will be partitioned across at most"
+            f" {concurrency} reducer(s)."
+        )
     for i in range(concurrency):
         reducer_instance_cmd = reducer_cmd + [str(clp_config.reducer.base_port + i)]
 
@@ -88,6 +95,7 @@ def main(argv: list[str]) -> int:
         f"Host={clp_config.reducer.host}"
         f" Base port={clp_config.reducer.base_port}"
         f" Concurrency={concurrency}"
+        f" Max shards per job={max_shards_per_job}"
         f" Upsert Interval={parsed_args.upsert_interval}"
     )
     for i, reducer in enumerate(reducers):
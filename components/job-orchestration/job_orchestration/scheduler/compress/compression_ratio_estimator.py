@@ -0,0 +1,305 @@
+import datetime
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import Any
+
+import brotli
+import msgpack
+from clp_py_utils.clp_config import COMPRESSION_JOBS_TABLE_NAME, COMPRESSION_TASKS_TABLE_NAME
+from clp_py_utils.clp_logging import get_logger
+from clp_py_utils.core import FileMetadata, get_default_compression_ratio
+
+from job_orchestration.scheduler.constants import CompressionJobStatus, CompressionTaskStatus
+from job_orchestration.scheduler.job_config import ClpIoConfig
+
+logger = get_logger("compression_ratio_estimator")
+
+# The minimum time between two refreshes of the learned ratios
+REFRESH_INTERVAL = 60  # seconds
+# The maximum number of completed jobs to learn from in each refresh, which bounds how long each
+# refresh delays scheduling. Refreshes continue without waiting for `REFRESH_INTERVAL` while there
+# are more jobs to learn from.
+MAX_NUM_JOBS_PER_REFRESH = 10
+# The number of most recently completed jobs to learn from when the scheduler starts
+NUM_JOBS_TO_LEARN_FROM_ON_START = 100
+# How much each newly completed job's statistics outweigh the previously learned ones. Each time a
+# job contributes to a ratio, the ratio's previous statistics are scaled by this factor.
+STATS_DECAY_FACTOR = 0.9
+# The minimum amount of (decayed) original data a ratio must be learned from before it's used
+MIN_ORIGINAL_SIZE_TO_USE_RATIO = 64 * 1024 * 1024  # 64 MiB
+
+
+@dataclass
+class _RatioStats:
+    """Decayed totals of the original and uncompressed sizes of files with a given extension."""
+
+    original_size: float = 0.0
+    uncompressed_size: float = 0.0
+
+    def add(self, original_size: float, uncompressed_size: float) -> None:
+        self.original_size = self.original_size * STATS_DECAY_FACTOR + original_size
+        self.uncompressed_size = self.uncompressed_size * STATS_DECAY_FACTOR + uncompressed_size
+
+    def get_ratio(self) -> float | None:
+        """
+        :return: The learned ratio, or None if it hasn't been learned from enough data.
+        """
+        if self.original_size < MIN_ORIGINAL_SIZE_TO_USE_RATIO:
+            return None
+        return self.uncompressed_size / self.original_size
+
+
+def get_file_extension(path: str) -> str:
+    """
+    :param path:
+    :return: The path's (lowercased) last extension, or an empty string if it has none.
+    """
+    return PurePosixPath(path).suffix.lower()
+
+
+class CompressionRatioEstimator:
+    """
+    Learns the ratio between the uncompressed and original sizes of input files, per file extension
+    and per dataset, from the tasks of successfully completed compression jobs. The ratios are used
+    to estimate the uncompressed sizes of new jobs' files, so that each partition's uncompressed
+    size lands closer to the target archive size than with the fixed per-extension estimates in
+    `FileMetadata`.
+
+    Since a task reports only the total uncompressed size of its partition, the total is attributed
+    to the partition's extensions in proportion to their estimated uncompressed sizes, using the
+    ratios measured from the job's single-extension partitions where possible.
+    """
+
+    def __init__(self) -> None:
+        self.__stats_by_dataset_and_extension: dict[tuple[str | None, str], _RatioStats] = {}
+        self.__stats_by_extension: dict[str, _RatioStats] = {}
+        self.__last_refresh_time: float | None = None
+        # The latest update time of the jobs learned from, and the IDs of the jobs learned from with
+        # that update time (since update times are only precise to the second).
+        self.__last_job_update_time: datetime.datetime | None = None
+        self.__job_ids_at_last_job_update_time: set[int] = set()
+
+    def refresh(self, db_cursor) -> None:
+        """
+        Learns from (at most `MAX_NUM_JOBS_PER_REFRESH`) compression jobs that have completed since
+        the last refresh, unless the last refresh happened less than `REFRESH_INTERVAL` seconds ago
+        and learned from all such jobs. Failures are logged rather than raised since the estimator
+        falls back to the fixed estimates.
+
+        :param db_cursor:
+        """
+        now = time.monotonic()
+        if self.__last_refresh_time is not None and now - self.__last_refresh_time < (
+            REFRESH_INTERVAL
+        ):
+            return
+        self.__last_refresh_time = now
+
+        try:
+            if self.__last_job_update_time is None:
+                self.__last_job_update_time = _fetch_start_job_update_time(db_cursor)
+                if self.__last_job_update_time is None:
+                    return
+            jobs = self.__fetch_new_jobs(db_cursor)
+            if len(jobs) == 0:
+                return
+            if len(jobs) >= MAX_NUM_JOBS_PER_REFRESH:
+                # There may be more jobs to learn from, so don't wait to learn from them
+                self.__last_refresh_time = None
+            tasks_by_job_id = _fetch_succeeded_tasks(db_cursor, [job["id"] for job in jobs])
+        except Exception:
+            logger.exception("Failed to fetch completed compression jobs.")
+            return
+
+        for job in jobs:
+            job_id = job["id"]
+            update_time = job["update_time"]
+            if update_time > self.__last_job_update_time:
+                self.__last_job_update_time = update_time
+                self.__job_ids_at_last_job_update_time = set()
+            self.__job_ids_at_last_job_update_time.add(job_id)
+
+            try:
+                clp_io_config = ClpIoConfig.model_validate(
+                    msgpack.unpackb(brotli.decompress(job["clp_config"]))
+                )
+                self.__learn_from_job(clp_io_config.input.dataset, tasks_by_job_id.get(job_id, []))
+            except Exception:
+                logger.exception("Failed to learn compression ratios from job %s.", job_id)
+
+    def get_uncompressed_size_estimator(self, dataset: str | None) -> Callable[[FileMetadata], int]:
+        """
+        NOTE: The returned callable uses a snapshot of the currently learned ratios, so it can be
+        used from other threads while the estimator is refreshed.
+
+        :param dataset:
+        :return: A callable that estimates the uncompressed size of a file in the given dataset.
+        """
+        ratios = self.__get_ratios(dataset)
+
+        def estimate_uncompressed_size(file: FileMetadata) -> int:
+            if 0 == file.size:
+                return 0
+            ratio = ratios.get(get_file_extension(file.path.name))
+            if ratio is None:
+                return file.size * get_default_compression_ratio(file.path.name)
+            return max(1, round(file.size * ratio))
+
+        return estimate_uncompressed_size
+
+    def __fetch_new_jobs(self, db_cursor) -> list[dict[str, Any]]:
+        """
+        :param db_cursor:
+        :return: The (at most `MAX_NUM_JOBS_PER_REFRESH`) earliest jobs that succeeded since the
+        last job learned from, in update-time order.
+        """
+        db_cursor.execute(
+            f"""
+            SELECT id, clp_config, update_time
+            FROM {COMPRESSION_JOBS_TABLE_NAME}
+            WHERE status = %s AND update_time >= %s
+            ORDER BY update_time ASC
+            LIMIT %s
+            """,
+            (
+                CompressionJobStatus.SUCCEEDED,
+                self.__last_job_update_time,
+                MAX_NUM_JOBS_PER_REFRESH + len(self.__job_ids_at_last_job_update_time),
+            ),
+        )
+        jobs = [
+            job
+            for job in db_cursor.fetchall()
+            if job["id"] not in self.__job_ids_at_last_job_update_time
+        ]
+        return jobs[:MAX_NUM_JOBS_PER_REFRESH]
+
+    def __get_ratios(self, dataset: str | None) -> dict[str, float]:
+        """
+        :param dataset:
+        :return: A map from file extensions to their learned ratios in the given dataset, falling
+        back to the ratios learned across all datasets.
+        """
+        ratios = {}
+        for extension, stats in self.__stats_by_extension.items():
+            ratio = stats.get_ratio()
+            if ratio is not None:
+                ratios[extension] = ratio
+        for (stats_dataset, extension), stats in self.__stats_by_dataset_and_extension.items():
+            if stats_dataset != dataset:
+                continue
+            ratio = stats.get_ratio()
+            if ratio is not None:
+                ratios[extension] = ratio
+        return ratios
+
+    def __learn_from_job(self, dataset: str | None, tasks: list[dict[str, Any]]) -> None:
+        """
+        :param dataset:
+        :param tasks: The job's succeeded tasks.
+        """
+        # Map from extensions to their (original size, estimated uncompressed size) in each task
+        task_sizes_list: list[dict[str, list[float]]] = []
+        # Map from extensions to their (original size, uncompressed size) in the job's tasks that
+        # contain a single extension
+        single_extension_sizes: dict[str, list[float]] = {}
+        for task in tasks:
+            paths_to_compress = msgpack.unpackb(brotli.decompress(task["clp_paths_to_compress"]))
+            task_sizes: dict[str, list[float]] = {}
+            for path, size in zip(
+                paths_to_compress["file_paths"], paths_to_compress["st_sizes"], strict=True
+            ):
+                task_sizes.setdefault(get_file_extension(path), [0.0, 0.0])[0] += size
+            task_sizes_list.append(task_sizes)
+
+            if len(task_sizes) == 1:
+                [(extension, (original_size, _))] = task_sizes.items()
+                sizes = single_extension_sizes.setdefault(extension, [0.0, 0.0])
+                sizes[0] += original_size
+                sizes[1] += task["partition_uncompressed_size"]
+
+        # Prefer the ratios measured exactly in this job when attributing the uncompressed sizes of
+        # tasks with multiple extensions.
+        ratios = self.__get_ratios(dataset)
+        for extension, (original_size, uncompressed_size) in single_extension_sizes.items():
+            if original_size > 0:
+                ratios[extension] = uncompressed_size / original_size
+
+        # Map from extensions to their (original size, uncompressed size) in this job
+        job_sizes: dict[str, list[float]] = {}
+        for task, task_sizes in zip(tasks, task_sizes_list, strict=True):
+            for extension, sizes in task_sizes.items():
+                ratio = ratios.get(extension)
+                if ratio is None:
+                    ratio = get_default_compression_ratio(f"file{extension}")
+                sizes[1] = sizes[0] * ratio
+
+            total_estimated_uncompressed_size = sum(sizes[1] for sizes in task_sizes.values())
+            if total_estimated_uncompressed_size <= 0:
+                continue
+            for extension, (original_size, estimated_uncompressed_size) in task_sizes.items():
+                sizes = job_sizes.setdefault(extension, [0.0, 0.0])
+                sizes[0] += original_size
+                sizes[1] += (
+                    task["partition_uncompressed_size"]
+                    * estimated_uncompressed_size
+                    / total_estimated_uncompressed_size
+                )
+
+        for extension, (original_size, uncompressed_size) in job_sizes.items():
+            self.__stats_by_dataset_and_extension.setdefault(
+                (dataset, extension), _RatioStats()
+            ).add(original_size, uncompressed_size)
+            self.__stats_by_extension.setdefault(extension, _RatioStats()).add(
+                original_size, uncompressed_size
+            )
+
+
+def _fetch_start_job_update_time(db_cursor) -> datetime.datetime | None:
+    """
+    :param db_cursor:
+    :return: The update time of the earliest of the `NUM_JOBS_TO_LEARN_FROM_ON_START` most recently
+    completed jobs, or None if no job has completed.
+    """
+    db_cursor.execute(
+        f"""
+        SELECT MIN(update_time) AS update_time
+        FROM (
+            SELECT update_time
+            FROM {COMPRESSION_JOBS_TABLE_NAME}
+            WHERE status = %s
+            ORDER BY update_time DESC
+            LIMIT %s
+        ) AS recent_jobs
+        """,
+        (CompressionJobStatus.SUCCEEDED, NUM_JOBS_TO_LEARN_FROM_ON_START),
+    )
+    row = db_cursor.fetchone()
+    if row is None:
+        return None
+    return row["update_time"]
+
+
+def _fetch_succeeded_tasks(db_cursor, job_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
+    """
+    :param db_cursor:
+    :param job_ids:
+    :return: A map from each of the given jobs' IDs to the job's succeeded tasks.
+    """
+    placeholders = ", ".join(["%s"] * len(job_ids))
+    db_cursor.execute(
+        f"""
+        SELECT job_id, clp_paths_to_compress, partition_uncompressed_size
+        FROM {COMPRESSION_TASKS_TABLE_NAME}
+        WHERE job_id IN ({placeholders})
+        AND status = %s
+        AND partition_uncompressed_size IS NOT NULL
+        """,
+        (*job_ids, CompressionTaskStatus.SUCCEEDED),
+    )
+    tasks_by_job_id: dict[int, list[dict[str, Any]]] = {}
+    for task in db_cursor.fetchall():
+        tasks_by_job_id.setdefault(task["job_id"], []).append(task)
+    return tasks_by_job_id
@@ -2,7 +2,7 @@ import argparse
 import datetime
 import signal
 import sys
-import time
+from collections.abc import Callable
 from contextlib import closing
 from dataclasses import dataclass
 from pathlib import Path
@@ -17,24 +17,42 @@ from clp_py_utils.clp_config import (
     COMPRESSION_JOBS_TABLE_NAME,
     COMPRESSION_SCHEDULER_COMPONENT_NAME,
     COMPRESSION_TASKS_TABLE_NAME,
+    CompressionScheduler,
     OrchestrationType,
     StorageEngine,
+    TaskDispatchMode,
 )
 from clp_py_utils.clp_logging import configure_logging, get_logger
 from clp_py_utils.clp_metadata_db_utils import (
     add_dataset,
     fetch_existing_datasets,
 )
-from clp_py_utils.compression import validate_path_and_get_info
+from clp_py_utils.compression import (
+    crawl_directory_and_get_info,
+    validate_path_and_get_info,
+)
 from clp_py_utils.core import (
     FileMetadata,
     read_yaml_config_file,
 )
-from clp_py_utils.s3_utils import s3_get_object_metadata
+from clp_py_utils.job_notifications import (
+    COMPRESSION_JOB_CREATED_CHANNEL,
+    create_redis_client,
+    JobNotificationSubscriber,
+    load_job_notifications_redis_config,
+)
+from clp_py_utils.s3_utils import s3_iter_object_metadata
 from clp_py_utils.sql_adapter import SqlAdapter
 from pydantic import ValidationError
 
+from job_orchestration.scheduler.compress.compression_ratio_estimator import (
+    CompressionRatioEstimator,
+)
 from job_orchestration.scheduler.compress.partition import PathsToCompressBuffer
+from job_orchestration.scheduler.compress.path_discovery import (
+    PathDiscoveryCancelledError,
+    StreamingPathDiscovery,
+)
 from job_orchestration.scheduler.compress.task_manager.celery_task_manager import CeleryTaskManager
 from job_orchestration.scheduler.compress.task_manager.spider_task_manager import SpiderTaskManager
 from job_orchestration.scheduler.compress.task_manager.task_manager import TaskManager
@@ -54,6 +72,7 @@ from job_orchestration.scheduler.job_config import (
 from job_orchestration.scheduler.scheduler_data import (
     CompressionJob,
 )
+from job_orchestration.scheduler.task_result import CompressionTaskResult
 from job_orchestration.scheduler.utils import kill_hanging_jobs
 
 
@@ -68,6 +87,11 @@ class DbContext:
 # Setup logging
 logger = get_logger("compression_scheduler")
 
+# Limits on each multi-row INSERT of compression tasks. The size limit keeps each statement well
+# below the server's default `max_allowed_packet`.
+TASK_INSERTION_BATCH_MAX_NUM_ROWS = 1000
+TASK_INSERTION_BATCH_MAX_SIZE = 4 * 1024 * 1024  # 4 MiB
+
 scheduled_jobs = {}
 
 received_sigterm = False
@@ -146,14 +170,11 @@ def _process_fs_input_paths(
                 paths_to_compress_buffer.add_empty_directory(empty_directory)
 
         if path.is_dir():
-            for internal_path in path.rglob("*"):
-                try:
-                    file, empty_directory = validate_path_and_get_info(
-                        CONTAINER_INPUT_LOGS_ROOT_DIR, internal_path
-                    )
-                except ValueError as ex:
+            for file, empty_directory, error_msg in crawl_directory_and_get_info(
+                CONTAINER_INPUT_LOGS_ROOT_DIR, path
+            ):
+                if error_msg is not None:
                     paths_ok = False
-                    error_msg = str(ex)
                     logger.error(error_msg)
                     invalid_path_messages.append(error_msg)
                     continue
@@ -178,14 +199,14 @@ def _process_s3_input(
     :param s3_input_config:
     :param paths_to_compress_buffer:
     :raises: RuntimeError if input URL doesn't resolve to any objects.
-    :raises: Propagates `s3_get_object_metadata`'s exceptions.
+    :raises: Propagates `s3_iter_object_metadata`'s exceptions.
     """
-    object_metadata_list = s3_get_object_metadata(s3_input_config)
-    if len(object_metadata_list) == 0:
-        raise RuntimeError("Input URL doesn't resolve to any object")
-
-    for object_metadata in object_metadata_list:
+    num_objects = 0
+    for object_metadata in s3_iter_object_metadata(s3_input_config):
         paths_to_compress_buffer.add_file(object_metadata)
+        num_objects += 1
+    if num_objects == 0:
+        raise RuntimeError("Input URL doesn't resolve to any object")
 
 
 def _process_s3_object_metadata_input(
@@ -286,6 +307,7 @@ def search_and_schedule_new_tasks(
     clp_metadata_db_connection_config: dict[str, Any],
     task_manager: TaskManager,
     db_context: DbContext,
+    compression_ratio_estimator: CompressionRatioEstimator,
 ) -> None:
     """
     Splits all the jobs with PENDING into tasks and schedules them in batches.
@@ -294,6 +316,7 @@ def search_and_schedule_new_tasks(
     :param clp_metadata_db_connection_config:
     :param task_manager:
     :param db_context:
+    :param compression_ratio_estimator:
     """
     existing_datasets: set[str] = set()
     if StorageEngine.CLP_S == clp_config.package.storage_engine:
@@ -303,6 +326,8 @@ def search_and_schedule_new_tasks(
 
     logger.debug("Search and schedule new tasks")
 
+    compression_ratio_estimator.refresh(db_context.cursor)
+
     # Poll for new compression jobs
     jobs = fetch_new_jobs(db_context.cursor)
     # TODO: revisit why we need to commit here. To end long transactions?
@@ -315,6 +340,7 @@ def search_and_schedule_new_tasks(
             db_context,
             job_row,
             existing_datasets,
+            compression_ratio_estimator,
         )
 
 
@@ -325,6 +351,7 @@ def _schedule_job(
     db_context: DbContext,
     job_row: dict[str, Any],
     existing_datasets: set[str],
+    compression_ratio_estimator: CompressionRatioEstimator,
 ) -> None:
     """
     Schedules a single pending compression job. On failure, the job is marked as FAILED in the
@@ -337,6 +364,7 @@ def _schedule_job(
     :param job_row: A row from the compression jobs table.
     :param existing_datasets: The current set of datasets. May be updated if the job creates a new
     dataset.
+    :param compression_ratio_estimator:
     """
     job_id = job_row["id"]
     try:
@@ -356,6 +384,24 @@ def _schedule_job(
         )
         return
     input_config = clp_io_config.input
+    estimate_uncompressed_size = compression_ratio_estimator.get_uncompressed_size_estimator(
+        input_config.dataset
+    )
+
+    if clp_config.compression_scheduler.streaming_path_discovery and input_config.type in (
+        InputType.FS.value,
+        InputType.S3.value,
+    ):
+        _schedule_job_with_streaming_path_discovery(
+            clp_config,
+            clp_metadata_db_connection_config,
+            db_context,
+            job_id,
+            clp_io_config,
+            existing_datasets,
+            estimate_uncompressed_size,
+        )
+        return
 
     # Prepare paths buffer
     paths_to_compress_buffer = PathsToCompressBuffer(
@@ -364,9 +410,160 @@ def _schedule_job(
         scheduling_job_id=job_id,
         clp_io_config=clp_io_config,
         clp_metadata_db_connection_config=clp_metadata_db_connection_config,
+        estimate_uncompressed_size=estimate_uncompressed_size,
+        max_concurrent_tasks=_get_max_concurrent_tasks_per_job(clp_config),
+    )
+
+    error_msg = _process_input(
+        clp_config, db_context, job_id, input_config, paths_to_compress_buffer
+    )
+    if error_msg is not None:
+        update_compression_job_metadata(
+            db_context,
+            job_id,
+            {
+                "status": CompressionJobStatus.FAILED,
+                "status_msg": error_msg,
+            },
+        )
+        return
+
+    if StorageEngine.CLP_S == clp_config.package.storage_engine:
+        table_prefix = clp_metadata_db_connection_config["table_prefix"]
+        dataset = clp_io_config.input.dataset
+        _ensure_dataset_exists(
+            clp_config,
+            db_context,
+            table_prefix,
+            dataset,
+            existing_datasets,
+        )
+
+    _batch_and_submit_tasks(
+        clp_config,
+        task_manager,
+        db_context,
+        job_id,
+        paths_to_compress_buffer,
+    )
+
+
+def _schedule_job_with_streaming_path_discovery(
+    clp_config: ClpConfig,
+    clp_metadata_db_connection_config: dict[str, Any],
+    db_context: DbContext,
+    job_id: int,
+    clp_io_config: ClpIoConfig,
+    existing_datasets: set[str],
+    estimate_uncompressed_size: Callable[[FileMetadata], int],
+) -> None:
+    """
+    Schedules a single pending compression job whose input paths are discovered in a background
+    thread. The job is marked as RUNNING immediately, and `poll_running_jobs` dispatches its tasks
+    as they're discovered.
+
+    NOTE: Only FS and S3 inputs should be scheduled this way since discovering the paths of other
+    inputs requires the database.
+
+    :param clp_config:
+    :param clp_metadata_db_connection_config:
+    :param db_context:
+    :param job_id:
+    :param clp_io_config:
+    :param existing_datasets: The current set of datasets. May be updated if the job creates a new
+    dataset.
+    :param estimate_uncompressed_size: Estimates the uncompressed size of each of the job's files.
+    """
+    # The dataset must exist before any of the job's tasks run
+    if StorageEngine.CLP_S == clp_config.package.storage_engine:
+        table_prefix = clp_metadata_db_connection_config["table_prefix"]
+        dataset = clp_io_config.input.dataset
+        _ensure_dataset_exists(
+            clp_config,
+            db_context,
+            table_prefix,
+            dataset,
+            existing_datasets,
+        )
+
+    path_discovery = StreamingPathDiscovery()
+    paths_to_compress_buffer = PathsToCompressBuffer(
+        maintain_file_ordering=False,
+        empty_directories_allowed=True,
+        scheduling_job_id=job_id,
+        clp_io_config=clp_io_config,
+        clp_metadata_db_connection_config=clp_metadata_db_connection_config,
+        task_callback=path_discovery.add_task,
+        estimate_uncompressed_size=estimate_uncompressed_size,
+    )
+
+    def discover_paths() -> str | None:
+        try:
+            # NOTE: `db_context` isn't used for FS and S3 inputs, so it's never accessed from the
+            # discovery thread.
+            return _process_input(
+                clp_config, db_context, job_id, clp_io_config.input, paths_to_compress_buffer
+            )
+        except PathDiscoveryCancelledError:
+            return "Path discovery was cancelled."
+        except Exception as err:
+            logger.exception("Failed to discover input paths for job %s", job_id)
+            return f"Path discovery failure: {err}"
+
+    start_time = datetime.datetime.now(datetime.timezone.utc)
+    update_compression_job_metadata(
+        db_context,
+        job_id,
+        {
+            "num_tasks": 0,
+            "status": CompressionJobStatus.RUNNING,
+            "start_time": start_time,
+        },
     )
+    scheduled_jobs[job_id] = CompressionJob(
+        id=job_id,
+        start_time=start_time,
+        result_handles=[],
+        num_tasks_total=0,
+        num_tasks_completed=0,
+        remaining_tasks=[],
+        remaining_partition_info=[],
+        path_discovery=path_discovery,
+    )
+    path_discovery.start(discover_paths)
+    logger.info("Started discovering input paths for job %s.", job_id)
+
+
+def _get_max_concurrent_tasks_per_job(clp_config: ClpConfig) -> int | None:
+    """
+    :param clp_config:
+    :return: The max number of each job's tasks that can run concurrently, or None if unlimited.
+    """
+    max_concurrent_tasks_per_job = clp_config.compression_scheduler.max_concurrent_tasks_per_job
+    if CompressionScheduler.UNLIMITED_CONCURRENT_TASKS_PER_JOB == max_concurrent_tasks_per_job:
+        return None
+    return max_concurrent_tasks_per_job
+
 
-    # Process input paths
+def _process_input(
+    clp_config: ClpConfig,
+    db_context: DbContext,
+    job_id: int,
+    input_config: FsInputConfig | S3InputConfig | S3ObjectMetadataInputConfig,
+    paths_to_compress_buffer: PathsToCompressBuffer,
+) -> str | None:
+    """
+    Adds the metadata of every path specified by `input_config` to `paths_to_compress_buffer`, and
+    then flushes the buffer.
+
+    :param clp_config:
+    :param db_context:
+    :param job_id:
+    :param input_config:
+    :param paths_to_compress_buffer:
+    :return: None on success, or an error message describing why the input couldn't be processed.
+    :raise RuntimeError: If the user log for invalid input paths couldn't be written.
+    """
     input_type = input_config.type
     if input_type == InputType.FS.value:
         invalid_path_messages = _process_fs_input_paths(input_config, paths_to_compress_buffer)
@@ -382,87 +579,37 @@ def _schedule_job(
                 err_msg = "Failed to write user log for invalid input paths."
                 raise RuntimeError(err_msg)
 
-            error_msg = (
+            return (
                 "At least one of your input paths could not be processed."
                 f" See the error log at '{user_log_relative_path}' inside your configured logs"
                 " directory (`logs_directory`) for more details."
             )
-
-            update_compression_job_metadata(
-                db_context,
-                job_id,
-                {
-                    "status": CompressionJobStatus.FAILED,
-                    "status_msg": error_msg,
-                },
-            )
-            return
     elif input_type == InputType.S3.value:
         try:
             _process_s3_input(input_config, paths_to_compress_buffer)
+        except PathDiscoveryCancelledError:
+            raise
         except Exception as err:
             logger.exception("Failed to process S3 input")
-            update_compression_job_metadata(
-                db_context,
-                job_id,
-                {
-                    "status": CompressionJobStatus.FAILED,
-                    "status_msg": f"S3 Failure: {err}",
-                },
-            )
-            return
+            return f"S3 Failure: {err}"
     elif input_type == InputType.S3_OBJECT_METADATA.value:
         try:
             _process_s3_object_metadata_input(input_config, paths_to_compress_buffer, db_context)
         except Exception as err:
             logger.exception("Failed to process S3 object metadata input for job %s", job_id)
-            update_compression_job_metadata(
-                db_context,
-                job_id,
-                {
-                    "status": CompressionJobStatus.FAILED,
-                    "status_msg": f"S3 object metadata input failure: {err}",
-                },
-            )
-            return
+            return f"S3 object metadata input failure: {err}"
     else:
         logger.error("Unsupported input type %s", input_type)
-        update_compression_job_metadata(
-            db_context,
-            job_id,
-            {
-                "status": CompressionJobStatus.FAILED,
-                "status_msg": f"Unsupported input type: {input_type}",
-            },
-        )
-        return
+        return f"Unsupported input type: {input_type}"
     paths_to_compress_buffer.flush()
-
-    if StorageEngine.CLP_S == clp_config.package.storage_engine:
-        table_prefix = clp_metadata_db_connection_config["table_prefix"]
-        dataset = clp_io_config.input.dataset
-        _ensure_dataset_exists(
-            clp_config,
-            db_context,
-            table_prefix,
-            dataset,
-            existing_datasets,
-        )
-
-    _batch_and_submit_tasks(
-        clp_config,
-        task_manager,
-        db_context,
-        job_id,
-        paths_to_compress_buffer,
-    )
+    return None
 
 
 def poll_running_jobs(
     clp_config: ClpConfig, task_manager: TaskManager, db_context: DbContext
 ) -> None:
     """
-    Polls for running jobs, update their status, and dispatch the next batch if needed.
+    Polls for running jobs, update their status, and dispatch more tasks if needed.
 
     :param clp_config:
     :param task_manager:
@@ -470,25 +617,37 @@ def poll_running_jobs(
     """
     logs_directory = clp_config.logs_directory
     max_concurrent_tasks_per_job = clp_config.compression_scheduler.max_concurrent_tasks_per_job
+    task_dispatch_mode = clp_config.compression_scheduler.task_dispatch_mode
 
     logger.debug("Poll running jobs")
     jobs_to_delete = []
     for job_id, job in scheduled_jobs.items():
         job_success = True
-        duration = 0.0
         error_messages: list[str] = []
-        num_tasks_in_batch = 0
+        num_finished_tasks = 0
+
+        if job.path_discovery is not None:
+            discovery_error_msg = _collect_discovered_tasks(db_context, job)
+            if discovery_error_msg is not None:
+                logger.error("Job %s failed: %s", job_id, discovery_error_msg)
+                update_compression_job_metadata(
+                    db_context,
+                    job_id,
+                    {
+                        "status": CompressionJobStatus.FAILED,
+                        "status_msg": discovery_error_msg,
+                    },
+                )
+                jobs_to_delete.append(job_id)
+                continue
 
         try:
-            returned_results = job.result_handle.get_result()
+            returned_results = _get_finished_task_results(job)
             if returned_results is None:
-                continue
+                returned_results = []
 
-            duration = (
-                datetime.datetime.now(datetime.timezone.utc) - job.start_time
-            ).total_seconds()
-            # Check for finished jobs
-            num_tasks_in_batch = len(returned_results)
+            # Check for finished tasks
+            num_finished_tasks = len(returned_results)
             for task_result in returned_results:
                 if task_result.status == CompressionTaskStatus.SUCCEEDED:
                     logger.info(
@@ -510,16 +669,27 @@ def poll_running_jobs(
             job_success = False
 
         if not job_success:
+            if job.path_discovery is not None:
+                job.path_discovery.cancel()
             _handle_failed_compression_job(logs_directory, db_context, job_id, error_messages)
             jobs_to_delete.append(job_id)
             continue
 
-        job.num_tasks_completed += num_tasks_in_batch
+        job.num_tasks_completed += num_finished_tasks
 
         if len(job.remaining_tasks) > 0:
-            _dispatch_next_task_batch(task_manager, db_context, job, max_concurrent_tasks_per_job)
-        else:
+            num_tasks_to_dispatch = _get_num_tasks_to_dispatch(
+                job, max_concurrent_tasks_per_job, task_dispatch_mode
+            )
+            if num_tasks_to_dispatch > 0:
+                _dispatch_next_tasks(
+                    task_manager, db_context, job, num_tasks_to_dispatch, task_dispatch_mode
+                )
+        elif 0 == len(job.result_handles) and job.path_discovery is None:
             # All tasks completed successfully
+            duration = (
+                datetime.datetime.now(datetime.timezone.utc) - job.start_time
+            ).total_seconds()
             _complete_compression_job(db_context, job_id, job.num_tasks_total, duration)
             jobs_to_delete.append(job_id)
 
@@ -580,6 +750,16 @@ def main(argv) -> int | None:
         logger.exception("Failed to kill hanging compression jobs.")
         return -1
 
+    job_notifications_redis_client = None
+    job_notifications_redis_config = load_job_notifications_redis_config(clp_config, logger)
+    if job_notifications_redis_config is not None:
+        job_notifications_redis_client = create_redis_client(job_notifications_redis_config)
+    # NOTE: The subscriber subscribes on creation, before the first poll for new jobs, so that no
+    # new job is missed.
+    new_jobs_subscriber = JobNotificationSubscriber(
+        job_notifications_redis_client, [COMPRESSION_JOB_CREATED_CHANNEL], logger
+    )
+
     with (
         closing(sql_adapter.create_connection(True)) as db_conn,
         closing(db_conn.cursor(dictionary=True)) as db_cursor,
@@ -588,6 +768,7 @@ def main(argv) -> int | None:
         clp_metadata_db_connection_config = (
             sql_adapter.database_config.get_clp_connection_params_and_type(True)
         )
+        compression_ratio_estimator = CompressionRatioEstimator()
 
         # Start Job Processing Loop
         while True:
@@ -598,13 +779,16 @@ def main(argv) -> int | None:
                         clp_metadata_db_connection_config,
                         task_manager,
                         db_context,
+                        compression_ratio_estimator,
                     )
                 poll_running_jobs(
                     clp_config,
                     task_manager,
                     db_context,
                 )
-                time.sleep(clp_config.compression_scheduler.jobs_poll_delay)
+                # Wake up as soon as a new job is submitted, or after the polling interval since not
+                # every client publishes notifications.
+                new_jobs_subscriber.wait(clp_config.compression_scheduler.jobs_poll_delay)
             except KeyboardInterrupt:
                 logger.info("Forcefully shutting down")
                 return -1
@@ -670,18 +854,19 @@ def _batch_and_submit_tasks(
 
     # Compute the first batch of tasks and submit them to the task manager
     max_concurrent_tasks_per_job = clp_config.compression_scheduler.max_concurrent_tasks_per_job
+    task_dispatch_mode = clp_config.compression_scheduler.task_dispatch_mode
     tasks = paths_to_compress_buffer.get_tasks()
     partition_info = paths_to_compress_buffer.get_partition_info()
     tasks_to_submit, remaining_tasks, partition_info_to_submit, remaining_partition_info = (
         _batch_tasks(tasks, partition_info, max_concurrent_tasks_per_job)
     )
     _insert_tasks_to_db(db_context, job_id, tasks_to_submit, partition_info_to_submit)
-    result_handle = task_manager.submit(tasks_to_submit)
+    result_handles = _submit_tasks(task_manager, tasks_to_submit, task_dispatch_mode)
 
     job = CompressionJob(
         id=job_id,
         start_time=start_time,
-        result_handle=result_handle,
+        result_handles=result_handles,
         num_tasks_total=paths_to_compress_buffer.num_tasks,
         num_tasks_completed=0,
         remaining_tasks=remaining_tasks,
@@ -689,7 +874,6 @@ def _batch_and_submit_tasks(
     )
     scheduled_jobs[job_id] = job
 
-    _update_tasks_status_to_running(db_context, tasks_to_submit)
     logger.info(
         "Dispatched job %s with %s tasks (%s remaining).",
         job_id,
@@ -720,47 +904,121 @@ def _complete_compression_job(
     )
 
 
-def _dispatch_next_task_batch(
+def _dispatch_next_tasks(
     task_manager: TaskManager,
     db_context: DbContext,
     job: CompressionJob,
-    max_concurrent_tasks_per_job: int,
+    num_tasks_to_dispatch: int,
+    task_dispatch_mode: TaskDispatchMode,
 ) -> None:
     """
-    Dispatches the next batch of tasks for a compression job.
+    Dispatches the next tasks for a compression job.
 
     :param task_manager:
     :param db_context:
     :param job:
-    :param max_concurrent_tasks_per_job:
+    :param num_tasks_to_dispatch:
+    :param task_dispatch_mode:
     """
     job_id = job.id
-    logger.info(
-        "Job %s batch completed. Dispatching next batch (%s/%s tasks completed).",
-        job_id,
-        job.num_tasks_completed,
-        job.num_tasks_total,
-    )
 
-    # Prepare the next batch of tasks
+    # Prepare the next tasks
     tasks_to_submit, job.remaining_tasks, partition_info_to_submit, job.remaining_partition_info = (
-        _batch_tasks(
-            job.remaining_tasks, job.remaining_partition_info, max_concurrent_tasks_per_job
-        )
+        _batch_tasks(job.remaining_tasks, job.remaining_partition_info, num_tasks_to_dispatch)
     )
 
     # Insert tasks into the database and submit them
     _insert_tasks_to_db(db_context, job_id, tasks_to_submit, partition_info_to_submit)
-    job.result_handle = task_manager.submit(tasks_to_submit)
-    _update_tasks_status_to_running(db_context, tasks_to_submit)
+    job.result_handles.extend(_submit_tasks(task_manager, tasks_to_submit, task_dispatch_mode))
     logger.info(
-        "Dispatched next batch for job %s with %s tasks (%s remaining).",
-        job_id,
+        "Dispatched %s more tasks for job %s (%s/%s tasks completed, %s remaining).",
         len(tasks_to_submit),
+        job_id,
+        job.num_tasks_completed,
+        job.num_tasks_total,
         len(job.remaining_tasks),
     )
 
 
+def _collect_discovered_tasks(db_context: DbContext, job: CompressionJob) -> str | None:
+    """
+    Moves the tasks discovered since the last call to the job's remaining tasks and updates the
+    job's task count in the database. Once discovery finishes, `job.path_discovery` is cleared.
+
+    :param db_context:
+    :param job:
+    :return: None on success, or an error message if path discovery failed.
+    """
+    path_discovery = job.path_discovery
+    # Check whether discovery is done before popping so that no task is missed
+    is_discovery_done = path_discovery.is_done()
+    tasks, partition_info = path_discovery.pop_tasks()
+    if len(tasks) > 0:
+        job.remaining_tasks.extend(tasks)
+        job.remaining_partition_info.extend(partition_info)
+        job.num_tasks_total += len(tasks)
+        update_compression_job_metadata(db_context, job.id, {"num_tasks": job.num_tasks_total})
+
+    if not is_discovery_done:
+        return None
+
+    job.path_discovery = None
+    discovery_error_msg = path_discovery.get_error_msg()
+    if discovery_error_msg is None:
+        logger.info(
+            "Finished discovering input paths for job %s (%s tasks).", job.id, job.num_tasks_total
+        )
+    return discovery_error_msg
+
+
+def _get_num_tasks_to_dispatch(
+    job: CompressionJob,
+    max_concurrent_tasks_per_job: int,
+    task_dispatch_mode: TaskDispatchMode,
+) -> int:
+    """
+    :param job:
+    :param max_concurrent_tasks_per_job:
+    :param task_dispatch_mode:
+    :return: The number of the job's remaining tasks that can be dispatched now.
+    """
+    num_remaining_tasks = len(job.remaining_tasks)
+    if TaskDispatchMode.BATCH == task_dispatch_mode and len(job.result_handles) > 0:
+        # Wait for the in-flight batch to finish
+        return 0
+    if CompressionScheduler.UNLIMITED_CONCURRENT_TASKS_PER_JOB == max_concurrent_tasks_per_job:
+        return num_remaining_tasks
+    if TaskDispatchMode.BATCH == task_dispatch_mode:
+        return min(num_remaining_tasks, max_concurrent_tasks_per_job)
+
+    # In sliding-window mode, each in-flight handle corresponds to a single task
+    num_free_slots = max_concurrent_tasks_per_job - len(job.result_handles)
+    return max(0, min(num_remaining_tasks, num_free_slots))
+
+
+def _get_finished_task_results(job: CompressionJob) -> list[CompressionTaskResult] | None:
+    """
+    Collects the results of the job's in-flight tasks that have finished, and removes their
+    handles from the job.
+
+    :param job:
+    :return: The results of the finished tasks, or None if none of the tasks have finished.
+    """
+    finished_task_results: list[CompressionTaskResult] = []
+    pending_result_handles: list[TaskManager.ResultHandle] = []
+    for result_handle in job.result_handles:
+        task_results = result_handle.get_result()
+        if task_results is None:
+            pending_result_handles.append(result_handle)
+        else:
+            finished_task_results.extend(task_results)
+
+    if len(job.result_handles) > 0 and len(pending_result_handles) == len(job.result_handles):
+        return None
+    job.result_handles = pending_result_handles
+    return finished_task_results
+
+
 def _ensure_dataset_exists(
     clp_config: ClpConfig,
     db_context: DbContext,
@@ -835,46 +1093,79 @@ def _insert_tasks_to_db(
     partition_info_to_submit: list[dict[str, Any]],
 ) -> None:
     """
-    Inserts tasks into the database and assign task IDs.
+    Inserts tasks into the database with the RUNNING status and assigns task IDs. Tasks are inserted
+    in batches, each using a single multi-row INSERT followed by a single commit.
+
+    NOTE: This relies on each multi-row INSERT assigning consecutive IDs to its rows, starting from
+    the cursor's `lastrowid`. This holds since the compression scheduler is the only writer of the
+    compression tasks table and `auto_increment_increment` is expected to be 1.
 
     :param db_context:
     :param job_id:
     :param tasks_to_submit:
     :param partition_info_to_submit:
     """
-    for task_idx, task in enumerate(tasks_to_submit):
+    num_tasks = len(tasks_to_submit)
+    batch_begin_idx = 0
+    while batch_begin_idx < num_tasks:
+        batch_end_idx = batch_begin_idx
+        batch_size = 0
+        values: list[Any] = []
+        while (
+            batch_end_idx < num_tasks
+            and batch_end_idx - batch_begin_idx < TASK_INSERTION_BATCH_MAX_NUM_ROWS
+        ):
+            partition_info = partition_info_to_submit[batch_end_idx]
+            row_size = len(partition_info["clp_paths_to_compress"])
+            if batch_end_idx > batch_begin_idx and (
+                batch_size + row_size > TASK_INSERTION_BATCH_MAX_SIZE
+            ):
+                break
+            values.extend(
+                (
+                    job_id,
+                    CompressionTaskStatus.RUNNING,
+                    partition_info["partition_original_size"],
+                    partition_info["clp_paths_to_compress"],
+                )
+            )
+            batch_size += row_size
+            batch_end_idx += 1
+
+        row_placeholders = ", ".join(["(%s, %s, %s, %s)"] * (batch_end_idx - batch_begin_idx))
         db_context.cursor.execute(
             f"INSERT INTO {COMPRESSION_TASKS_TABLE_NAME}"  # noqa: S608
-            " (job_id, partition_original_size, clp_paths_to_compress)"
-            " VALUES (%s, %s, %s)",
-            (
-                job_id,
-                partition_info_to_submit[task_idx]["partition_original_size"],
-                partition_info_to_submit[task_idx]["clp_paths_to_compress"],
-            ),
+            " (job_id, status, partition_original_size, clp_paths_to_compress)"
+            f" VALUES {row_placeholders}",
+            values,
         )
         db_context.connection.commit()
-        task["task_id"] = db_context.cursor.lastrowid
 
+        first_task_id = db_context.cursor.lastrowid
+        for task_id_offset, task in enumerate(tasks_to_submit[batch_begin_idx:batch_end_idx]):
+            task["task_id"] = first_task_id + task_id_offset
 
-def _update_tasks_status_to_running(
-    db_context: DbContext, tasks_to_submit: list[dict[str, Any]]
-) -> None:
+        batch_begin_idx = batch_end_idx
+
+
+def _submit_tasks(
+    task_manager: TaskManager,
+    tasks_to_submit: list[dict[str, Any]],
+    task_dispatch_mode: TaskDispatchMode,
+) -> list[TaskManager.ResultHandle]:
     """
-    Updates the status of submitted tasks to RUNNING.
+    Submits tasks to the task manager.
 
-    :param db_context:
+    :param task_manager:
     :param tasks_to_submit:
+    :param task_dispatch_mode:
+    :return: The handles of the submitted tasks.
     """
-    if len(tasks_to_submit) > 0:
-        task_ids = [task["task_id"] for task in tasks_to_submit]
-        task_id_placeholder = ", ".join(["%s"] * len(task_ids))
-        db_context.cursor.execute(
-            f"UPDATE {COMPRESSION_TASKS_TABLE_NAME}"  # noqa: S608
-            f" SET status = %s WHERE id IN ({task_id_placeholder})",
-            (CompressionTaskStatus.RUNNING, *task_ids),
-        )
-        db_context.connection.commit()
+    if 0 == len(tasks_to_submit):
+        return []
+    if TaskDispatchMode.SLIDING_WINDOW == task_dispatch_mode:
+        return task_manager.submit_individually(tasks_to_submit)
+    return [task_manager.submit(tasks_to_submit)]
 
 
 if "__main__" == __name__:
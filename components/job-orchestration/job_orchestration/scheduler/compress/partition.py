@@ -1,10 +1,17 @@
+import collections
 import copy
+import heapq
+import math
+import operator
 import pathlib
+from collections.abc import Callable
 from typing import Any
 
 import brotli
 import msgpack
+from clp_py_utils.clp_config import PartitioningStrategy
 from clp_py_utils.compression import (
+    FilenameTemplateGrouper,
     FilesPartition,
     group_files_by_similar_filenames,
 )
@@ -12,6 +19,15 @@ from clp_py_utils.core import FileMetadata
 
 from job_orchestration.scheduler.job_config import ClpIoConfig, PathsToCompress
 
+# The number of chunks into which `_partition_files_by_lpt` splits each partition's worth of files
+LPT_NUM_CHUNKS_PER_PARTITION = 16
+# The min number of partitions' worth of files that the LPT strategy buffers before partitioning
+# them, bounding the memory the buffer uses for large jobs
+LPT_MIN_NUM_PARTITIONS_PER_BATCH = 64
+# The min size of each partition (as a fraction of the target archive size) that the LPT strategy
+# allows when adding partitions to balance a job's tasks across its concurrent task slots
+LPT_MIN_PARTITION_SIZE_FRACTION = 0.5
+
 
 class PathsToCompressBuffer:
     def __init__(
@@ -21,8 +37,34 @@ class PathsToCompressBuffer:
         scheduling_job_id: int,
         clp_io_config: ClpIoConfig,
         clp_metadata_db_connection_config: dict,
+        task_callback: Callable[[dict[str, Any], dict[str, Any]], None] | None = None,
+        estimate_uncompressed_size: Callable[[FileMetadata], int] | None = None,
+        max_concurrent_tasks: int | None = None,
     ):
+        """
+        :param maintain_file_ordering:
+        :param empty_directories_allowed:
+        :param scheduling_job_id:
+        :param clp_io_config:
+        :param clp_metadata_db_connection_config:
+        :param task_callback: If specified, each task is passed to this callable, along with its
+            partition info, as soon as it's created, rather than being stored in the buffer.
+        :param estimate_uncompressed_size: If specified, used to re-estimate the uncompressed size
+            of each added file, in place of `FileMetadata`'s fixed estimate.
+        :param max_concurrent_tasks: The max number of the job's tasks that can run concurrently,
+            or None if unbounded. Used by the LPT strategy to balance the job's tasks across the
+            concurrent task slots.
+        """
+        self.__task_callback = task_callback
+        self.__estimate_uncompressed_size = estimate_uncompressed_size
+        self.__max_concurrent_tasks = max_concurrent_tasks
         self.__files: list[FileMetadata] = []
+        # When file ordering doesn't need to be maintained, files are grouped as they're added.
+        # Each group is a list of (filename, file) that's sorted in descending filename order before
+        # partitioning, so that each group's files are partitioned in filename order.
+        self.__file_grouper = FilenameTemplateGrouper()
+        self.__file_groups: dict[int, list[tuple[str, FileMetadata]]] = {}
+        self.__unsorted_group_ids: set[int] = set()
         self.__tasks: list[dict[str, Any]] = []
         self.__partition_info: list[dict[str, Any]] = []
         self.__maintain_file_ordering: bool = maintain_file_ordering
@@ -33,6 +75,24 @@ class PathsToCompressBuffer:
         self.__total_file_size: int = 0
         self.__target_archive_size: int = clp_io_config.output.target_archive_size
         self.__file_size_to_trigger_compression: int = clp_io_config.output.target_archive_size * 2
+        self.__partitioning_strategy: PartitioningStrategy = (
+            clp_io_config.output.partitioning_strategy
+        )
+        # With the LPT strategy, files are only partitioned once a large batch of them has been
+        # added (unless tasks must be created as files are added), so that many partitions are
+        # balanced together rather than only the last few. The batch is a multiple of the job's
+        # concurrency so that each batch's tasks fill whole waves of task slots.
+        self.__partitions_in_lpt_batches: bool = (
+            PartitioningStrategy.LPT == self.__partitioning_strategy
+            and task_callback is None
+            and not maintain_file_ordering
+        )
+        self.__lpt_num_partitions_per_batch: int = LPT_MIN_NUM_PARTITIONS_PER_BATCH
+        if max_concurrent_tasks is not None:
+            self.__lpt_num_partitions_per_batch = (
+                math.ceil(LPT_MIN_NUM_PARTITIONS_PER_BATCH / max_concurrent_tasks)
+                * max_concurrent_tasks
+            )
 
         self.num_tasks = 0
         self.__task_arguments = {
@@ -50,10 +110,25 @@ class PathsToCompressBuffer:
         return self.__partition_info
 
     def add_file(self, file: FileMetadata):
-        self.__files.append(file)
+        if self.__estimate_uncompressed_size is not None:
+            file.estimated_uncompressed_size = self.__estimate_uncompressed_size(file)
+
+        if self.__maintain_file_ordering:
+            self.__files.append(file)
+        else:
+            group_id = self.__file_grouper.get_group_id(file)
+            self.__file_groups.setdefault(group_id, []).append((file.path.name, file))
+            self.__unsorted_group_ids.add(group_id)
         self.__total_file_size += file.estimated_uncompressed_size
 
-        if self.__total_file_size >= self.__file_size_to_trigger_compression:
+        if self.__partitions_in_lpt_batches:
+            if (
+                self.__total_file_size
+                >= self.__lpt_num_partitions_per_batch * self.__target_archive_size
+            ):
+                self.__sort_file_groups()
+                self.__flush_file_groups_by_lpt(self.__lpt_num_partitions_per_batch)
+        elif self.__total_file_size >= self.__file_size_to_trigger_compression:
             self.__partition_and_compress(False)
 
     def add_empty_directory(self, path: pathlib.Path):
@@ -64,9 +139,25 @@ class PathsToCompressBuffer:
     def flush(self):
         self.__partition_and_compress(True)
 
+        if (
+            PartitioningStrategy.LPT == self.__partitioning_strategy
+            and self.__task_callback is None
+        ):
+            # Order the tasks from largest to smallest so that, when they're dispatched in order,
+            # the largest tasks don't end up running last and prolonging the job.
+            task_order = sorted(
+                range(len(self.__tasks)),
+                key=lambda task_ix: int(self.__partition_info[task_ix]["partition_original_size"]),
+                reverse=True,
+            )
+            self.__tasks = [self.__tasks[task_ix] for task_ix in task_order]
+            self.__partition_info = [self.__partition_info[task_ix] for task_ix in task_order]
+
     def contains_paths(self):
-        return len(self.__files) > 0 or (
-            self.__empty_directories and len(self.__empty_directories) > 0
+        return (
+            len(self.__files) > 0
+            or len(self.__file_groups) > 0
+            or (self.__empty_directories and len(self.__empty_directories) > 0)
         )
 
     def __submit_partition_for_compression(self, partition: FilesPartition):
@@ -79,28 +170,61 @@ class PathsToCompressBuffer:
             paths_to_compress.empty_directories = self.__empty_directories
             self.__empty_directories = []
 
-        self.__partition_info.append(
-            {
-                "partition_original_size": str(sum(st_sizes)),
-                "clp_paths_to_compress": brotli.compress(
-                    msgpack.packb(paths_to_compress.model_dump(exclude_none=True)), quality=4
-                ),
-            }
-        )
+        partition_info = {
+            "partition_original_size": str(sum(st_sizes)),
+            "clp_paths_to_compress": brotli.compress(
+                msgpack.packb(paths_to_compress.model_dump(exclude_none=True)), quality=4
+            ),
+        }
 
         task_arguments = self.__task_arguments.copy()
         task_arguments["paths_to_compress_json"] = paths_to_compress.model_dump_json(
             exclude_none=True
         )
-        self.__tasks.append(copy.deepcopy(task_arguments))
+        task = copy.deepcopy(task_arguments)
         self.num_tasks += 1
 
+        if self.__task_callback is not None:
+            self.__task_callback(task, partition_info)
+        else:
+            self.__partition_info.append(partition_info)
+            self.__tasks.append(task)
+
         return partition_total_file_size
 
-    def add_files(self, target_num_archives: int, target_archive_size: int, files):
+    def add_files(
+        self,
+        target_num_archives: int,
+        target_archive_size: int,
+        files,
+        partitioning_strategy: PartitioningStrategy | None = None,
+    ):
+        """
+        Partitions the given files into (at most) `target_num_archives` partitions and submits them.
+
+        :param target_num_archives:
+        :param target_archive_size: The size at which a partition is considered full. Only used by
+            the round-robin strategy.
+        :param files:
+        :param partitioning_strategy: The strategy to use, or None to use the job's strategy.
+        """
         target_num_archives = min(len(files), target_num_archives)
+        if self.__estimate_uncompressed_size is not None:
+            for file in files:
+                file.estimated_uncompressed_size = self.__estimate_uncompressed_size(file)
+        if partitioning_strategy is None:
+            partitioning_strategy = self.__partitioning_strategy
 
         groups = group_files_by_similar_filenames(files)
+
+        if PartitioningStrategy.LPT == partitioning_strategy:
+            partitions = _partition_files_by_lpt(
+                [(group["id"], group["files"]) for group in groups], target_num_archives
+            )
+            for partition in partitions:
+                self.__submit_partition_for_compression(partition)
+            return
+
         next_file_ix_per_group = [0 for _ in range(len(groups))]
 
         partitions = [FilesPartition() for _ in range(target_num_archives)]
@@ -138,6 +262,46 @@ class PathsToCompressBuffer:
         for partition in partitions:
             self.__submit_partition_for_compression(partition)
 
+    def __sort_file_groups(self):
+        """
+        Sorts each file group that has had files added since it was last sorted, in descending
+        filename order.
+        """
+        for group_id in self.__unsorted_group_ids:
+            self.__file_groups[group_id].sort(key=operator.itemgetter(0), reverse=True)
+        self.__unsorted_group_ids.clear()
+
+    def __flush_file_groups_by_lpt(self, num_partitions: int | None = None):
+        """
+        Partitions all buffered file groups, balancing the partitions' sizes with
+        `_partition_files_by_lpt`, and submits them.
+
+        :param num_partitions: The number of partitions to create, or None to create as few as the
+            target archive size allows. In the latter case, if the job's concurrency is bounded, the
+            number is rounded up to a multiple of it (as long as each partition stays at least
+            `LPT_MIN_PARTITION_SIZE_FRACTION` of the target archive size), so that the last wave of
+            tasks doesn't leave most task slots idle.
+        """
+        if num_partitions is None:
+            num_partitions = max(1, math.ceil(self.__total_file_size / self.__target_archive_size))
+            max_concurrent_tasks = self.__max_concurrent_tasks
+            if max_concurrent_tasks is not None:
+                rounded_num_partitions = (
+                    math.ceil(num_partitions / max_concurrent_tasks) * max_concurrent_tasks
+                )
+                if (
+                    self.__total_file_size / rounded_num_partitions
+                    >= LPT_MIN_PARTITION_SIZE_FRACTION * self.__target_archive_size
+                ):
+                    num_partitions = rounded_num_partitions
+        groups = [
+            (group_id, [file for _, file in reversed(group_files)])
+            for group_id, group_files in self.__file_groups.items()
+        ]
+        self.__file_groups = {}
+        for partition in _partition_files_by_lpt(groups, num_partitions):
+            self.__total_file_size -= self.__submit_partition_for_compression(partition)
+
     def __partition_and_compress(self, flush_buffer: bool):
         if not flush_buffer and self.__total_file_size < self.__target_archive_size:
             # Not enough data for a full partition and we don't need to exhaust the buffer
@@ -177,28 +341,24 @@ class PathsToCompressBuffer:
                 self.__total_file_size -= self.__submit_partition_for_compression(partition)
                 self.__files = []
         else:
-            groups = group_files_by_similar_filenames(self.__files)
-            next_file_ix_per_group = [0 for _ in range(len(groups))]
+            self.__sort_file_groups()
 
-            group_ix = 0
-            while len(groups) > 0:
-                group_file_ix = next_file_ix_per_group[group_ix]
-                group_id = groups[group_ix]["id"]
-                group_files = groups[group_ix]["files"]
+            if flush_buffer and PartitioningStrategy.LPT == self.__partitioning_strategy:
+                self.__flush_file_groups_by_lpt()
 
-                file = group_files[group_file_ix]
+            # Distribute files across partitions in round-robin order over the groups
+            group_ids = collections.deque(self.__file_groups)
+            while len(group_ids) > 0:
+                group_id = group_ids.popleft()
+                group_files = self.__file_groups[group_id]
 
+                _, file = group_files.pop()
                 partition.add_file(file, group_id)
 
-                group_file_ix += 1
-                if len(group_files) == group_file_ix:
-                    groups.pop(group_ix)
-                    next_file_ix_per_group.pop(group_ix)
+                if len(group_files) == 0:
+                    del self.__file_groups[group_id]
                 else:
-                    next_file_ix_per_group[group_ix] = group_file_ix
-                    group_ix += 1
-                if len(groups) > 0:
-                    group_ix %= len(groups)
+                    group_ids.append(group_id)
 
                 # Compress partition if ready
                 if partition.get_total_file_size() >= self.__target_archive_size:
@@ -211,18 +371,60 @@ class PathsToCompressBuffer:
             # Compress partial partition
             if partition.contains_files():
                 self.__total_file_size -= self.__submit_partition_for_compression(partition)
-                self.__files = []
-
-            # Pop compressed files
-            remaining_files = []
-            for group_ix, group in enumerate(groups):
-                group_files = group["files"]
-                group_file_ix = next_file_ix_per_group[group_ix]
-                for i in range(group_file_ix, len(group_files)):
-                    remaining_files.append(group_files[i])
-            self.__files = remaining_files
 
             # Compress any remaining empty directories
             if flush_buffer and self.contains_paths():
                 self.__total_file_size -= self.__submit_partition_for_compression(partition)
-                self.__files = []
+
+
+def _partition_files_by_lpt(
+    groups: list[tuple[int, list[FileMetadata]]], num_partitions: int
+) -> list[FilesPartition]:
+    """
+    Partitions files using the longest-processing-time-first (LPT) rule, while keeping groups of
+    similarly named files together where possible:
+    - Each group is split into chunks of consecutive files, each no larger than a fraction
+      (`1 / LPT_NUM_CHUNKS_PER_PARTITION`) of the ideal partition size. Finer chunks balance the
+      partitions better, at the cost of spreading each group across more partitions.
+    - From largest to smallest, each chunk is added to the partition with the smallest total size.
+
+    :param groups: A list of (group ID, files in the group).
+    :param num_partitions:
+    :return: The non-empty partitions.
+    """
+    total_file_size = sum(
+        file.estimated_uncompressed_size for _, group_files in groups for file in group_files
+    )
+    max_chunk_size = max(
+        1, math.ceil(total_file_size / (num_partitions * LPT_NUM_CHUNKS_PER_PARTITION))
+    )
+
+    # Each chunk is a tuple of (size, group ID, files)
+    chunks: list[tuple[int, int, list[FileMetadata]]] = []
+    for group_id, group_files in groups:
+        chunk_files: list[FileMetadata] = []
+        chunk_size = 0
+        for file in group_files:
+            if len(chunk_files) > 0 and chunk_size + file.estimated_uncompressed_size > (
+                max_chunk_size
+            ):
+                chunks.append((chunk_size, group_id, chunk_files))
+                chunk_files = []
+                chunk_size = 0
+            chunk_files.append(file)
+            chunk_size += file.estimated_uncompressed_size
+        if len(chunk_files) > 0:
+            chunks.append((chunk_size, group_id, chunk_files))
+    chunks.sort(key=operator.itemgetter(0), reverse=True)
+
+    partitions = [FilesPartition() for _ in range(num_partitions)]
+    # Min-heap of (partition size, partition index)
+    partition_sizes = [(0, partition_ix) for partition_ix in range(num_partitions)]
+    for chunk_size, group_id, chunk_files in chunks:
+        partition_size, partition_ix = heapq.heappop(partition_sizes)
+        partition = partitions[partition_ix]
+        for file in chunk_files:
+            partition.add_file(file, group_id)
+        heapq.heappush(partition_sizes, (partition_size + chunk_size, partition_ix))
+
+    return [partition for partition in partitions if partition.contains_files()]
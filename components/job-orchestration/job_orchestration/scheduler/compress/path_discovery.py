@@ -0,0 +1,92 @@
+import queue
+import threading
+from collections.abc import Callable
+from typing import Any
+
+
+class PathDiscoveryCancelledError(Exception):
+    """Raised inside the discovery thread once its path discovery has been cancelled."""
+
+
+class StreamingPathDiscovery:
+    """
+    Runs a compression job's path discovery in a background thread and collects the tasks that the
+    job's `PathsToCompressBuffer` emits along the way, so that the scheduler can dispatch them while
+    discovery is still in progress.
+
+    NOTE: Only `add_task` is meant to be called from the discovery thread; all other methods are
+    meant to be called from the scheduling thread.
+    """
+
+    def __init__(self) -> None:
+        self.__discovered_tasks: queue.SimpleQueue[tuple[dict[str, Any], dict[str, Any]]] = (
+            queue.SimpleQueue()
+        )
+        self.__done = threading.Event()
+        self.__cancelled = threading.Event()
+        self.__error_msg: str | None = None
+        self.__thread: threading.Thread | None = None
+
+    def start(self, discover_paths: Callable[[], str | None]) -> None:
+        """
+        Starts discovering paths in a background thread.
+
+        :param discover_paths: A callable that adds every input path to the job's
+            `PathsToCompressBuffer` and flushes it. It should return None on success or an error
+            message on failure, and it shouldn't raise.
+        """
+
+        def run() -> None:
+            try:
+                self.__error_msg = discover_paths()
+            finally:
+                self.__done.set()
+
+        self.__thread = threading.Thread(target=run, daemon=True)
+        self.__thread.start()
+
+    def add_task(self, task: dict[str, Any], partition_info: dict[str, Any]) -> None:
+        """
+        Adds a task emitted by the job's `PathsToCompressBuffer`.
+
+        :param task:
+        :param partition_info:
+        :raise PathDiscoveryCancelledError: If discovery has been cancelled.
+        """
+        if self.__cancelled.is_set():
+            raise PathDiscoveryCancelledError
+        self.__discovered_tasks.put((task, partition_info))
+
+    def pop_tasks(self) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """
+        :return: A tuple of (tasks, partition_info) for every task discovered since the last call.
+        """
+        tasks = []
+        partition_info = []
+        while True:
+            try:
+                task, task_partition_info = self.__discovered_tasks.get_nowait()
+            except queue.Empty:
+                break
+            tasks.append(task)
+            partition_info.append(task_partition_info)
+        return tasks, partition_info
+
+    def is_done(self) -> bool:
+        """
+        NOTE: To ensure no task is missed, callers should call this method before calling
+        `pop_tasks` for the last time.
+
+        :return: Whether discovery has finished, either successfully or not.
+        """
+        return self.__done.is_set()
+
+    def get_error_msg(self) -> str | None:
+        """
+        :return: The error message returned by the discovery callable, if any.
+        """
+        return self.__error_msg
+
+    def cancel(self) -> None:
+        """Cancels discovery the next time the discovery thread emits a task."""
+        self.__cancelled.set()
@@ -36,12 +36,31 @@ class SpiderTaskManager(TaskManager):
         )
         job_args = []
         for task_param in task_params:
-            job_args.append(spider_py.Int64(task_param["job_id"]))
-            job_args.append(spider_py.Int64(task_param["task_id"]))
-            job_args.append(task_param["clp_io_config_json"].encode("utf-8"))
-            job_args.append(task_param["paths_to_compress_json"].encode("utf-8"))
-            job_args.append(
-                json.dumps(task_param["clp_metadata_db_connection_config"]).encode("utf-8")
-            )
+            job_args.extend(_get_compress_task_args(task_param))
         submitted_job = self._driver.submit_jobs([job], [job_args])[0]
         return SpiderTaskManager.ResultHandle(submitted_job)
+
+    def submit_individually(
+        self, task_params: list[dict[str, Any]]
+    ) -> list[TaskManager.ResultHandle]:
+        if len(task_params) == 0:
+            return []
+        # Submit all single-task jobs in one call to avoid a storage round trip per task
+        jobs = [spider_py.group([compress]) for _ in range(len(task_params))]
+        jobs_args = [_get_compress_task_args(task_param) for task_param in task_params]
+        submitted_jobs = self._driver.submit_jobs(jobs, jobs_args)
+        return [SpiderTaskManager.ResultHandle(submitted_job) for submitted_job in submitted_jobs]
+
+
+def _get_compress_task_args(task_param: dict[str, Any]) -> list[Any]:
+    """
+    :param task_param:
+    :return: The arguments of a Spider compression task, in the order `compress` expects them.
+    """
+    return [
+        spider_py.Int64(task_param["job_id"]),
+        spider_py.Int64(task_param["task_id"]),
+        task_param["clp_io_config_json"].encode("utf-8"),
+        task_param["paths_to_compress_json"].encode("utf-8"),
+        json.dumps(task_param["clp_metadata_db_connection_config"]).encode("utf-8"),
+    ]
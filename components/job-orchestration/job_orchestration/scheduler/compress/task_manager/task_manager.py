@@ -16,7 +16,7 @@ class TaskManager(ABC):
             Gets the result of a compression job.
             :param timeout: Maximum time (in seconds) to wait for retrieving the result. Depending
                 on the implementation, this parameter may be ignored.
-            :return: A list of task results.
+            :return: A list of task results, or None if the job hasn't finished yet.
             """
 
     @abstractmethod
@@ -26,3 +26,12 @@ class TaskManager(ABC):
         :param task_params: A list of dictionaries containing parameters for each compression task.
         :return: A handle through which to get the result of the job.
         """
+
+    def submit_individually(self, task_params: list[dict[str, Any]]) -> list[ResultHandle]:
+        """
+        Submits each compression task as its own job so that the result of each task can be
+        retrieved as soon as the task finishes.
+        :param task_params: A list of dictionaries containing parameters for each compression task.
+        :return: A list of handles, one per task, in the same order as `task_params`.
+        """
+        return [self.submit([params]) for params in task_params]
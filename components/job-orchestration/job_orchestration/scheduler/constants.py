@@ -8,6 +8,12 @@ TASK_QUEUE_LOWEST_PRIORITY = 1
 TASK_QUEUE_HIGHEST_PRIORITY = 3
 
 
+# Name of the queue for query tasks. The queue is declared with a max priority, which RabbitMQ
+# can't add to an existing queue, so it's named differently from the queue that was previously
+# declared without one (named after `SchedulerType.QUERY`).
+QUERY_TASK_QUEUE_NAME = "query-prioritized"
+
+
 class SchedulerType:
     COMPRESSION = "compression"
     QUERY = "query"
@@ -3,10 +3,15 @@ from __future__ import annotations
 from enum import auto
 from typing import Literal
 
-from clp_py_utils.clp_config import S3Config
+from clp_py_utils.clp_config import PartitioningStrategy, S3Config
 from pydantic import BaseModel, field_validator
 from strenum import LowercaseStrEnum
 
+from job_orchestration.scheduler.constants import (
+    TASK_QUEUE_HIGHEST_PRIORITY,
+    TASK_QUEUE_LOWEST_PRIORITY,
+)
+
 
 class InputType(LowercaseStrEnum):
     FS = auto()
@@ -69,6 +74,7 @@ class OutputConfig(BaseModel):
     target_segment_size: int
     target_encoded_file_size: int
     compression_level: int
+    partitioning_strategy: PartitioningStrategy = PartitioningStrategy.ROUND_ROBIN
 
 
 class ClpIoConfig(BaseModel):
@@ -80,6 +86,9 @@ class AggregationConfig(BaseModel):
     job_id: int | None = None
     reducer_host: str | None = None
     reducer_port: int | None = None
+    # Addresses (host and port) of the reducer shards that the job's search results are partitioned
+    # across (by archive), if the job has more than one reducer
+    reducer_shard_addresses: list[tuple[str, int]] | None = None
     do_count_aggregation: bool | None = None
     count_by_time_bucket_size: int | None = None  # Milliseconds
 
@@ -113,6 +122,8 @@ class SearchJobConfig(QueryJobConfig):
     network_address: tuple[str, int] | None = None
     aggregation_config: AggregationConfig | None = None
     write_to_file: bool = False
+    # The job's scheduling priority (only used by the fair-share scheduling policy)
+    priority: int | None = None
 
     @field_validator("network_address")
     @classmethod
@@ -121,3 +132,16 @@ class SearchJobConfig(QueryJobConfig):
             raise ValueError("Port must be in the range [1, 65535]")
 
         return value
+
+    @field_validator("priority")
+    @classmethod
+    def validate_priority(cls, value):
+        if value is not None and (
+            value < TASK_QUEUE_LOWEST_PRIORITY or value > TASK_QUEUE_HIGHEST_PRIORITY
+        ):
+            raise ValueError(
+                f"Priority must be in the range [{TASK_QUEUE_LOWEST_PRIORITY},"
+                f" {TASK_QUEUE_HIGHEST_PRIORITY}]"
+            )
+
+        return value
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import bisect
+import contextlib
+import time
+from dataclasses import dataclass
+
+# Interval (in seconds) between checks for archives that were deleted from, or whose insertion was
+# committed out of order into, an archives table
+ARCHIVE_TIME_RANGE_CACHE_RECONCILE_INTERVAL = 30
+
+
+@dataclass
+class _Archive:
+    pagination_id: int
+    id: str
+    begin_timestamp: int
+    end_timestamp: int
+
+
+class ArchiveTimeRangeCache:
+    """
+    An in-memory cache of the time ranges of the archives in an archives table, which lets the
+    scheduler select the archives that overlap a search's time range without querying the database.
+
+    The archives are kept sorted by their end timestamps. Since no archive spans more than
+    `__max_time_span`, an archive can only overlap the range [begin, end] if its end timestamp is in
+    [begin, end + `__max_time_span`], so selecting the archives for a narrow time range only
+    examines the archives near that range.
+
+    The cache is refreshed incrementally:
+    - Every refresh loads the archives whose pagination IDs (which are auto-incremented) are greater
+      than any the cache has seen.
+    - Every `ARCHIVE_TIME_RANGE_CACHE_RECONCILE_INTERVAL` seconds, a refresh also compares the set
+      of pagination IDs in the table against the cache's, dropping the archives that were deleted
+      and loading any that were missed (e.g., because the transaction that inserted them committed
+      after a transaction that inserted an archive with a greater pagination ID).
+    """
+
+    def __init__(self, archives_table_name: str) -> None:
+        """
+        :param archives_table_name:
+        """
+        self.__archives_table_name = archives_table_name
+        self.__archives_by_pagination_id: dict[int, _Archive] = {}
+        self.__max_pagination_id = 0
+        # The archives sorted by their end timestamps, and their end timestamps for bisection
+        self.__sorted_archives: list[_Archive] = []
+        self.__sorted_end_timestamps: list[int] = []
+        # The largest `end_timestamp - begin_timestamp` of any archive in the cache
+        self.__max_time_span = 0
+        self.__last_reconcile_time: float | None = None
+
+    def refresh(self, db_conn) -> None:
+        """
+        Updates the cache with the archives that were added to or deleted from the table.
+
+        :param db_conn:
+        """
+        with contextlib.closing(db_conn.cursor(dictionary=True)) as db_cursor:
+            db_cursor.execute(
+                f"""
+                SELECT pagination_id, id, begin_timestamp, end_timestamp
+                FROM `{self.__archives_table_name}`
+                WHERE pagination_id > %s
+                """,
+                (self.__max_pagination_id,),
+            )
+            new_archives = [_Archive(**row) for row in db_cursor.fetchall()]
+            deleted_pagination_ids: set[int] = set()
+
+            now = time.monotonic()
+            should_reconcile = (
+                self.__last_reconcile_time is None
+                or now - self.__last_reconcile_time >= ARCHIVE_TIME_RANGE_CACHE_RECONCILE_INTERVAL
+            )
+            if should_reconcile:
+                # NOTE: Comparing the number of archives instead would miss an archive whose
+                # insertion was committed late if another archive was deleted in the meantime.
+                new_archives, deleted_pagination_ids = self.__reconcile(db_cursor, new_archives)
+            # End the transaction so that the next refresh reads the latest state of the table
+            db_conn.commit()
+
+        if should_reconcile:
+            self.__last_reconcile_time = now
+
+        if len(deleted_pagination_ids) > 0:
+            for pagination_id in deleted_pagination_ids:
+                del self.__archives_by_pagination_id[pagination_id]
+            self.__sorted_archives = [
+                archive
+                for archive in self.__sorted_archives
+                if archive.pagination_id not in deleted_pagination_ids
+            ]
+            self.__sorted_end_timestamps = [
+                archive.end_timestamp for archive in self.__sorted_archives
+            ]
+            self.__max_time_span = max(
+                (
+                    archive.end_timestamp - archive.begin_timestamp
+                    for archive in self.__sorted_archives
+                ),
+                default=0,
+            )
+
+        if 0 == len(new_archives):
+            return
+        self.__archives_by_pagination_id.update(
+            (archive.pagination_id, archive) for archive in new_archives
+        )
+        self.__max_pagination_id = max(
+            self.__max_pagination_id, max(archive.pagination_id for archive in new_archives)
+        )
+        self.__max_time_span = max(
+            self.__max_time_span,
+            max(archive.end_timestamp - archive.begin_timestamp for archive in new_archives),
+        )
+
+        new_archives.sort(key=lambda archive: archive.end_timestamp)
+        if (
+            0 == len(self.__sorted_end_timestamps)
+            or new_archives[0].end_timestamp >= self.__sorted_end_timestamps[-1]
+        ):
+            # Archives are mostly added in end-timestamp order, so this is the common case.
+            self.__sorted_archives.extend(new_archives)
+            self.__sorted_end_timestamps.extend(archive.end_timestamp for archive in new_archives)
+        else:
+            for archive in new_archives:
+                idx = bisect.bisect_right(self.__sorted_end_timestamps, archive.end_timestamp)
+                self.__sorted_archives.insert(idx, archive)
+                self.__sorted_end_timestamps.insert(idx, archive.end_timestamp)
+
+    def get_archives_for_search(
+        self,
+        begin_timestamp: int | None,
+        end_timestamp: int | None,
+        archive_end_ts_lower_bound: int | None,
+    ) -> list[tuple[str, int]]:
+        """
+        Selects the archives with the same filters as a search's archive selection query.
+
+        :param begin_timestamp: The search's begin timestamp, if any.
+        :param end_timestamp: The search's end timestamp, if any.
+        :param archive_end_ts_lower_bound: The end timestamp before which archives are considered
+            expired (archives without timestamps never expire), if any.
+        :return: A list of (archive ID, end timestamp) tuples, sorted by end timestamp in descending
+        order.
+        """
+        end_timestamps = self.__sorted_end_timestamps
+        start_idx = 0
+        if begin_timestamp is not None:
+            start_idx = bisect.bisect_left(end_timestamps, begin_timestamp)
+        end_idx = len(end_timestamps)
+        if end_timestamp is not None:
+            end_idx = bisect.bisect_right(
+                end_timestamps, end_timestamp + self.__max_time_span, lo=start_idx
+            )
+
+        archives = []
+        for idx in range(end_idx - 1, start_idx - 1, -1):
+            archive = self.__sorted_archives[idx]
+            if end_timestamp is not None and archive.begin_timestamp > end_timestamp:
+                continue
+            if (
+                archive_end_ts_lower_bound is not None
+                and archive.end_timestamp < archive_end_ts_lower_bound
+                and 0 != archive.end_timestamp
+            ):
+                continue
+            archives.append((archive.id, archive.end_timestamp))
+        return archives
+
+    def __reconcile(
+        self, db_cursor, new_archives: list[_Archive]
+    ) -> tuple[list[_Archive], set[int]]:
+        """
+        :param db_cursor:
+        :param new_archives: The archives that were loaded by pagination ID.
+        :return: A tuple of:
+        - The archives in the table that aren't in the cache.
+        - The pagination IDs of the archives in the cache that are no longer in the table.
+        """
+        db_cursor.execute(f"SELECT pagination_id FROM `{self.__archives_table_name}`")
+        pagination_ids = {row["pagination_id"] for row in db_cursor.fetchall()}
+
+        deleted_pagination_ids = self.__archives_by_pagination_id.keys() - pagination_ids
+        new_archives = [
+            archive for archive in new_archives if archive.pagination_id in pagination_ids
+        ]
+        missed_pagination_ids = (
+            pagination_ids
+            - self.__archives_by_pagination_id.keys()
+            - {archive.pagination_id for archive in new_archives}
+        )
+        if len(missed_pagination_ids) > 0:
+            ids_list_string = ", ".join(["%s"] * len(missed_pagination_ids))
+            db_cursor.execute(
+                f"""
+                SELECT pagination_id, id, begin_timestamp, end_timestamp
+                FROM `{self.__archives_table_name}`
+                WHERE pagination_id IN ({ids_list_string})
+                """,
+                list(missed_pagination_ids),
+            )
+            new_archives.extend(_Archive(**row) for row in db_cursor.fetchall())
+        return new_archives, deleted_pagination_ids
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+
+# Max number of streams to cache
+EXTRACTED_STREAM_CACHE_MAX_SIZE = 4096
+# Period (in seconds) after which a cached stream is looked up in the results cache again, in case
+# it was deleted
+EXTRACTED_STREAM_CACHE_TTL = 60
+
+
+class ExtractedStreamCache:
+    """
+    An LRU cache, with a TTL, of the streams that are known to have been extracted into the results
+    cache, so that repeated extraction requests for the same stream don't need to query the results
+    cache.
+
+    Streams are identified by the field used to look them up in the stream collection (e.g.,
+    `file_split_id`) and the field's value.
+    """
+
+    def __init__(
+        self,
+        max_size: int = EXTRACTED_STREAM_CACHE_MAX_SIZE,
+        ttl: float = EXTRACTED_STREAM_CACHE_TTL,
+    ) -> None:
+        """
+        :param max_size:
+        :param ttl: Number of seconds after which a cached stream expires.
+        """
+        self.__max_size = max_size
+        self.__ttl = ttl
+        # Map from (field, value) to the stream's expiry time, ordered from least to most recently
+        # used
+        self.__expiry_times: OrderedDict[tuple[str, str], float] = OrderedDict()
+
+    def contains(self, stream_id_field: str, stream_id: str) -> bool:
+        """
+        :param stream_id_field:
+        :param stream_id:
+        :return: Whether the stream is cached and hasn't expired.
+        """
+        key = (stream_id_field, stream_id)
+        expiry_time = self.__expiry_times.get(key)
+        if expiry_time is None:
+            return False
+        if time.monotonic() >= expiry_time:
+            del self.__expiry_times[key]
+            return False
+        self.__expiry_times.move_to_end(key)
+        return True
+
+    def add(self, stream_id_field: str, stream_id: str) -> None:
+        """
+        Caches a stream as extracted, evicting the least recently used stream if the cache is full.
+
+        :param stream_id_field:
+        :param stream_id:
+        """
+        key = (stream_id_field, stream_id)
+        self.__expiry_times[key] = time.monotonic() + self.__ttl
+        self.__expiry_times.move_to_end(key)
+        if len(self.__expiry_times) > self.__max_size:
+            self.__expiry_times.popitem(last=False)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import heapq
+
+
+class LatestResultsTracker:
+    """
+    Tracks a lower bound on the timestamp of a search job's K-th latest result, using the summaries
+    of the results each of the job's search tasks wrote to the results cache. This lets the
+    scheduler decide whether the job has found its K latest results without scanning the results
+    cache.
+
+    Since every result a task wrote has a timestamp of at least the task's `min_timestamp`, the job
+    has at least K results with timestamps at least T, where T is the largest `min_timestamp` such
+    that the tasks with a `min_timestamp` of at least T wrote K or more results in total.
+    """
+
+    def __init__(self, max_num_results: int) -> None:
+        """
+        :param max_num_results: K, the number of latest results the job is searching for.
+        """
+        self.__max_num_results = max_num_results
+        # Min-heap of (min_timestamp, num_results) for the tasks with the largest `min_timestamp`s
+        # that are needed to reach K results
+        self.__summaries: list[tuple[int, int]] = []
+        self.__num_results = 0
+        self.__has_missing_summaries = False
+
+    def add_summary(self, num_results: int, min_timestamp: int | None) -> None:
+        """
+        Adds the summary of a task's results.
+
+        :param num_results: The number of results the task wrote.
+        :param min_timestamp: The earliest timestamp of the results the task wrote, or None if it
+            wrote none.
+        """
+        if 0 == num_results:
+            return
+
+        heapq.heappush(self.__summaries, (min_timestamp, num_results))
+        self.__num_results += num_results
+        # Drop the summaries that aren't needed to reach K results
+        while self.__num_results - self.__summaries[0][1] >= self.__max_num_results:
+            _, num_results = heapq.heappop(self.__summaries)
+            self.__num_results -= num_results
+
+    def get_num_results(self) -> int:
+        """
+        :return: The number of results the job has found, if fewer than K; otherwise, a number
+        that's at least K.
+        """
+        return self.__num_results
+
+    def get_kth_latest_timestamp_lower_bound(self) -> int | None:
+        """
+        :return: A lower bound on the timestamp of the job's K-th latest result, or None if the job
+        hasn't found K results.
+        """
+        if self.__num_results < self.__max_num_results:
+            return None
+        return self.__summaries[0][0]
+
+    def mark_summary_missing(self) -> None:
+        """Records that a task didn't report a summary of its results."""
+        self.__has_missing_summaries = True
+
+    def has_missing_summaries(self) -> bool:
+        """
+        :return: Whether any task didn't report a summary, in which case the results cache must be
+        scanned instead.
+        """
+        return self.__has_missing_summaries
+
+    def found_max_num_latest_results(self, max_timestamp_in_remaining_archives: int) -> bool:
+        """
+        :param max_timestamp_in_remaining_archives:
+        :return: Whether the job has found K results that are at least as late as any result in the
+        archives that haven't been searched.
+        """
+        bound = self.get_kth_latest_timestamp_lower_bound()
+        if bound is None:
+            return False
+        return max_timestamp_in_remaining_archives <= bound
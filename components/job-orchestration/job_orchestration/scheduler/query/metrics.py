@@ -0,0 +1,268 @@
+"""
+Metrics on the latency of each stage of the query jobs the query scheduler handles, and on the jobs
+that are in flight, exposed in the Prometheus text format through an HTTP endpoint that's served
+from the scheduler's event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+from collections.abc import Callable
+from enum import auto
+
+from strenum import LowercaseStrEnum
+
+# Upper bounds (in seconds) of the buckets of the stage latency histograms
+LATENCY_HISTOGRAM_BUCKET_UPPER_BOUNDS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+)
+
+# Quantiles of the stage latencies that are estimated from the histograms
+LATENCY_QUANTILES = (0.5, 0.95, 0.99)
+
+# Max size (in bytes) of an HTTP request to the metrics endpoint
+METRICS_REQUEST_MAX_SIZE = 8192
+
+# Timeout (in seconds) for reading an HTTP request to the metrics endpoint
+METRICS_REQUEST_TIMEOUT = 5
+
+METRIC_NAME_PREFIX = "clp_query_scheduler"
+
+
+class QueryStage(LowercaseStrEnum):
+    # From the job's submission until the scheduler picks it up
+    INTAKE = auto()
+    # Selecting the archives a search job needs to search
+    ARCHIVE_SELECTION = auto()
+    # Inserting a dispatch's tasks into the database
+    TASK_INSERT = auto()
+    # Sending a dispatch's tasks to the task queue
+    TASK_ENQUEUE = auto()
+    # Acquiring a reducer for an aggregation job
+    REDUCER_HANDSHAKE = auto()
+    # From a task being sent to the task queue until a worker starts it (measured by the worker)
+    WORKER_QUEUEING = auto()
+    # Running `clo` or `clp-s` for a task (measured by the worker)
+    EXECUTION = auto()
+    # Committing the job's final status to the database
+    STATUS_COMMIT = auto()
+
+
+class LatencyHistogram:
+    """
+    A histogram of latencies with fixed buckets, which can estimate the latencies' quantiles by
+    interpolating within the bucket that contains each quantile (like Prometheus'
+    `histogram_quantile`).
+    """
+
+    def __init__(
+        self, bucket_upper_bounds: tuple[float, ...] = LATENCY_HISTOGRAM_BUCKET_UPPER_BOUNDS
+    ) -> None:
+        """
+        :param bucket_upper_bounds: The buckets' upper bounds, in ascending order. An implicit
+            bucket with an infinite upper bound follows the last one.
+        """
+        self.__bucket_upper_bounds = bucket_upper_bounds
+        self.__bucket_counts = [0] * (len(bucket_upper_bounds) + 1)
+        self.__count = 0
+        self.__sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        :param value:
+        """
+        self.__bucket_counts[bisect.bisect_left(self.__bucket_upper_bounds, value)] += 1
+        self.__count += 1
+        self.__sum += value
+
+    def get_count(self) -> int:
+        return self.__count
+
+    def get_sum(self) -> float:
+        return self.__sum
+
+    def get_cumulative_bucket_counts(self) -> list[tuple[float, int]]:
+        """
+        :return: A list of (upper bound, number of values less than or equal to the upper bound)
+        tuples, ending with the bucket with an infinite upper bound.
+        """
+        cumulative_counts = []
+        cumulative_count = 0
+        for upper_bound, count in zip(
+            (*self.__bucket_upper_bounds, float("inf")), self.__bucket_counts, strict=True
+        ):
+            cumulative_count += count
+            cumulative_counts.append((upper_bound, cumulative_count))
+        return cumulative_counts
+
+    def get_quantile(self, quantile: float) -> float | None:
+        """
+        :param quantile: A value in [0, 1].
+        :return: An estimate of the given quantile of the observed values, or None if no value has
+        been observed. Values in the last bucket are estimated as the last finite upper bound.
+        """
+        if 0 == self.__count:
+            return None
+        rank = quantile * self.__count
+        lower_bound = 0.0
+        cumulative_count = 0
+        for upper_bound, count in zip(
+            self.__bucket_upper_bounds, self.__bucket_counts, strict=False
+        ):
+            if count > 0 and cumulative_count + count >= rank:
+                return lower_bound + (upper_bound - lower_bound) * (
+                    (rank - cumulative_count) / count
+                )
+            cumulative_count += count
+            lower_bound = upper_bound
+        return lower_bound
+
+
+class QuerySchedulerMetrics:
+    """
+    Latency histograms for each `QueryStage`, and counts of the lookups of tasks' archives in the
+    query workers' archive caches.
+    """
+
+    def __init__(self) -> None:
+        self.__stage_latencies = {stage: LatencyHistogram() for stage in QueryStage}
+        self.__num_archive_cache_hits = 0
+        self.__num_archive_cache_misses = 0
+
+    def observe_stage_duration(self, stage: QueryStage, duration: float) -> None:
+        """
+        :param stage:
+        :param duration: The stage's duration, in seconds.
+        """
+        self.__stage_latencies[stage].observe(duration)
+
+    def observe_archive_cache_lookup(self, is_hit: bool) -> None:
+        """
+        :param is_hit: Whether the archive was in the worker's archive cache.
+        """
+        if is_hit:
+            self.__num_archive_cache_hits += 1
+        else:
+            self.__num_archive_cache_misses += 1
+
+    def render(self, num_jobs_by_state: dict[str, int], num_in_flight_search_tasks: int) -> str:
+        """
+        Renders the metrics in the Prometheus text format.
+
+        :param num_jobs_by_state: The number of jobs the scheduler is handling, by internal state.
+        :param num_in_flight_search_tasks: The number of search tasks in flight across all jobs.
+        :return: The rendered metrics.
+        """
+        lines = []
+
+        name = f"{METRIC_NAME_PREFIX}_stage_duration_seconds"
+        lines.append(f"# HELP {name} Duration of each stage of query jobs and their tasks.")
+        lines.append(f"# TYPE {name} histogram")
+        for stage, histogram in self.__stage_latencies.items():
+            for upper_bound, cumulative_count in histogram.get_cumulative_bucket_counts():
+                le = "+Inf" if float("inf") == upper_bound else f"{upper_bound:g}"
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{le}"}} {cumulative_count}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.get_sum()}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {histogram.get_count()}')
+
+        name = f"{METRIC_NAME_PREFIX}_stage_duration_quantile_seconds"
+        lines.append(
+            f"# HELP {name} Estimated quantiles of the duration of each stage of query jobs and"
+            " their tasks."
+        )
+        lines.append(f"# TYPE {name} gauge")
+        for stage, histogram in self.__stage_latencies.items():
+            for quantile in LATENCY_QUANTILES:
+                value = histogram.get_quantile(quantile)
+                if value is not None:
+                    lines.append(f'{name}{{stage="{stage}",quantile="{quantile:g}"}} {value}')
+
+        name = f"{METRIC_NAME_PREFIX}_archive_cache_lookups_total"
+        lines.append(
+            f"# HELP {name} Number of lookups of tasks' archives in the query workers' archive"
+            " caches."
+        )
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f'{name}{{result="hit"}} {self.__num_archive_cache_hits}')
+        lines.append(f'{name}{{result="miss"}} {self.__num_archive_cache_misses}')
+
+        name = f"{METRIC_NAME_PREFIX}_jobs"
+        lines.append(f"# HELP {name} Number of query jobs the scheduler is handling.")
+        lines.append(f"# TYPE {name} gauge")
+        for state, num_jobs in num_jobs_by_state.items():
+            lines.append(f'{name}{{state="{state}"}} {num_jobs}')
+
+        name = f"{METRIC_NAME_PREFIX}_in_flight_search_tasks"
+        lines.append(f"# HELP {name} Number of search tasks in flight across all jobs.")
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {num_in_flight_search_tasks}")
+
+        return "\n".join(lines) + "\n"
+
+
+async def start_metrics_server(
+    host: str, port: int, render_metrics: Callable[[], str], logger: logging.Logger
+) -> asyncio.Server:
+    """
+    Starts an HTTP server that serves the rendered metrics at `/metrics`.
+
+    :param host:
+    :param port:
+    :param render_metrics: A function that renders the current metrics.
+    :param logger:
+    :return: The server.
+    """
+
+    async def handle_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await asyncio.wait_for(
+                reader.readuntil(b"\r\n\r\n"), timeout=METRICS_REQUEST_TIMEOUT
+            )
+            request_line = request.split(b"\r\n", 1)[0].decode("ascii", errors="replace")
+            request_line_parts = request_line.split(" ")
+            if (
+                len(request_line_parts) == 3
+                and "GET" == request_line_parts[0]
+                and "/metrics" == request_line_parts[1].split("?", 1)[0]
+            ):
+                status = "200 OK"
+                body = render_metrics().encode("utf-8")
+            else:
+                status = "404 Not Found"
+                body = b""
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: close\r\n\r\n".encode("ascii")
+                + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError):
+            pass
+        except Exception:
+            logger.exception("Failed to serve metrics request.")
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle_request, host, port, limit=METRICS_REQUEST_MAX_SIZE)
@@ -20,20 +20,30 @@ import asyncio
 import concurrent.futures
 import contextlib
 import datetime
+import heapq
+import json
+import math
 import pathlib
 import sys
+import time
 from abc import ABC, abstractmethod
 from typing import Any
 
 import celery
 import msgpack
 import pymongo
+import redis
+from celery.exceptions import TimeoutError as CeleryTimeoutError
+from celery.utils import worker_direct
 from clp_py_utils.clp_config import (
     ClpConfig,
     Database,
     QUERY_JOBS_TABLE_NAME,
     QUERY_SCHEDULER_COMPONENT_NAME,
     QUERY_TASKS_TABLE_NAME,
+    QueryScheduler,
+    QuerySchedulingPolicy,
+    TaskDispatchMode,
 )
 from clp_py_utils.clp_logging import configure_logging, get_logger
 from clp_py_utils.clp_metadata_db_utils import (
@@ -43,33 +53,83 @@ from clp_py_utils.clp_metadata_db_utils import (
 )
 from clp_py_utils.core import read_yaml_config_file
 from clp_py_utils.decorators import exception_default_value
+from clp_py_utils.job_notifications import (
+    AsyncJobNotificationSubscriber,
+    create_async_redis_client,
+    create_redis_client,
+    get_query_job_finished_channel,
+    load_job_notifications_redis_config,
+    publish_job_notification,
+    QUERY_JOB_CREATED_CHANNEL,
+)
 from clp_py_utils.sql_adapter import ConnectionPoolWrapper, SqlAdapter
 from pydantic import ValidationError
 
 from job_orchestration.executor.query.celery import app
 from job_orchestration.executor.query.extract_stream_task import extract_stream
-from job_orchestration.executor.query.fs_search_task import search
+from job_orchestration.executor.query.fs_search_task import search, search_archives
 from job_orchestration.garbage_collector.constants import MIN_TO_SECONDS, SECOND_TO_MILLISECOND
 from job_orchestration.scheduler.constants import (
+    QUERY_TASK_QUEUE_NAME,
     QueryJobStatus,
     QueryJobType,
     QueryTaskStatus,
     SchedulerType,
+    TASK_QUEUE_HIGHEST_PRIORITY,
 )
 from job_orchestration.scheduler.job_config import (
     ExtractIrJobConfig,
     ExtractJsonJobConfig,
     SearchJobConfig,
 )
+from job_orchestration.scheduler.query.archive_time_range_cache import ArchiveTimeRangeCache
+from job_orchestration.scheduler.query.extracted_stream_cache import ExtractedStreamCache
+from job_orchestration.scheduler.query.latest_results_tracker import LatestResultsTracker
+from job_orchestration.scheduler.query.metrics import (
+    QuerySchedulerMetrics,
+    QueryStage,
+    start_metrics_server,
+)
 from job_orchestration.scheduler.query.reducer_handler import (
     handle_reducer_connection,
+    REDUCER_STOP_TIMEOUT,
     ReducerHandlerMessage,
     ReducerHandlerMessageQueues,
     ReducerHandlerMessageType,
+    ReducerJobConfig,
+)
+from job_orchestration.scheduler.query.reducer_shards import (
+    drop_reducer_shard_results,
+    get_reducer_shard_collection_name,
+    merge_reducer_shard_results,
+)
+from job_orchestration.scheduler.query.reusable_search_results_cache import (
+    get_search_results_fingerprint,
+    ReusableSearchResults,
+    ReusableSearchResultsCache,
+)
+from job_orchestration.scheduler.query.scheduling_policy import (
+    allocate_search_task_slots,
+    get_search_job_priority,
+    is_fast_lane_search_job,
+    SearchJobDemand,
+)
+from job_orchestration.scheduler.query.sub_job_sizing import (
+    get_exhaustive_search_sub_job_size,
+    get_latest_results_search_sub_job_size,
+    get_num_archives_per_search_task,
+    get_updated_mean_archive_search_duration,
+)
+from job_orchestration.scheduler.query.task_routing import (
+    delete_worker_direct_queue,
+    get_query_worker_concurrencies,
+    SearchTaskRouter,
+    WORKER_DISCOVERY_INTERVAL,
 )
 from job_orchestration.scheduler.scheduler_data import (
     ExtractIrJob,
     ExtractJsonJob,
+    InFlightSearchTask,
     InternalJobState,
     QueryJob,
     QueryTaskResult,
@@ -80,6 +140,10 @@ from job_orchestration.scheduler.utils import kill_hanging_jobs
 # Setup logging
 logger = get_logger("search-job-handler")
 
+# Fields that identify the streams extracted by each type of extraction job in the stream collection
+IR_STREAM_ID_FIELD = "file_split_id"
+JSON_STREAM_ID_FIELD = "orig_file_id"
+
 # Dictionary of active jobs indexed by job id
 active_jobs: dict[str, QueryJob] = {}
 
@@ -91,6 +155,43 @@ active_archive_json_extractions: dict[str, list[str]] = {}
 
 reducer_connection_queue: asyncio.Queue | None = None
 
+# Max number of reducers that each aggregation job's results are partitioned across
+max_reducer_shards_per_job = 1
+
+# Client for the results cache, shared by all of the scheduler's queries of the results cache
+results_cache_client: pymongo.MongoClient | None = None
+
+# Cache of the streams that are known to have been extracted into the results cache
+extracted_stream_cache = ExtractedStreamCache()
+
+# Cache of the searches whose results can be reused, or None if reusing results is disabled
+reusable_search_results_cache: ReusableSearchResultsCache | None = None
+
+# Latency histograms for each stage of the jobs the scheduler handles
+query_scheduler_metrics = QuerySchedulerMetrics()
+
+# Client for publishing job notifications, or None if notifications are disabled
+job_notifications_redis_client: redis.Redis | None = None
+
+# Router of search tasks to the query workers that are likely to have their archives cached, or None
+# if cache-affinity routing is disabled
+search_task_router: SearchTaskRouter | None = None
+
+# Hostnames of the query workers that departed (until they rejoin), whose unfinished routed tasks
+# are stranded
+departed_query_worker_hostnames: set[str] = set()
+
+# Max time (in seconds) to wait for a cancelled job's revoked tasks to stop
+REVOKED_TASK_STOP_TIMEOUT = 5
+
+# Statuses that a query job can't leave
+QUERY_JOB_TERMINAL_STATUSES = {
+    QueryJobStatus.SUCCEEDED,
+    QueryJobStatus.FAILED,
+    QueryJobStatus.CANCELLED,
+    QueryJobStatus.KILLED,
+}
+
 
 class DispatchExecutor:
     # Globals for dispatch executor pool
@@ -114,30 +215,82 @@ class DispatchExecutor:
 
     @staticmethod
     def dispatch_job_and_update_db(
-        job_config_blob: bytes, job_type: QueryJobType, job_id: str, archives: list[dict]
-    ) -> tuple[str, int, str]:
+        job_config_blob: bytes,
+        job_type: QueryJobType,
+        job_id: str,
+        archive_batches: list[list[dict]],
+        worker_hostnames: list[str | None],
+        priority: int | None,
+    ) -> tuple[str, int, str, float, float]:
+        """
+        Inserts a query task for each archive into the database and dispatches a search task for
+        each batch of archives.
+
+        :param job_config_blob:
+        :param job_type:
+        :param job_id:
+        :param archive_batches: The archives to search, grouped into the batches that each search
+            task searches.
+        :param worker_hostnames: The hostname of the worker whose direct queue each search task
+            should be sent to, or None to send the task to the shared query queue.
+        :param priority:
+        :return: A tuple of:
+        - The job's ID.
+        - The number of archives dispatched.
+        - The ID of the tasks' group result.
+        - The time (in seconds) spent inserting the tasks into the database.
+        - The time (in seconds) spent sending the tasks to the task queue.
+        """
         if not QueryJobType.SEARCH_OR_AGGREGATION == job_type:
             raise NotImplementedError(f"Unexpected job type: {job_type}")
 
-        archive_ids = [a["archive_id"] for a in archives]
+        archive_ids = [a["archive_id"] for batch in archive_batches for a in batch]
+        task_insert_start_time = time.monotonic()
         with contextlib.closing(DispatchExecutor._db_conn_pool.connect()) as db_conn:
             task_ids = insert_query_tasks_into_db(db_conn, job_id, archive_ids)
-
-        celery_task_group = celery.group(
-            search.s(
-                job_id=job_id,
-                archive_id=archives[i]["archive_id"],
-                task_id=task_ids[i],
-                job_config_blob=job_config_blob,
-                dataset=archives[i].get("dataset"),
-                clp_metadata_db_conn_params=DispatchExecutor._clp_metadata_db_conn_params,
-                results_cache_uri=DispatchExecutor._results_cache_uri,
-            )
-            for i in range(len(archives))
-        )
-        group_result = celery_task_group.apply_async()
+        task_enqueue_start_time = time.monotonic()
+
+        dispatch_time = time.time()
+        task_signatures = []
+        batch_begin_idx = 0
+        for batch, worker_hostname in zip(archive_batches, worker_hostnames, strict=True):
+            batch_task_ids = task_ids[batch_begin_idx : batch_begin_idx + len(batch)]
+            batch_begin_idx += len(batch)
+            if 1 == len(batch):
+                task_signature = search.s(
+                    job_id=job_id,
+                    archive_id=batch[0]["archive_id"],
+                    task_id=batch_task_ids[0],
+                    job_config_blob=job_config_blob,
+                    dataset=batch[0].get("dataset"),
+                    clp_metadata_db_conn_params=DispatchExecutor._clp_metadata_db_conn_params,
+                    results_cache_uri=DispatchExecutor._results_cache_uri,
+                    dispatch_time=dispatch_time,
+                )
+            else:
+                task_signature = search_archives.s(
+                    job_id=job_id,
+                    task_ids=batch_task_ids,
+                    job_config_blob=job_config_blob,
+                    archive_ids=[archive["archive_id"] for archive in batch],
+                    clp_metadata_db_conn_params=DispatchExecutor._clp_metadata_db_conn_params,
+                    results_cache_uri=DispatchExecutor._results_cache_uri,
+                    datasets=[archive.get("dataset") for archive in batch],
+                    dispatch_time=dispatch_time,
+                )
+            if worker_hostname is not None:
+                task_signature.set(queue=worker_direct(worker_hostname))
+            task_signatures.append(task_signature)
+        group_result = celery.group(task_signatures).apply_async(priority=priority)
         group_result.save()
-        return job_id, len(archives), group_result.id
+        task_enqueue_end_time = time.monotonic()
+        return (
+            job_id,
+            len(archive_ids),
+            group_result.id,
+            task_enqueue_start_time - task_insert_start_time,
+            task_enqueue_end_time - task_enqueue_start_time,
+        )
 
 
 class StreamExtractionHandle(ABC):
@@ -158,7 +311,7 @@ class StreamExtractionHandle(ABC):
     def is_stream_extraction_active(self) -> bool: ...
 
     @abstractmethod
-    def is_stream_extracted(self, results_cache_uri: str, stream_collection_name: str) -> bool: ...
+    def is_stream_extracted(self, stream_collection_name: str) -> bool: ...
 
     @abstractmethod
     def mark_job_as_waiting(self) -> None: ...
@@ -191,10 +344,8 @@ class IrExtractionHandle(StreamExtractionHandle):
     def is_stream_extraction_active(self) -> bool:
         return self.__file_split_id in active_file_split_ir_extractions
 
-    def is_stream_extracted(self, results_cache_uri: str, stream_collection_name: str) -> bool:
-        return document_exists(
-            results_cache_uri, stream_collection_name, "file_split_id", self.__file_split_id
-        )
+    def is_stream_extracted(self, stream_collection_name: str) -> bool:
+        return is_stream_extracted(stream_collection_name, IR_STREAM_ID_FIELD, self.__file_split_id)
 
     def mark_job_as_waiting(self) -> None:
         global active_file_split_ir_extractions
@@ -238,10 +389,8 @@ class JsonExtractionHandle(StreamExtractionHandle):
     def is_stream_extraction_active(self) -> bool:
         return self._archive_id in active_archive_json_extractions
 
-    def is_stream_extracted(self, results_cache_uri: str, stream_collection_name: str) -> bool:
-        return document_exists(
-            results_cache_uri, stream_collection_name, "orig_file_id", self._archive_id
-        )
+    def is_stream_extracted(self, stream_collection_name: str) -> bool:
+        return is_stream_extracted(stream_collection_name, JSON_STREAM_ID_FIELD, self._archive_id)
 
     def mark_job_as_waiting(self) -> None:
         global active_archive_json_extractions
@@ -259,38 +408,198 @@ class JsonExtractionHandle(StreamExtractionHandle):
         )
 
 
-def document_exists(mongodb_uri, collection_name, field, value):
-    with pymongo.MongoClient(mongodb_uri) as mongo_client:
-        collection = mongo_client.get_default_database()[collection_name]
-        return 0 != collection.count_documents({field: value})
+def document_exists(collection_name, field, value):
+    collection = results_cache_client.get_default_database()[collection_name]
+    return collection.find_one({field: value}, projection=["_id"]) is not None
+
+
+def is_stream_extracted(stream_collection_name: str, stream_id_field: str, stream_id: str) -> bool:
+    """
+    :param stream_collection_name:
+    :param stream_id_field:
+    :param stream_id:
+    :return: Whether the stream has been extracted into the results cache, according to
+    `extracted_stream_cache` if the stream is cached, or the results cache otherwise.
+    """
+    if extracted_stream_cache.contains(stream_id_field, stream_id):
+        return True
+    if not document_exists(stream_collection_name, stream_id_field, stream_id):
+        return False
+    extracted_stream_cache.add(stream_id_field, stream_id)
+    return True
 
 
-def cancel_job_except_reducer(job: SearchJob):
+def cancel_job_except_reducer(job: SearchJob) -> list[celery.result.AsyncResult]:
     """
-    Cancels the job apart from releasing the reducer since that requires an async call.
+    Cancels the job apart from releasing the reducer and waiting for the job's revoked tasks to
+    stop, since those require async calls.
     NOTE: By keeping this method synchronous, the caller can cancel most of the job atomically,
     making it easier to avoid using locks in concurrent tasks.
     :param job:
+    :return: The results of the revoked tasks to wait for (see `wait_for_revoked_tasks`). Tasks that
+        were routed to departed query workers are excluded since they'll never run.
     """
-    if InternalJobState.RUNNING == job.state:
+    revoked_task_results = []
+    if InternalJobState.RUNNING == job.state and job.current_sub_job_async_task_result is not None:
         job.current_sub_job_async_task_result.revoke(terminate=True)
-        try:
-            job.current_sub_job_async_task_result.get()
-        except Exception:
-            pass
+        revoked_task_results.extend(
+            async_task_result
+            for worker_hostname, async_task_result in zip(
+                job.current_sub_job_worker_hostnames,
+                job.current_sub_job_async_task_result.results,
+                strict=True,
+            )
+            if worker_hostname not in departed_query_worker_hostnames
+        )
     elif InternalJobState.WAITING_FOR_REDUCER == job.state:
         job.reducer_acquisition_task.cancel()
 
+    # In sliding-window dispatch mode, the job may have tasks in flight in any state.
+    if len(job.in_flight_search_tasks) > 0:
+        revoked_task_results.extend(
+            task.async_task_result
+            for task in job.in_flight_search_tasks
+            if task.worker_hostname not in departed_query_worker_hostnames
+        )
+        revoke_in_flight_search_tasks(job)
+
+    return revoked_task_results
+
+
+async def wait_for_revoked_tasks(
+    job_id: str, revoked_task_results: list[celery.result.AsyncResult]
+) -> None:
+    """
+    Waits (for at most `REVOKED_TASK_STOP_TIMEOUT` seconds) for the given revoked tasks to stop,
+    without blocking the event loop.
+    :param job_id:
+    :param revoked_task_results:
+    """
+    if 0 == len(revoked_task_results):
+        return
+    try:
+        await asyncio.to_thread(
+            celery.result.ResultSet(revoked_task_results, app=app).get,
+            timeout=REVOKED_TASK_STOP_TIMEOUT,
+            propagate=False,
+        )
+    except CeleryTimeoutError:
+        logger.warning(f"Timed out waiting for job {job_id}'s revoked tasks to stop.")
+
+
+def revoke_in_flight_search_tasks(job: SearchJob) -> celery.result.ResultSet:
+    """
+    Revokes the search tasks that the job has in flight (in sliding-window dispatch mode).
+    :param job:
+    :return: The revoked tasks' results.
+    """
+    in_flight_task_results = celery.result.ResultSet(
+        [task.async_task_result for task in job.in_flight_search_tasks], app=app
+    )
+    in_flight_task_results.revoke(terminate=True)
+    job.in_flight_search_tasks = []
+    return in_flight_task_results
+
 
 async def release_reducer_for_job(job: SearchJob):
     """
-    Releases the reducer assigned to the given job
+    Releases the reducers assigned to the given job
     :param job:
     """
-    if job.reducer_handler_msg_queues is not None:
+    for reducer_handler_msg_queues in job.reducer_handler_msg_queues:
         # Signal the reducer to cancel the job
         msg = ReducerHandlerMessage(ReducerHandlerMessageType.FAILURE)
-        await job.reducer_handler_msg_queues.put_to_handler(msg)
+        await reducer_handler_msg_queues.put_to_handler(msg)
+    if 0 == len(job.reducer_shard_collection_names):
+        return
+
+    # Wait for the reducers to stop before dropping the shards' results, so that a reducer that's
+    # still writing results doesn't recreate a shard's collection.
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(
+                *(
+                    _wait_for_reducer_cancellation(reducer_handler_msg_queues)
+                    for reducer_handler_msg_queues in job.reducer_handler_msg_queues
+                )
+            ),
+            REDUCER_STOP_TIMEOUT + 1,
+        )
+    except asyncio.TimeoutError:
+        logger.warning(f"Timed out waiting for job {job.id}'s reducers to stop.")
+    try:
+        await asyncio.to_thread(
+            drop_reducer_shard_results,
+            results_cache_client.get_default_database(),
+            job.reducer_shard_collection_names,
+        )
+    except pymongo.errors.PyMongoError:
+        logger.exception(f"Failed to drop the reducer shards' results of job {job.id}.")
+
+
+async def _wait_for_reducer_cancellation(
+    reducer_handler_msg_queues: ReducerHandlerMessageQueues,
+) -> None:
+    """
+    Waits for a reducer's handler to report that the reducer has stopped the cancelled job,
+    skipping any earlier messages from the handler.
+
+    :param reducer_handler_msg_queues:
+    """
+    while True:
+        msg = await reducer_handler_msg_queues.get_from_handler()
+        if ReducerHandlerMessageType.CANCELLED == msg.msg_type:
+            return
+
+
+async def finish_reducer_job(job: SearchJob) -> bool:
+    """
+    Notifies the reducers assigned to the given job that they should have received all results, and
+    waits for them to publish the results. If the job's results are partitioned across several
+    reducer shards, the shards' results are then merged into the job's collection.
+    :param job:
+    :return: Whether the job's results were published successfully.
+    """
+    for reducer_handler_msg_queues in job.reducer_handler_msg_queues:
+        msg = ReducerHandlerMessage(ReducerHandlerMessageType.SUCCESS)
+        await reducer_handler_msg_queues.put_to_handler(msg)
+
+    reducer_failed = False
+    for reducer_handler_msg_queues in job.reducer_handler_msg_queues:
+        msg = await reducer_handler_msg_queues.get_from_handler()
+        if ReducerHandlerMessageType.FAILURE == msg.msg_type:
+            reducer_failed = True
+        elif ReducerHandlerMessageType.SUCCESS != msg.msg_type:
+            error_msg = f"Unexpected msg_type: {msg.msg_type.name}"
+            raise NotImplementedError(error_msg)
+
+    if 0 == len(job.reducer_shard_collection_names):
+        return not reducer_failed
+
+    results_cache_db = results_cache_client.get_default_database()
+    try:
+        if reducer_failed:
+            await asyncio.to_thread(
+                drop_reducer_shard_results, results_cache_db, job.reducer_shard_collection_names
+            )
+            return False
+
+        merge_start_time = time.monotonic()
+        await asyncio.to_thread(
+            merge_reducer_shard_results,
+            results_cache_db,
+            job.id,
+            job.reducer_shard_collection_names,
+            job.search_config.aggregation_config.count_by_time_bucket_size is not None,
+        )
+        logger.debug(
+            f"Merged the results of job {job.id}'s {len(job.reducer_shard_collection_names)}"
+            f" reducer shards in {time.monotonic() - merge_start_time:.3f} second(s)."
+        )
+    except pymongo.errors.PyMongoError:
+        logger.exception(f"Failed to merge the reducer shards' results of job {job.id}.")
+        return False
+    return True
 
 
 @exception_default_value(default=[])
@@ -335,6 +644,25 @@ def fetch_cancelling_search_jobs(db_conn) -> list:
         return db_cursor.fetchall()
 
 
+def _publish_job_finished_notification(job_id: str) -> None:
+    """
+    Publishes that a job has finished. When called from the event loop, the publish is run on the
+    loop's default executor (without waiting for it) so that a slow or unreachable Redis server
+    doesn't stall the loop.
+
+    :param job_id:
+    """
+    channel = get_query_job_finished_channel(job_id)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        publish_job_notification(job_notifications_redis_client, channel, logger)
+        return
+    loop.run_in_executor(
+        None, publish_job_notification, job_notifications_redis_client, channel, logger
+    )
+
+
 @exception_default_value(default=False)
 def set_job_or_task_status(
     db_conn,
@@ -347,7 +675,8 @@ def set_job_or_task_status(
     """
     Sets the status of the job or the tasks identified by `job_id` to `status`. If `prev_status` is
     specified, the update is conditional on the job/task's current status matching `prev_status`. If
-    `kwargs` are specified, the fields identified by the args are also updated.
+    `kwargs` are specified, the fields identified by the args are also updated. If a job reaches a
+    terminal status, its completion is published to any subscribed clients.
     :param db_conn:
     :param table_name:
     :param job_id:
@@ -377,9 +706,88 @@ def set_job_or_task_status(
         cursor.execute(update)
         row_changed = cursor.rowcount != 0
         db_conn.commit()
+
+    if (
+        row_changed
+        and QUERY_JOBS_TABLE_NAME == table_name
+        and status in QUERY_JOB_TERMINAL_STATUSES
+    ):
+        _publish_job_finished_notification(job_id)
+    return row_changed
+
+
+def record_stage_duration(job: QueryJob | None, stage: QueryStage, duration: float) -> None:
+    """
+    Records the duration of a stage in the scheduler's metrics and, if given, the job's stage
+    durations.
+    :param job:
+    :param stage:
+    :param duration: The stage's duration, in seconds.
+    """
+    query_scheduler_metrics.observe_stage_duration(stage, duration)
+    if job is not None:
+        job.stage_durations[stage] = job.stage_durations.get(stage, 0.0) + duration
+
+
+def record_task_metrics(job: QueryJob, task_result: QueryTaskResult) -> None:
+    """
+    Records the metrics the worker measured for a task: the durations of the stages the task went
+    through, and whether its archive was in the worker's archive cache.
+    :param job:
+    :param task_result:
+    """
+    if task_result.queue_duration is not None:
+        record_stage_duration(job, QueryStage.WORKER_QUEUEING, task_result.queue_duration)
+    if task_result.execution_duration is not None:
+        record_stage_duration(job, QueryStage.EXECUTION, task_result.execution_duration)
+    if task_result.archive_cache_hit is not None:
+        query_scheduler_metrics.observe_archive_cache_lookup(task_result.archive_cache_hit)
+
+
+def set_final_job_status(
+    db_conn,
+    job: QueryJob,
+    status: QueryJobStatus,
+    prev_status: QueryJobStatus | None = None,
+    **kwargs,
+) -> bool:
+    """
+    Sets the final status of the given job like `set_job_or_task_status`, and then records the
+    durations of the job's stages (including the status commit) in the database.
+    :param db_conn:
+    :param job:
+    :param status:
+    :param prev_status:
+    :param kwargs:
+    :return: Whether the job's status was updated.
+    """
+    status_commit_start_time = time.monotonic()
+    row_changed = set_job_or_task_status(
+        db_conn, QUERY_JOBS_TABLE_NAME, job.id, status, prev_status, **kwargs
+    )
+    record_stage_duration(
+        job, QueryStage.STATUS_COMMIT, time.monotonic() - status_commit_start_time
+    )
+    if row_changed:
+        _set_job_stage_durations(db_conn, job)
     return row_changed
 
 
+@exception_default_value(default=None)
+def _set_job_stage_durations(db_conn, job: QueryJob) -> None:
+    """
+    Records the durations of the job's stages in the database.
+    :param db_conn:
+    :param job:
+    """
+    with contextlib.closing(db_conn.cursor()) as cursor:
+        cursor.execute(
+            f"UPDATE {QUERY_JOBS_TABLE_NAME} SET stage_durations = %s WHERE id = %s",
+            (json.dumps(job.stage_durations), job.id),
+        )
+        db_conn.commit()
+
+
 async def handle_cancelling_search_jobs(db_conn_pool) -> None:
     global active_jobs
 
@@ -390,30 +798,17 @@ async def handle_cancelling_search_jobs(db_conn_pool) -> None:
             job_id = str(cancelling_job["job_id"])
             if job_id in active_jobs:
                 job = active_jobs.pop(job_id)
-                cancel_job_except_reducer(job)
+                revoked_task_results = cancel_job_except_reducer(job)
+                if isinstance(job, SearchJob):
+                    _release_duplicate_search_jobs(db_conn, job, False)
                 # Perform any async tasks last so that it's easier to reason about synchronization
                 # issues between concurrent tasks
+                await wait_for_revoked_tasks(job_id, revoked_task_results)
                 await release_reducer_for_job(job)
             else:
                 continue
 
-            set_job_or_task_status(
-                db_conn,
-                QUERY_TASKS_TABLE_NAME,
-                job_id,
-                QueryTaskStatus.CANCELLED,
-                QueryTaskStatus.PENDING,
-                duration=0,
-            )
-
-            set_job_or_task_status(
-                db_conn,
-                QUERY_TASKS_TABLE_NAME,
-                job_id,
-                QueryTaskStatus.CANCELLED,
-                QueryTaskStatus.RUNNING,
-                duration="TIMESTAMPDIFF(MICROSECOND, start_time, NOW())/1000000.0",
-            )
+            _cancel_unfinished_query_tasks(db_conn, job_id)
 
             set_job_or_task_status_kwargs = {}
             if job.start_time is not None:
@@ -421,10 +816,9 @@ async def handle_cancelling_search_jobs(db_conn_pool) -> None:
                     datetime.datetime.now() - job.start_time
                 ).total_seconds()
 
-            if set_job_or_task_status(
+            if set_final_job_status(
                 db_conn,
-                QUERY_JOBS_TABLE_NAME,
-                job_id,
+                job,
                 QueryJobStatus.CANCELLED,
                 QueryJobStatus.CANCELLING,
                 **set_job_or_task_status_kwargs,
@@ -434,20 +828,74 @@ async def handle_cancelling_search_jobs(db_conn_pool) -> None:
                 logger.error(f"Failed to cancel job {job_id}.")
 
 
+def _cancel_unfinished_query_tasks(db_conn, job_id: str) -> None:
+    """
+    Sets the status of the job's pending and running tasks to CANCELLED.
+    :param db_conn:
+    :param job_id:
+    """
+    set_job_or_task_status(
+        db_conn,
+        QUERY_TASKS_TABLE_NAME,
+        job_id,
+        QueryTaskStatus.CANCELLED,
+        QueryTaskStatus.PENDING,
+        duration=0,
+    )
+
+    set_job_or_task_status(
+        db_conn,
+        QUERY_TASKS_TABLE_NAME,
+        job_id,
+        QueryTaskStatus.CANCELLED,
+        QueryTaskStatus.RUNNING,
+        duration="TIMESTAMPDIFF(MICROSECOND, start_time, NOW())/1000000.0",
+    )
+
+
 def insert_query_tasks_into_db(db_conn, job_id, archive_ids: list[str]) -> list[int]:
-    task_ids = []
+    """
+    Inserts a task for each archive with a single multi-row insert.
+
+    NOTE: With some auto-increment lock modes (e.g., MySQL 8's default, "interleaved"), the IDs
+    assigned by a multi-row insert aren't necessarily contiguous when other inserts run
+    concurrently, so the IDs are read back instead of being derived from the first ID. Since a job
+    inserts its tasks sequentially and IDs are assigned in increasing order, the job's tasks with
+    IDs at least the first inserted ID are exactly the inserted tasks.
+
+    :param db_conn:
+    :param job_id:
+    :param archive_ids:
+    :return: The IDs of the inserted tasks, in the same order as `archive_ids`.
+    """
+    if 0 == len(archive_ids):
+        return []
+
+    values_placeholders = ", ".join(["(%s, %s)"] * len(archive_ids))
+    params = []
+    for archive_id in archive_ids:
+        params.extend((job_id, archive_id))
     with contextlib.closing(db_conn.cursor()) as cursor:
-        for archive_id in archive_ids:
-            cursor.execute(
-                f"""
-                INSERT INTO {QUERY_TASKS_TABLE_NAME}
-                (job_id, archive_id)
-                VALUES({job_id}, '{archive_id}')
-                """
-            )
-            task_ids.append(cursor.lastrowid)
+        cursor.execute(
+            f"""
+            INSERT INTO {QUERY_TASKS_TABLE_NAME}
+            (job_id, archive_id)
+            VALUES {values_placeholders}
+            """,
+            params,
+        )
+        first_task_id = cursor.lastrowid
+        cursor.execute(
+            f"""
+            SELECT id, archive_id
+            FROM {QUERY_TASKS_TABLE_NAME}
+            WHERE job_id = %s AND id >= %s
+            """,
+            (job_id, first_task_id),
+        )
+        task_ids_by_archive_id = {archive_id: task_id for task_id, archive_id in cursor.fetchall()}
     db_conn.commit()
-    return task_ids
+    return [task_ids_by_archive_id[archive_id] for archive_id in archive_ids]
 
 
 @exception_default_value(default=[])
@@ -513,6 +961,60 @@ def get_archives_for_search(
         return cursor.fetchall()
 
 
+@exception_default_value(default=[])
+def _get_archives_for_search_from_cache(
+    db_conn,
+    archive_time_range_caches: dict[str, ArchiveTimeRangeCache],
+    table_prefix: str,
+    search_config: SearchJobConfig,
+    archive_end_ts_lower_bound: int | None,
+    datasets: list[str] | None,
+):
+    """
+    Selects the archives for a search from the cached time ranges of the archives, after refreshing
+    the caches of the tables being searched.
+
+    :param db_conn:
+    :param archive_time_range_caches: [out] A map from archives table names to the caches of their
+        archives' time ranges. Caches are added for tables that aren't in the map.
+    :param table_prefix:
+    :param search_config:
+    :param archive_end_ts_lower_bound:
+    :param datasets: The datasets to search, or None if the storage engine doesn't support datasets.
+    :return: The same rows as `get_archives_for_search` (without the `dataset` column if `datasets`
+    is None).
+    """
+    archives_per_table = []
+    for dataset in [None] if datasets is None else datasets:
+        table = get_archives_table_name(table_prefix, dataset)
+        cache = archive_time_range_caches.get(table)
+        if cache is None:
+            cache = ArchiveTimeRangeCache(table)
+            archive_time_range_caches[table] = cache
+        cache.refresh(db_conn)
+
+        archives = cache.get_archives_for_search(
+            search_config.begin_timestamp, search_config.end_timestamp, archive_end_ts_lower_bound
+        )
+        if dataset is None:
+            archives_per_table.append(
+                [
+                    {"archive_id": archive_id, "end_timestamp": end_timestamp}
+                    for archive_id, end_timestamp in archives
+                ]
+            )
+        else:
+            archives_per_table.append(
+                [
+                    {"archive_id": archive_id, "end_timestamp": end_timestamp, "dataset": dataset}
+                    for archive_id, end_timestamp in archives
+                ]
+            )
+    return list(
+        heapq.merge(*archives_per_table, key=lambda archive: archive["end_timestamp"], reverse=True)
+    )
+
+
 def get_archive_and_file_split_ids_for_ir_extraction(
     db_conn,
     table_prefix: str,
@@ -589,6 +1091,7 @@ def get_task_group_for_job(
     job: QueryJob,
     clp_metadata_db_conn_params: dict[str, any],
     results_cache_uri: str,
+    dispatch_time: float,
 ):
     job_type = job.get_type()
     if QueryJobType.SEARCH_OR_AGGREGATION == job_type:
@@ -601,6 +1104,7 @@ def get_task_group_for_job(
                 dataset=archives[i].get("dataset"),
                 clp_metadata_db_conn_params=clp_metadata_db_conn_params,
                 results_cache_uri=results_cache_uri,
+                dispatch_time=dispatch_time,
             )
             for i in range(len(archives))
         )
@@ -614,6 +1118,7 @@ def get_task_group_for_job(
                 dataset=archives[i].get("dataset"),
                 clp_metadata_db_conn_params=clp_metadata_db_conn_params,
                 results_cache_uri=results_cache_uri,
+                dispatch_time=dispatch_time,
             )
             for i in range(len(archives))
         )
@@ -628,10 +1133,16 @@ def dispatch_query_job(
     archives: list[dict],
     clp_metadata_db_conn_params: dict[str, any],
     results_cache_uri: str,
+    priority: int | None,
 ) -> None:
     global active_jobs
     archive_ids = [a["archive_id"] for a in archives]
+    task_insert_start_time = time.monotonic()
     task_ids = insert_query_tasks_into_db(db_conn, job.id, archive_ids)
+    task_enqueue_start_time = time.monotonic()
+    record_stage_duration(
+        job, QueryStage.TASK_INSERT, task_enqueue_start_time - task_insert_start_time
+    )
 
     task_group = get_task_group_for_job(
         archives,
@@ -639,56 +1150,105 @@ def dispatch_query_job(
         job,
         clp_metadata_db_conn_params,
         results_cache_uri,
+        time.time(),
     )
-    job.current_sub_job_async_task_result = task_group.apply_async()
+    job.current_sub_job_async_task_result = task_group.apply_async(priority=priority)
+    record_stage_duration(job, QueryStage.TASK_ENQUEUE, time.monotonic() - task_enqueue_start_time)
     job.state = InternalJobState.RUNNING
 
 
+async def _assign_job_to_reducers(
+    job: SearchJob, reducers: list[tuple[str, int, ReducerHandlerMessageQueues]]
+) -> tuple[list[tuple[str, int, ReducerHandlerMessageQueues]], list[str]]:
+    """
+    Sends the job's config to the given reducers and waits for them to acknowledge it. If there's
+    more than one reducer, each is assigned a shard of the job's results, which it writes to a
+    separate collection.
+    :param job:
+    :param reducers: The host, port, and handler message queues of each reducer.
+    :return: A tuple of:
+    - The reducers that acknowledged the job.
+    - The names of the collections that those reducers write their results to, or an empty list if
+      the job has a single reducer, which writes to the job's collection.
+    """
+    results_collection_names: list[str | None] = [None] * len(reducers)
+    if len(reducers) > 1:
+        results_collection_names = [
+            get_reducer_shard_collection_name(job.id, shard_idx)
+            for shard_idx in range(len(reducers))
+        ]
+    for (_, _, reducer_handler_msg_queues), results_collection_name in zip(
+        reducers, results_collection_names, strict=True
+    ):
+        msg = ReducerHandlerMessage(
+            ReducerHandlerMessageType.AGGREGATION_CONFIG,
+            ReducerJobConfig(job.search_config.aggregation_config, results_collection_name),
+        )
+        await reducer_handler_msg_queues.put_to_handler(msg)
+
+    acked_reducers = []
+    acked_results_collection_names = []
+    for reducer, results_collection_name in zip(reducers, results_collection_names, strict=True):
+        _, _, reducer_handler_msg_queues = reducer
+        msg = await reducer_handler_msg_queues.get_from_handler()
+        if msg.msg_type == ReducerHandlerMessageType.SUCCESS:
+            acked_reducers.append(reducer)
+            if results_collection_name is not None:
+                acked_results_collection_names.append(results_collection_name)
+        elif msg.msg_type != ReducerHandlerMessageType.FAILURE:
+            error_msg = f"Unexpected msg_type: {msg.msg_type.name}"
+            raise NotImplementedError(error_msg)
+    return acked_reducers, acked_results_collection_names
+
+
 async def acquire_reducer_for_job(job: SearchJob):
-    reducer_host: str | None = None
-    reducer_port: int | None = None
-    reducer_handler_msg_queues: ReducerHandlerMessageQueues | None = None
+    reducer_handshake_start_time = time.monotonic()
+    reducers: list[tuple[str, int, ReducerHandlerMessageQueues]] = []
+    results_collection_names: list[str] = []
     while True:
-        (
-            reducer_host,
-            reducer_port,
-            reducer_handler_msg_queues,
-        ) = await reducer_connection_queue.get()
+        reducers = [await reducer_connection_queue.get()]
+        # Any more shards are only assigned reducers that are idle, so that jobs never wait for each
+        # other's reducers (which could deadlock if jobs each held some of the reducers the others
+        # are waiting for).
+        while len(reducers) < max_reducer_shards_per_job and not reducer_connection_queue.empty():
+            reducers.append(reducer_connection_queue.get_nowait())
         """
-        Below, the task can either be cancelled before sending the job config to the reducer or
-        before the reducer acknowledges the job. If the task is cancelled before we send the job
-        config to the reducer, then we have two options:
+        Below, the task can either be cancelled before sending the job config to the reducers or
+        before the reducers acknowledge the job. If the task is cancelled before we send the job
+        config to the reducers, then we have two options:
 
-        1. Put the reducer's connection info back in the queue for another job to pick up.
-        2. Tell the reducer to restart its job handling loop.
+        1. Put the reducers' connection info back in the queue for another job to pick up.
+        2. Tell the reducers to restart their job handling loops.
 
-        If the task is cancelled after we've sent the job config to the reducer, then we have to
+        If the task is cancelled after we've sent the job config to the reducers, then we have to
         use option (2), so we use option (2) in both cases.
         """
         try:
-            msg = ReducerHandlerMessage(
-                ReducerHandlerMessageType.AGGREGATION_CONFIG, job.search_config.aggregation_config
-            )
-            await reducer_handler_msg_queues.put_to_handler(msg)
-
-            msg = await reducer_handler_msg_queues.get_from_handler()
-            if msg.msg_type == ReducerHandlerMessageType.SUCCESS:
+            reducers, results_collection_names = await _assign_job_to_reducers(job, reducers)
+            if len(reducers) > 0:
                 break
-            if msg.msg_type != ReducerHandlerMessageType.FAILURE:
-                error_msg = f"Unexpected msg_type: {msg.msg_type.name}"
-                raise NotImplementedError(error_msg)
         except asyncio.CancelledError:
-            msg = ReducerHandlerMessage(ReducerHandlerMessageType.FAILURE)
-            await reducer_handler_msg_queues.put_to_handler(msg)
+            for _, _, reducer_handler_msg_queues in reducers:
+                msg = ReducerHandlerMessage(ReducerHandlerMessageType.FAILURE)
+                await reducer_handler_msg_queues.put_to_handler(msg)
             raise
 
-    job.reducer_handler_msg_queues = reducer_handler_msg_queues
-    job.search_config.aggregation_config.reducer_host = reducer_host
-    job.search_config.aggregation_config.reducer_port = reducer_port
+    aggregation_config = job.search_config.aggregation_config
+    job.reducer_handler_msg_queues = [
+        reducer_handler_msg_queues for _, _, reducer_handler_msg_queues in reducers
+    ]
+    job.reducer_shard_collection_names = results_collection_names
+    aggregation_config.reducer_host, aggregation_config.reducer_port, _ = reducers[0]
+    if len(reducers) > 1:
+        aggregation_config.reducer_shard_addresses = [(host, port) for host, port, _ in reducers]
     job.state = InternalJobState.WAITING_FOR_DISPATCH
     job.reducer_acquisition_task = None
+    record_stage_duration(
+        job, QueryStage.REDUCER_HANDSHAKE, time.monotonic() - reducer_handshake_start_time
+    )
 
-    logger.info(f"Got reducer for job {job.id} at {reducer_host}:{reducer_port}")
+    reducer_addresses = ", ".join(f"{host}:{port}" for host, port, _ in reducers)
+    logger.info(f"Got reducer(s) for job {job.id} at {reducer_addresses}")
 
 
 def dispatch_job_and_update_db(
@@ -698,9 +1258,10 @@ def dispatch_job_and_update_db(
     clp_metadata_db_conn_params: dict[str, any],
     results_cache_uri: str,
     num_tasks: int,
+    priority: int | None,
 ) -> None:
     dispatch_query_job(
-        db_conn, new_job, target_archives, clp_metadata_db_conn_params, results_cache_uri
+        db_conn, new_job, target_archives, clp_metadata_db_conn_params, results_cache_uri, priority
     )
     start_time = datetime.datetime.now()
     if new_job.start_time is None:
@@ -724,7 +1285,13 @@ def handle_pending_query_jobs(
     num_archives_to_search_per_sub_job: int,
     max_datasets_per_query: int | None,
     existing_datasets: set[str],
+    archive_time_range_caches: dict[str, ArchiveTimeRangeCache] | None,
     archive_retention_period: int | None,
+    search_dispatch_mode: TaskDispatchMode,
+    scheduling_policy: QuerySchedulingPolicy,
+    max_concurrent_search_tasks: int,
+    adaptive_sub_job_sizing: bool,
+    max_archives_per_search_task: int,
     process_pool: concurrent.futures.ProcessPoolExecutor,
 ) -> list[asyncio.Task]:
     global active_jobs
@@ -746,6 +1313,9 @@ def handle_pending_query_jobs(
             job_type = job["type"]
             job_config = msgpack.unpackb(job["job_config"])
             job_creation_time = job["creation_time"].timestamp()
+            # Jobs that are waiting for a reducer are still pending, so they're fetched again
+            is_new_job = job_id not in active_jobs
+            intake_duration = max(0.0, time.time() - job_creation_time)
 
             table_prefix = clp_metadata_db_conn_params["table_prefix"]
 
@@ -759,6 +1329,7 @@ def handle_pending_query_jobs(
                     table_prefix=table_prefix,
                     max_datasets_per_query=max_datasets_per_query,
                     existing_datasets=existing_datasets,
+                    archive_time_range_caches=archive_time_range_caches,
                     archive_retention_period=archive_retention_period,
                     pending_search_jobs=pending_search_jobs,
                     reducer_acquisition_tasks=reducer_acquisition_tasks,
@@ -773,6 +1344,7 @@ def handle_pending_query_jobs(
                     results_cache_uri=results_cache_uri,
                     stream_collection_name=stream_collection_name,
                     clp_metadata_db_conn_params=clp_metadata_db_conn_params,
+                    scheduling_policy=scheduling_policy,
                 )
             else:
                 # NOTE: We're skipping the job for this iteration, but its status will remain
@@ -781,22 +1353,42 @@ def handle_pending_query_jobs(
                 logger.error(f"Unexpected job type: {job_type}, skipping job {job_id}")
                 continue
 
-        futures = []
+            if is_new_job:
+                record_stage_duration(active_jobs.get(job_id), QueryStage.INTAKE, intake_duration)
+
+        if QuerySchedulingPolicy.FAIR_SHARE == scheduling_policy:
+            # Dispatch fast-lane and higher-priority jobs first
+            pending_search_jobs.sort(
+                key=lambda job: (
+                    not is_fast_lane_search_job(job.search_config),
+                    -get_search_job_priority(job.search_config),
+                )
+            )
+        dispatch_sizes_by_job_id = _get_dispatch_sizes_by_job_id(
+            pending_search_jobs,
+            num_archives_to_search_per_sub_job,
+            scheduling_policy,
+            max_concurrent_search_tasks,
+            adaptive_sub_job_sizing,
+            max_archives_per_search_task,
+        )
+
+        num_in_flight_tasks_by_worker = _get_num_in_flight_search_tasks_by_worker()
+        # Map from each dispatch's future to the batches of archives it dispatched and the workers
+        # they were routed to
+        archive_batches_and_worker_hostnames_by_future = {}
         for job in pending_search_jobs:
             job_id = job.id
-            if (
-                job.search_config.network_address is None
-                and len(job.remaining_archives_for_search) > num_archives_to_search_per_sub_job
-            ):
-                archives_for_search = job.remaining_archives_for_search[
-                    :num_archives_to_search_per_sub_job
-                ]
-                job.remaining_archives_for_search = job.remaining_archives_for_search[
-                    num_archives_to_search_per_sub_job:
-                ]
-            else:
-                archives_for_search = job.remaining_archives_for_search
-                job.remaining_archives_for_search = []
+            num_archives_to_dispatch, num_archives_per_task = dispatch_sizes_by_job_id[job_id]
+            if num_archives_to_dispatch <= 0:
+                if len(job.in_flight_search_tasks) > 0:
+                    # Wait for the job's in-flight searches to finish before refilling their slots
+                    job.state = InternalJobState.RUNNING
+                continue
+            archives_for_search = job.remaining_archives_for_search[:num_archives_to_dispatch]
+            job.remaining_archives_for_search = job.remaining_archives_for_search[
+                num_archives_to_dispatch:
+            ]
 
             if job.start_time is None:
                 job.start_time = datetime.datetime.now()
@@ -810,22 +1402,71 @@ def handle_pending_query_jobs(
                     num_tasks=job.num_archives_to_search,
                 )
 
-            futures.append(
-                process_pool.submit(
-                    DispatchExecutor.dispatch_job_and_update_db,
-                    job.get_cached_config_blob(),
-                    job.get_type(),
-                    job_id,
-                    archives_for_search,
+            archive_groups = [archives_for_search]
+            if search_task_router is not None:
+                # Only batch archives that have the same preferred worker
+                archive_groups = search_task_router.group_archives_by_preferred_worker(
+                    archives_for_search
+                )
+            archive_batches = [
+                archives[i : i + num_archives_per_task]
+                for archives in archive_groups
+                for i in range(0, len(archives), num_archives_per_task)
+            ]
+            worker_hostnames = [None] * len(archive_batches)
+            if search_task_router is not None:
+                worker_hostnames = search_task_router.route(
+                    archive_batches, num_in_flight_tasks_by_worker
                 )
+            future = process_pool.submit(
+                DispatchExecutor.dispatch_job_and_update_db,
+                job.get_cached_config_blob(),
+                job.get_type(),
+                job_id,
+                archive_batches,
+                worker_hostnames,
+                (
+                    get_search_job_priority(job.search_config)
+                    if QuerySchedulingPolicy.FAIR_SHARE == scheduling_policy
+                    else None
+                ),
+            )
+            archive_batches_and_worker_hostnames_by_future[future] = (
+                archive_batches,
+                worker_hostnames,
             )
 
-        for future in concurrent.futures.as_completed(futures):
-            job_id, num_archives_for_search, group_result_id = future.result()
+        for future in concurrent.futures.as_completed(
+            archive_batches_and_worker_hostnames_by_future
+        ):
+            (
+                job_id,
+                num_archives_for_search,
+                group_result_id,
+                task_insert_duration,
+                task_enqueue_duration,
+            ) = future.result()
             job = active_jobs[job_id]
-            job.current_sub_job_async_task_result = celery.result.GroupResult.restore(
-                group_result_id, app=app
-            )
+            record_stage_duration(job, QueryStage.TASK_INSERT, task_insert_duration)
+            record_stage_duration(job, QueryStage.TASK_ENQUEUE, task_enqueue_duration)
+            group_result = celery.result.GroupResult.restore(group_result_id, app=app)
+            archive_batches, worker_hostnames = archive_batches_and_worker_hostnames_by_future[
+                future
+            ]
+            if TaskDispatchMode.SLIDING_WINDOW == search_dispatch_mode:
+                job.in_flight_search_tasks.extend(
+                    InFlightSearchTask(
+                        archives=archives,
+                        async_task_result=async_task_result,
+                        worker_hostname=worker_hostname,
+                    )
+                    for archives, worker_hostname, async_task_result in zip(
+                        archive_batches, worker_hostnames, group_result.results, strict=True
+                    )
+                )
+            else:
+                job.current_sub_job_async_task_result = group_result
+                job.current_sub_job_worker_hostnames = worker_hostnames
             job.state = InternalJobState.RUNNING
             logger.info(
                 "Dispatched job %s with %d archives to search.", job_id, num_archives_for_search
@@ -834,47 +1475,450 @@ def handle_pending_query_jobs(
     return reducer_acquisition_tasks
 
 
+def _get_num_in_flight_search_tasks(job: SearchJob) -> int:
+    """
+    :param job:
+    :return: The number of search tasks the job has in flight. In batch dispatch mode, every task in
+    the job's current sub-job is counted until the whole sub-job finishes.
+    """
+    if job.current_sub_job_async_task_result is not None:
+        return len(job.current_sub_job_async_task_result.results)
+    return len(job.in_flight_search_tasks)
+
+
+def _get_num_in_flight_search_tasks_by_worker() -> dict[str, int]:
+    """
+    :return: A map from the hostname of each worker to the number of in-flight search tasks that
+    were routed to its direct queue.
+    """
+    num_in_flight_tasks_by_worker: dict[str, int] = {}
+    for job in active_jobs.values():
+        if QueryJobType.SEARCH_OR_AGGREGATION != job.get_type():
+            continue
+        if job.current_sub_job_async_task_result is not None:
+            worker_hostnames = job.current_sub_job_worker_hostnames
+        else:
+            worker_hostnames = [task.worker_hostname for task in job.in_flight_search_tasks]
+        for worker_hostname in worker_hostnames:
+            if worker_hostname is not None:
+                num_in_flight_tasks_by_worker[worker_hostname] = (
+                    num_in_flight_tasks_by_worker.get(worker_hostname, 0) + 1
+                )
+    return num_in_flight_tasks_by_worker
+
+
+async def handle_query_worker_discovery(task_router: SearchTaskRouter) -> None:
+    """
+    Periodically discovers the query workers and their concurrency for routing search tasks.
+
+    :param task_router:
+    """
+    num_workers: int | None = None
+    while True:
+        try:
+            concurrency_by_worker = await asyncio.to_thread(
+                get_query_worker_concurrencies, app, QUERY_TASK_QUEUE_NAME
+            )
+            departed_query_worker_hostnames.difference_update(concurrency_by_worker.keys())
+            for worker_hostname in task_router.update_workers(concurrency_by_worker):
+                logger.warning(f"Query worker {worker_hostname} departed.")
+                departed_query_worker_hostnames.add(worker_hostname)
+                try:
+                    await asyncio.to_thread(delete_worker_direct_queue, app, worker_hostname)
+                except Exception:
+                    logger.exception(f"Failed to delete {worker_hostname}'s direct queue.")
+            if len(concurrency_by_worker) != num_workers:
+                num_workers = len(concurrency_by_worker)
+                logger.info(f"Routing search tasks across {num_workers} query worker(s).")
+        except Exception:
+            logger.exception("Failed to discover query workers.")
+        await asyncio.sleep(WORKER_DISCOVERY_INTERVAL)
+
+
+def render_query_scheduler_metrics() -> str:
+    """
+    :return: The scheduler's metrics, including the jobs that are currently in flight, in the
+    Prometheus text format.
+    """
+    num_jobs_by_state = {state.name.lower(): 0 for state in InternalJobState}
+    num_in_flight_search_tasks = 0
+    for job in active_jobs.values():
+        num_jobs_by_state[job.state.name.lower()] += 1
+        if isinstance(job, SearchJob):
+            num_in_flight_search_tasks += _get_num_in_flight_search_tasks(job)
+    return query_scheduler_metrics.render(num_jobs_by_state, num_in_flight_search_tasks)
+
+
+def _get_dispatch_sizes_by_job_id(
+    pending_search_jobs: list[SearchJob],
+    num_archives_to_search_per_sub_job: int,
+    scheduling_policy: QuerySchedulingPolicy,
+    max_concurrent_search_tasks: int,
+    adaptive_sub_job_sizing: bool,
+    max_archives_per_search_task: int,
+) -> dict[str, tuple[int, int]]:
+    """
+    Allocates search task slots to the pending search jobs. Each job's demand is counted in tasks
+    (i.e., its wanted archives divided into batches of the number of archives each of its tasks
+    should search), like the slots and the tasks in flight.
+
+    :param pending_search_jobs:
+    :param num_archives_to_search_per_sub_job:
+    :param scheduling_policy:
+    :param max_concurrent_search_tasks:
+    :param adaptive_sub_job_sizing: Whether to size each job's sub-jobs based on its progress rather
+        than using `num_archives_to_search_per_sub_job`.
+    :param max_archives_per_search_task:
+    :return: A map from the IDs of the pending search jobs to a tuple of:
+    - The number of archives the job should dispatch for search.
+    - The number of archives each of the job's tasks should search.
+    """
+    num_free_slots: int | None = None
+    if QueryScheduler.UNLIMITED_CONCURRENT_SEARCH_TASKS != max_concurrent_search_tasks:
+        num_in_flight_tasks = sum(
+            _get_num_in_flight_search_tasks(job)
+            for job in active_jobs.values()
+            if QueryJobType.SEARCH_OR_AGGREGATION == job.get_type()
+        )
+        num_free_slots = max(0, max_concurrent_search_tasks - num_in_flight_tasks)
+
+    demands = []
+    # Map from each job's ID to the number of archives it wants to dispatch and the number of
+    # archives each of its tasks should search
+    archive_demands_by_job_id = {}
+    for job in pending_search_jobs:
+        num_in_flight_tasks = len(job.in_flight_search_tasks)
+        num_in_flight_archives = sum(len(task.archives) for task in job.in_flight_search_tasks)
+        num_remaining_archives = len(job.remaining_archives_for_search)
+        if job.search_config.network_address is None:
+            sub_job_size = num_archives_to_search_per_sub_job
+            if adaptive_sub_job_sizing:
+                sub_job_size = _get_adaptive_sub_job_size(
+                    job, num_archives_to_search_per_sub_job, num_free_slots
+                )
+            # In sliding-window dispatch mode, only refill the slots of the searches that have
+            # finished.
+            num_archives_wanted = min(num_remaining_archives, sub_job_size - num_in_flight_archives)
+        else:
+            num_archives_wanted = num_remaining_archives
+        num_archives_wanted = max(0, num_archives_wanted)
+        num_archives_per_task = get_num_archives_per_search_task(
+            num_archives_wanted,
+            num_archives_to_search_per_sub_job,
+            job.mean_archive_search_duration,
+            max_archives_per_search_task,
+        )
+        archive_demands_by_job_id[job.id] = (num_archives_wanted, num_archives_per_task)
+        num_tasks_wanted = math.ceil(num_archives_wanted / num_archives_per_task)
+        demands.append(
+            SearchJobDemand(
+                job_id=job.id,
+                priority=get_search_job_priority(job.search_config),
+                is_fast_lane=is_fast_lane_search_job(job.search_config),
+                num_in_flight_tasks=num_in_flight_tasks,
+                num_tasks_wanted=num_tasks_wanted,
+            )
+        )
+
+    if QuerySchedulingPolicy.FIFO == scheduling_policy:
+        # Only the fair-share policy limits the number of search tasks in flight
+        num_free_slots = None
+    num_tasks_by_job_id = allocate_search_task_slots(demands, num_free_slots)
+    dispatch_sizes_by_job_id = {}
+    for job in pending_search_jobs:
+        num_archives_wanted, num_archives_per_task = archive_demands_by_job_id[job.id]
+        num_archives_to_dispatch = min(
+            num_archives_wanted, num_tasks_by_job_id[job.id] * num_archives_per_task
+        )
+        dispatch_sizes_by_job_id[job.id] = (num_archives_to_dispatch, num_archives_per_task)
+    return dispatch_sizes_by_job_id
+
+
+def _get_adaptive_sub_job_size(
+    job: SearchJob, num_archives_to_search_per_sub_job: int, num_free_slots: int | None
+) -> int:
+    """
+    :param job:
+    :param num_archives_to_search_per_sub_job:
+    :param num_free_slots: The number of search task slots that aren't in use, or None if unknown.
+    :return: The number of archives the job should search in its next sub-job (or, in
+    sliding-window dispatch mode, keep in flight).
+    """
+    latest_results_tracker = job.latest_results_tracker
+    if latest_results_tracker is None:
+        return get_exhaustive_search_sub_job_size(
+            num_archives_to_search_per_sub_job, job.mean_archive_search_duration, num_free_slots
+        )
+    if latest_results_tracker.has_missing_summaries():
+        return num_archives_to_search_per_sub_job
+
+    num_archives_ending_after_bound = None
+    bound = latest_results_tracker.get_kth_latest_timestamp_lower_bound()
+    if bound is not None:
+        # The remaining archives are sorted by end timestamp in descending order, and the sub-job's
+        # size is capped at `num_archives_to_search_per_sub_job` anyway.
+        num_archives_ending_after_bound = 0
+        for archive in job.remaining_archives_for_search[:num_archives_to_search_per_sub_job]:
+            if archive["end_timestamp"] <= bound:
+                break
+            num_archives_ending_after_bound += 1
+    return get_latest_results_search_sub_job_size(
+        num_archives_to_search_per_sub_job,
+        job.search_config.max_num_results,
+        latest_results_tracker.get_num_results(),
+        job.num_archives_searched,
+        num_archives_ending_after_bound,
+        num_free_slots,
+    )
+
+
 def try_getting_task_result(async_task_result):
     if not async_task_result.ready():
         return None
     return async_task_result.get(interval=0.005)
 
 
+def _check_for_stranded_search_tasks(job: SearchJob) -> None:
+    """
+    Checks whether any of the job's unfinished search tasks were routed to the direct queue of a
+    worker that departed, in which case they'll never run.
+
+    :param job:
+    :raise ValueError: If any of the job's search tasks are stranded.
+    """
+    if 0 == len(departed_query_worker_hostnames):
+        return
+    if job.current_sub_job_async_task_result is not None:
+        tasks = zip(
+            job.current_sub_job_worker_hostnames,
+            job.current_sub_job_async_task_result.results,
+            strict=True,
+        )
+    else:
+        tasks = (
+            (task.worker_hostname, task.async_task_result) for task in job.in_flight_search_tasks
+        )
+    for worker_hostname, async_task_result in tasks:
+        if worker_hostname in departed_query_worker_hostnames and not async_task_result.ready():
+            raise ValueError(
+                f"Search tasks were stranded on departed query worker {worker_hostname}"
+            )
+
+
+def try_getting_finished_in_flight_search_task_results(job: SearchJob) -> list[Any] | None:
+    """
+    Removes the search tasks that have finished from the job's in-flight tasks (in sliding-window
+    dispatch mode).
+    :param job:
+    :return: The finished tasks' results, or None if no task has finished.
+    """
+    finished_tasks = []
+    in_flight_tasks = []
+    for task in job.in_flight_search_tasks:
+        if task.async_task_result.ready():
+            finished_tasks.append(task)
+        else:
+            in_flight_tasks.append(task)
+    if len(finished_tasks) == 0:
+        return None
+
+    job.in_flight_search_tasks = in_flight_tasks
+    return [task.async_task_result.get(interval=0.005) for task in finished_tasks]
+
+
 def found_max_num_latest_results(
-    results_cache_uri: str,
     job_id: str,
     max_num_results: int,
     max_timestamp_in_remaining_archives: int,
 ) -> bool:
-    with pymongo.MongoClient(results_cache_uri) as results_cache_client:
-        results_cache_collection = results_cache_client.get_default_database()[job_id]
-        results_count = results_cache_collection.count_documents({})
-        if results_count < max_num_results:
-            return False
+    results_cache_collection = results_cache_client.get_default_database()[job_id]
+    results_count = results_cache_collection.count_documents({})
+    if results_count < max_num_results:
+        return False
+
+    results = list(
+        results_cache_collection.find(
+            projection=["timestamp"],
+            sort=[("timestamp", pymongo.DESCENDING)],
+            limit=max_num_results,
+        )
+        .sort("timestamp", pymongo.ASCENDING)
+        .limit(1)
+    )
+    min_timestamp_in_top_results = 0 if len(results) == 0 else results[0]["timestamp"]
+    return max_timestamp_in_remaining_archives <= min_timestamp_in_top_results
 
-        results = list(
-            results_cache_collection.find(
-                projection=["timestamp"],
-                sort=[("timestamp", pymongo.DESCENDING)],
-                limit=max_num_results,
-            )
-            .sort("timestamp", pymongo.ASCENDING)
-            .limit(1)
+
+def results_collection_exists(job_id: str) -> bool:
+    """
+    :param job_id:
+    :return: Whether the job's results collection exists in the results cache.
+    """
+    results_cache_db = results_cache_client.get_default_database()
+    return len(results_cache_db.list_collection_names(filter={"name": job_id})) > 0
+
+
+def reuse_search_results(job: SearchJob, reusable_results: ReusableSearchResults) -> bool:
+    """
+    Copies the results of an earlier search with the same fingerprint into the job's results
+    collection, and removes the archives those results cover from the archives the job still needs
+    to search.
+
+    :param job:
+    :param reusable_results:
+    :return: Whether the results were reused. They can't be if they cover an archive that the job
+    wouldn't search (e.g., because the archive has since been deleted), or if their results
+    collection no longer exists (e.g., because a client cleared it).
+    """
+    if not reusable_results.archive_ids <= job.results_archive_ids:
+        return False
+
+    reused_job_id = reusable_results.job_id
+    results_cache_db = results_cache_client.get_default_database()
+    job_results_collection = results_cache_db[job.id]
+    remaining_archives_for_search = [
+        archive
+        for archive in job.remaining_archives_for_search
+        if archive["archive_id"] not in reusable_results.archive_ids
+    ]
+    try:
+        if not results_collection_exists(reused_job_id):
+            reusable_search_results_cache.remove(job.results_fingerprint, reused_job_id)
+            return False
+        # Copy the results without their IDs so that the copies get new IDs, which the results
+        # garbage collector uses to determine when they were written.
+        results_cache_db[reused_job_id].aggregate(
+            [
+                {"$project": {"_id": 0}},
+                {"$merge": {"into": job.id, "whenNotMatched": "insert"}},
+            ]
         )
-        min_timestamp_in_top_results = 0 if len(results) == 0 else results[0]["timestamp"]
-        return max_timestamp_in_remaining_archives <= min_timestamp_in_top_results
+        # The results collection may have been deleted while it was being copied
+        if not results_collection_exists(reused_job_id):
+            reusable_search_results_cache.remove(job.results_fingerprint, reused_job_id)
+            job_results_collection.delete_many({})
+            return False
 
+        if job.latest_results_tracker is not None:
+            num_results = job_results_collection.count_documents({})
+            if num_results > 0:
+                earliest_result = job_results_collection.find_one(
+                    projection=["timestamp"], sort=[("timestamp", pymongo.ASCENDING)]
+                )
+                job.latest_results_tracker.add_summary(num_results, earliest_result["timestamp"])
+            # Archives are sorted by their end timestamps in descending order
+            if len(remaining_archives_for_search) > 0:
+                max_timestamp_in_remaining_archives = remaining_archives_for_search[0][
+                    "end_timestamp"
+                ]
+                if job.latest_results_tracker.found_max_num_latest_results(
+                    max_timestamp_in_remaining_archives
+                ):
+                    remaining_archives_for_search = []
+    except pymongo.errors.PyMongoError:
+        logger.exception(f"Failed to reuse the results of job {reused_job_id} for job {job.id}.")
+        with contextlib.suppress(pymongo.errors.PyMongoError):
+            job_results_collection.delete_many({})
+        return False
+
+    logger.info(
+        f"Reused the results of job {reused_job_id} for job {job.id}, which needs to search"
+        f" {len(remaining_archives_for_search)} more archive(s)."
+    )
+    job.remaining_archives_for_search = remaining_archives_for_search
+    job.num_archives_to_search = len(remaining_archives_for_search)
+    return True
 
-async def handle_finished_search_job(
-    db_conn, job: SearchJob, task_results: Any | None, results_cache_uri: str
-) -> None:
+
+def _finish_search_job_with_reused_results(db_conn, job: SearchJob) -> None:
+    """
+    Marks a job that doesn't need to search any archive after reusing another job's results as
+    succeeded.
+    :param db_conn:
+    :param job:
+    """
+    global active_jobs
+
+    active_jobs.pop(job.id, None)
+    job.start_time = datetime.datetime.now()
+    if set_final_job_status(
+        db_conn,
+        job,
+        QueryJobStatus.SUCCEEDED,
+        QueryJobStatus.PENDING,
+        start_time=job.start_time,
+        num_tasks=0,
+        duration=0,
+    ):
+        logger.info(f"Completed job {job.id} with reused results.")
+        reusable_search_results_cache.add(job.results_fingerprint, job.id, job.results_archive_ids)
+
+
+def _get_in_flight_duplicate_search_job(job: SearchJob) -> SearchJob | None:
+    """
+    :param job:
+    :return: An in-flight job with the same fingerprint as the given job whose results will cover a
+    subset of the given job's archives, or None if there's no such job.
+    """
+    for other_job in active_jobs.values():
+        if (
+            isinstance(other_job, SearchJob)
+            and other_job.results_fingerprint == job.results_fingerprint
+            and InternalJobState.WAITING_FOR_DUPLICATE != other_job.state
+            and other_job.results_archive_ids <= job.results_archive_ids
+        ):
+            return other_job
+    return None
+
+
+def _release_duplicate_search_jobs(db_conn, job: SearchJob, succeeded: bool) -> None:
+    """
+    Lets the jobs that are waiting for the given job to finish proceed, reusing its results if it
+    succeeded.
+    :param db_conn:
+    :param job:
+    :param succeeded: Whether the given job succeeded.
+    """
+    reusable_results = ReusableSearchResults(job.id, job.results_archive_ids)
+    for duplicate_job_id in job.duplicate_job_ids:
+        duplicate_job = active_jobs.get(duplicate_job_id)
+        if duplicate_job is None or InternalJobState.WAITING_FOR_DUPLICATE != duplicate_job.state:
+            # The job was cancelled
+            continue
+        duplicate_job.state = InternalJobState.WAITING_FOR_DISPATCH
+        if (
+            succeeded
+            and reuse_search_results(duplicate_job, reusable_results)
+            and 0 == len(duplicate_job.remaining_archives_for_search)
+        ):
+            _finish_search_job_with_reused_results(db_conn, duplicate_job)
+    job.duplicate_job_ids = []
+
+
+def _get_archive_search_results(task_results: list[Any]) -> list[Any]:
+    """
+    :param task_results: The results of a job's finished search tasks.
+    :return: The result of each archive's search, since a task that searches several archives
+    returns a list of results.
+    """
+    archive_search_results = []
+    for task_result in task_results:
+        if isinstance(task_result, list):
+            archive_search_results.extend(task_result)
+        else:
+            archive_search_results.append(task_result)
+    return archive_search_results
+
+
+async def handle_finished_search_job(db_conn, job: SearchJob, task_results: Any | None) -> None:
     global active_jobs
 
     job_id = job.id
-    is_reducer_job = job.reducer_handler_msg_queues is not None
+    is_reducer_job = len(job.reducer_handler_msg_queues) > 0
     new_job_status = QueryJobStatus.RUNNING
-    for task_result_obj in task_results:
+    for task_result_obj in _get_archive_search_results(task_results):
         task_result = QueryTaskResult.model_validate(task_result_obj)
+        record_task_metrics(job, task_result)
         task_id = task_result.task_id
         task_status = task_result.status
         if not task_status == QueryTaskStatus.SUCCEEDED:
@@ -889,25 +1933,58 @@ async def handle_finished_search_job(
                 f"Search task job-{job_id}-task-{task_id} succeeded in "
                 f"{task_result.duration} second(s)."
             )
+            archive_search_duration = task_result.execution_duration
+            if archive_search_duration is None:
+                archive_search_duration = task_result.duration
+            job.mean_archive_search_duration = get_updated_mean_archive_search_duration(
+                job.mean_archive_search_duration, archive_search_duration
+            )
+            if job.latest_results_tracker is not None:
+                results_summary = task_result.results_summary
+                if results_summary is None:
+                    job.latest_results_tracker.mark_summary_missing()
+                else:
+                    job.latest_results_tracker.add_summary(
+                        results_summary.num_results, results_summary.min_timestamp
+                    )
 
     if new_job_status != QueryJobStatus.FAILED:
         max_num_results = job.search_config.max_num_results
         # Check if we've searched all archives
-        if len(job.remaining_archives_for_search) == 0:
+        if len(job.remaining_archives_for_search) == 0 and len(job.in_flight_search_tasks) == 0:
             new_job_status = QueryJobStatus.SUCCEEDED
         # Check if we've reached max results
         elif False == is_reducer_job and max_num_results > 0:
-            if found_max_num_latest_results(
-                results_cache_uri,
-                job_id,
-                max_num_results,
-                job.remaining_archives_for_search[0]["end_timestamp"],
+            # Archives that are still being searched may contain later results than the remaining
+            # ones.
+            max_timestamp_in_unsearched_archives = max(
+                [
+                    archive["end_timestamp"]
+                    for task in job.in_flight_search_tasks
+                    for archive in task.archives
+                ]
+                + [archive["end_timestamp"] for archive in job.remaining_archives_for_search[:1]]
+            )
+            if (
+                job.latest_results_tracker is not None
+                and not job.latest_results_tracker.has_missing_summaries()
             ):
+                found_max_num_results = job.latest_results_tracker.found_max_num_latest_results(
+                    max_timestamp_in_unsearched_archives
+                )
+            else:
+                found_max_num_results = found_max_num_latest_results(
+                    job_id,
+                    max_num_results,
+                    max_timestamp_in_unsearched_archives,
+                )
+            if found_max_num_results:
                 new_job_status = QueryJobStatus.SUCCEEDED
     if new_job_status == QueryJobStatus.RUNNING:
         job.current_sub_job_async_task_result = None
-        job.state = InternalJobState.WAITING_FOR_DISPATCH
-        logger.info(f"Job {job_id} waiting for more archives to search.")
+        if len(job.remaining_archives_for_search) > 0:
+            job.state = InternalJobState.WAITING_FOR_DISPATCH
+            logger.info(f"Job {job_id} waiting for more archives to search.")
         set_job_or_task_status(
             db_conn,
             QUERY_JOBS_TABLE_NAME,
@@ -919,36 +1996,37 @@ async def handle_finished_search_job(
         return
 
     reducer_failed = False
-    if is_reducer_job:
-        # Notify reducer that it should have received all results
-        msg = ReducerHandlerMessage(ReducerHandlerMessageType.SUCCESS)
-        await job.reducer_handler_msg_queues.put_to_handler(msg)
+    if is_reducer_job and not await finish_reducer_job(job):
+        reducer_failed = True
+        new_job_status = QueryJobStatus.FAILED
 
-        msg = await job.reducer_handler_msg_queues.get_from_handler()
-        if ReducerHandlerMessageType.FAILURE == msg.msg_type:
-            reducer_failed = True
-            new_job_status = QueryJobStatus.FAILED
-        elif ReducerHandlerMessageType.SUCCESS != msg.msg_type:
-            error_msg = f"Unexpected msg_type: {msg.msg_type.name}"
-            raise NotImplementedError(error_msg)
+    if len(job.in_flight_search_tasks) > 0:
+        # The job finished early (or failed) in sliding-window dispatch mode, so cancel the searches
+        # that are still in flight.
+        revoke_in_flight_search_tasks(job)
+        _cancel_unfinished_query_tasks(db_conn, job_id)
 
     # We set the status regardless of the job's previous status to handle the case where the
     # job is cancelled (status = CANCELLING) while we're in this method.
-    if set_job_or_task_status(
+    if set_final_job_status(
         db_conn,
-        QUERY_JOBS_TABLE_NAME,
-        job_id,
+        job,
         new_job_status,
         num_tasks_completed=job.num_archives_searched,
         duration=(datetime.datetime.now() - job.start_time).total_seconds(),
     ):
         if new_job_status == QueryJobStatus.SUCCEEDED:
             logger.info(f"Completed job {job_id}.")
+            if job.results_fingerprint is not None:
+                reusable_search_results_cache.add(
+                    job.results_fingerprint, job_id, job.results_archive_ids
+                )
         elif reducer_failed:
             logger.error(f"Completed job {job_id} with failing reducer.")
         else:
             logger.info(f"Completed job {job_id} with failing tasks.")
     del active_jobs[job_id]
+    _release_duplicate_search_jobs(db_conn, job, QueryJobStatus.SUCCEEDED == new_job_status)
 
 
 async def handle_finished_stream_extraction_job(
@@ -969,6 +2047,7 @@ async def handle_finished_stream_extraction_job(
         new_job_status = QueryJobStatus.FAILED
     else:
         task_result = QueryTaskResult.model_validate(task_results[0])
+        record_task_metrics(job, task_result)
         task_id = task_result.task_id
         if not QueryTaskStatus.SUCCEEDED == task_result.status:
             logger.error(
@@ -981,11 +2060,14 @@ async def handle_finished_stream_extraction_job(
                 f"Extraction task job-{job_id}-task-{task_id} succeeded in "
                 f"{task_result.duration} second(s)."
             )
+            if QueryJobType.EXTRACT_IR == job.get_type():
+                extracted_stream_cache.add(IR_STREAM_ID_FIELD, job.get_config().file_split_id)
+            else:
+                extracted_stream_cache.add(JSON_STREAM_ID_FIELD, job.get_config().archive_id)
 
-    if set_job_or_task_status(
+    if set_final_job_status(
         db_conn,
-        QUERY_JOBS_TABLE_NAME,
-        job_id,
+        job,
         new_job_status,
         QueryJobStatus.RUNNING,
         num_tasks_completed=num_tasks,
@@ -1020,7 +2102,7 @@ async def handle_finished_stream_extraction_job(
     del active_jobs[job_id]
 
 
-async def check_job_status_and_update_db(db_conn_pool, results_cache_uri):
+async def check_job_status_and_update_db(db_conn_pool):
     global active_jobs
 
     with contextlib.closing(db_conn_pool.connect()) as db_conn:
@@ -1029,20 +2111,30 @@ async def check_job_status_and_update_db(db_conn_pool, results_cache_uri):
         ]:
             job = active_jobs[job_id]
             try:
-                returned_results = try_getting_task_result(job.current_sub_job_async_task_result)
+                if QueryJobType.SEARCH_OR_AGGREGATION == job.get_type():
+                    _check_for_stranded_search_tasks(job)
+                if job.current_sub_job_async_task_result is None:
+                    # The job is a search job in sliding-window dispatch mode
+                    returned_results = try_getting_finished_in_flight_search_task_results(job)
+                else:
+                    returned_results = try_getting_task_result(
+                        job.current_sub_job_async_task_result
+                    )
             except Exception as e:
                 logger.error(f"Job `{job_id}` failed: {e}.")
                 # Clean up
                 if QueryJobType.SEARCH_OR_AGGREGATION == job.get_type():
-                    if job.reducer_handler_msg_queues is not None:
-                        msg = ReducerHandlerMessage(ReducerHandlerMessageType.FAILURE)
-                        await job.reducer_handler_msg_queues.put_to_handler(msg)
+                    if len(job.in_flight_search_tasks) > 0:
+                        revoke_in_flight_search_tasks(job)
+                        _cancel_unfinished_query_tasks(db_conn, job_id)
+                    await release_reducer_for_job(job)
 
                 del active_jobs[job_id]
-                set_job_or_task_status(
+                if QueryJobType.SEARCH_OR_AGGREGATION == job.get_type():
+                    _release_duplicate_search_jobs(db_conn, job, False)
+                set_final_job_status(
                     db_conn,
-                    QUERY_JOBS_TABLE_NAME,
-                    job_id,
+                    job,
                     QueryJobStatus.FAILED,
                     QueryJobStatus.RUNNING,
                     duration=(datetime.datetime.now() - job.start_time).total_seconds(),
@@ -1054,20 +2146,18 @@ async def check_job_status_and_update_db(db_conn_pool, results_cache_uri):
             job_type = job.get_type()
             if QueryJobType.SEARCH_OR_AGGREGATION == job_type:
                 search_job: SearchJob = job
-                await handle_finished_search_job(
-                    db_conn, search_job, returned_results, results_cache_uri
-                )
+                await handle_finished_search_job(db_conn, search_job, returned_results)
             elif job_type in (QueryJobType.EXTRACT_JSON, QueryJobType.EXTRACT_IR):
                 await handle_finished_stream_extraction_job(db_conn, job, returned_results)
             else:
                 logger.error(f"Unexpected job type: {job_type}, skipping job {job_id}")
 
 
-async def handle_job_updates(db_conn_pool, results_cache_uri: str, jobs_poll_delay: float):
+async def handle_job_updates(db_conn_pool, jobs_poll_delay: float):
     while True:
         interval_start_time = datetime.datetime.now()
         await handle_cancelling_search_jobs(db_conn_pool)
-        await check_job_status_and_update_db(db_conn_pool, results_cache_uri)
+        await check_job_status_and_update_db(db_conn_pool)
         interval_end_time = datetime.datetime.now()
         await asyncio.sleep(
             jobs_poll_delay - (interval_end_time - interval_start_time).total_seconds()
@@ -1084,7 +2174,14 @@ async def handle_jobs(
     num_archives_to_search_per_sub_job: int,
     max_datasets_per_query: int | None,
     archive_retention_period: int | None,
+    search_dispatch_mode: TaskDispatchMode,
+    scheduling_policy: QuerySchedulingPolicy,
+    max_concurrent_search_tasks: int,
+    adaptive_sub_job_sizing: bool,
+    max_archives_per_search_task: int,
+    cache_archive_time_ranges: bool,
     scheduler_concurrency: int,
+    new_jobs_subscriber: AsyncJobNotificationSubscriber,
 ) -> None:
     with concurrent.futures.ProcessPoolExecutor(
         max_workers=scheduler_concurrency,
@@ -1092,11 +2189,16 @@ async def handle_jobs(
         initargs=(database_config, clp_metadata_db_conn_params, results_cache_uri),
     ) as process_pool:
         handle_updating_task = asyncio.create_task(
-            handle_job_updates(db_conn_pool, results_cache_uri, jobs_poll_delay)
+            handle_job_updates(db_conn_pool, jobs_poll_delay)
         )
 
         tasks = [handle_updating_task]
         existing_datasets: set[str] = set()
+        archive_time_range_caches: dict[str, ArchiveTimeRangeCache] | None = None
+        if cache_archive_time_ranges:
+            archive_time_range_caches = {}
+        # Subscribe before the first poll for pending jobs so that no new job is missed
+        await new_jobs_subscriber.subscribe()
         while True:
             reducer_acquisition_tasks = handle_pending_query_jobs(
                 db_conn_pool,
@@ -1106,11 +2208,19 @@ async def handle_jobs(
                 num_archives_to_search_per_sub_job,
                 max_datasets_per_query,
                 existing_datasets,
+                archive_time_range_caches,
                 archive_retention_period,
+                search_dispatch_mode,
+                scheduling_policy,
+                max_concurrent_search_tasks,
+                adaptive_sub_job_sizing,
+                max_archives_per_search_task,
                 process_pool,
             )
             if 0 == len(reducer_acquisition_tasks):
-                tasks.append(asyncio.create_task(asyncio.sleep(jobs_poll_delay)))
+                # Wake up as soon as a new job is submitted, or after the polling interval since not
+                # every client publishes notifications.
+                tasks.append(asyncio.create_task(new_jobs_subscriber.wait(jobs_poll_delay)))
             else:
                 tasks.extend(reducer_acquisition_tasks)
 
@@ -1127,6 +2237,11 @@ async def handle_jobs(
 
 async def main(argv: list[str]) -> int:
     global reducer_connection_queue
+    global max_reducer_shards_per_job
+    global results_cache_client
+    global job_notifications_redis_client
+    global reusable_search_results_cache
+    global search_task_router
 
     args_parser = argparse.ArgumentParser(description="Wait for and run query jobs.")
     args_parser.add_argument("--config", "-c", required=True, help="CLP configuration file.")
@@ -1149,6 +2264,23 @@ async def main(argv: list[str]) -> int:
         return -1
 
     reducer_connection_queue = asyncio.Queue(32)
+    max_reducer_shards_per_job = clp_config.reducer.max_shards_per_job
+    # NOTE: The client connects lazily and pools its connections, so it can be created before the
+    # results cache is reachable.
+    results_cache_client = pymongo.MongoClient(clp_config.results_cache.get_uri())
+    if clp_config.query_scheduler.reuse_search_results:
+        reusable_search_results_cache = ReusableSearchResultsCache()
+
+    async_job_notifications_redis_client = None
+    job_notifications_redis_config = load_job_notifications_redis_config(clp_config, logger)
+    if job_notifications_redis_config is not None:
+        job_notifications_redis_client = create_redis_client(job_notifications_redis_config)
+        async_job_notifications_redis_client = create_async_redis_client(
+            job_notifications_redis_config
+        )
+    new_jobs_subscriber = AsyncJobNotificationSubscriber(
+        async_job_notifications_redis_client, [QUERY_JOB_CREATED_CHANNEL], logger
+    )
 
     sql_adapter = SqlAdapter(clp_config.database)
 
@@ -1169,6 +2301,16 @@ async def main(argv: list[str]) -> int:
             clp_config.query_scheduler.host,
             clp_config.query_scheduler.port,
         )
+        if clp_config.query_scheduler.metrics_port is not None:
+            await start_metrics_server(
+                clp_config.query_scheduler.host,
+                clp_config.query_scheduler.metrics_port,
+                render_query_scheduler_metrics,
+                logger,
+            )
+            logger.info(
+                f"Serving metrics on port {clp_config.query_scheduler.metrics_port} at /metrics."
+            )
         db_conn_pool = sql_adapter.create_connection_pool(
             logger=logger, pool_size=2, disable_localhost_socket_connection=True
         )
@@ -1198,13 +2340,28 @@ async def main(argv: list[str]) -> int:
                 num_archives_to_search_per_sub_job=batch_size,
                 max_datasets_per_query=clp_config.query_scheduler.max_datasets_per_query,
                 archive_retention_period=clp_config.archive_output.retention_period,
+                search_dispatch_mode=clp_config.query_scheduler.search_dispatch_mode,
+                scheduling_policy=clp_config.query_scheduler.scheduling_policy,
+                max_concurrent_search_tasks=clp_config.query_scheduler.max_concurrent_search_tasks,
+                adaptive_sub_job_sizing=clp_config.query_scheduler.adaptive_sub_job_sizing,
+                max_archives_per_search_task=(
+                    clp_config.query_scheduler.max_archives_per_search_task
+                ),
+                cache_archive_time_ranges=clp_config.query_scheduler.cache_archive_time_ranges,
                 scheduler_concurrency=clp_config.query_scheduler.scheduler_concurrency,
+                new_jobs_subscriber=new_jobs_subscriber,
             )
         )
         reducer_handler = asyncio.create_task(reducer_handler.serve_forever())
-        done, pending = await asyncio.wait(
-            [job_handler, reducer_handler], return_when=asyncio.FIRST_COMPLETED
-        )
+        handler_tasks = [job_handler, reducer_handler]
+        worker_discovery_handler: asyncio.Task | None = None
+        if clp_config.query_scheduler.cache_affinity_routing:
+            search_task_router = SearchTaskRouter()
+            worker_discovery_handler = asyncio.create_task(
+                handle_query_worker_discovery(search_task_router)
+            )
+            handler_tasks.append(worker_discovery_handler)
+        done, pending = await asyncio.wait(handler_tasks, return_when=asyncio.FIRST_COMPLETED)
         if reducer_handler in done:
             logger.error("reducer_handler completed unexpectedly.")
             try:
@@ -1217,6 +2374,12 @@ async def main(argv: list[str]) -> int:
                 job_handler.result()
             except Exception:
                 logger.exception("job_handler failed.")
+        if worker_discovery_handler in done:
+            logger.error("worker_discovery_handler completed unexpectedly.")
+            try:
+                worker_discovery_handler.result()
+            except Exception:
+                logger.exception("worker_discovery_handler failed.")
     except Exception:
         logger.exception("Uncaught exception in job handling loop.")
 
@@ -1233,6 +2396,7 @@ def _handle_new_search_job(
     max_datasets_per_query: int | None,
     archive_retention_period: int | None,
     existing_datasets: set[str],
+    archive_time_range_caches: dict[str, ArchiveTimeRangeCache] | None,
     pending_search_jobs: list,
     reducer_acquisition_tasks: list[asyncio.Task],
 ) -> None:
@@ -1243,6 +2407,10 @@ def _handle_new_search_job(
     creates a reducer-acquisition task and appends it to `reducer_acquisition_tasks` (for
     aggregation jobs). Also registers the job in the global `active_jobs` dict.
 
+    If an in-flight job's results will cover a subset of the job's archives, the job waits for that
+    job to finish to reuse its results. Otherwise, the job reuses the cached results of any earlier
+    search with the same fingerprint, completing immediately if they cover all of its archives.
+
     On validation failure (empty/invalid datasets, no matching archives, etc.), marks the job as
     failed in the DB and returns without side effects.
 
@@ -1255,6 +2423,8 @@ def _handle_new_search_job(
     :param max_datasets_per_query:
     :param archive_retention_period:
     :param existing_datasets: [out] May be updated with newly fetched datasets.
+    :param archive_time_range_caches: [out] The caches of the archives' time ranges, which may be
+        refreshed or added to, or None if archives should be selected by querying the database.
     :param pending_search_jobs: [out] Appended with the new SearchJob on success.
     :param reducer_acquisition_tasks: [out] Appended with the reducer task for aggregation jobs.
     """
@@ -1328,7 +2498,17 @@ def _handle_new_search_job(
             job_creation_time - archive_retention_period * MIN_TO_SECONDS
         )
 
-    if datasets is None:
+    archive_selection_start_time = time.monotonic()
+    if archive_time_range_caches is not None:
+        archives_for_search = _get_archives_for_search_from_cache(
+            db_conn,
+            archive_time_range_caches,
+            table_prefix,
+            search_config,
+            archive_end_ts_lower_bound,
+            datasets,
+        )
+    elif datasets is None:
         # CLP-Text does not support datasets.
         archives_for_search = _get_archives_for_search_without_datasets(
             db_conn, table_prefix, search_config, archive_end_ts_lower_bound
@@ -1337,7 +2517,9 @@ def _handle_new_search_job(
         archives_for_search = get_archives_for_search(
             db_conn, table_prefix, search_config, archive_end_ts_lower_bound, datasets
         )
+    archive_selection_duration = time.monotonic() - archive_selection_start_time
     if len(archives_for_search) == 0:
+        record_stage_duration(None, QueryStage.ARCHIVE_SELECTION, archive_selection_duration)
         if set_job_or_task_status(
             db_conn,
             QUERY_JOBS_TABLE_NAME,
@@ -1359,6 +2541,34 @@ def _handle_new_search_job(
         num_archives_searched=0,
         remaining_archives_for_search=archives_for_search,
     )
+    record_stage_duration(new_search_job, QueryStage.ARCHIVE_SELECTION, archive_selection_duration)
+    if search_config.max_num_results > 0 and search_config.aggregation_config is None:
+        new_search_job.latest_results_tracker = LatestResultsTracker(search_config.max_num_results)
+
+    if reusable_search_results_cache is not None:
+        new_search_job.results_fingerprint = get_search_results_fingerprint(search_config)
+    if new_search_job.results_fingerprint is not None:
+        new_search_job.results_archive_ids = frozenset(
+            archive["archive_id"] for archive in archives_for_search
+        )
+        duplicate_job = _get_in_flight_duplicate_search_job(new_search_job)
+        if duplicate_job is not None:
+            logger.info(
+                "Job %s is waiting to reuse the results of job %s.", job_id, duplicate_job.id
+            )
+            new_search_job.state = InternalJobState.WAITING_FOR_DUPLICATE
+            duplicate_job.duplicate_job_ids.append(job_id)
+            active_jobs[job_id] = new_search_job
+            return
+
+        reusable_results = reusable_search_results_cache.get(new_search_job.results_fingerprint)
+        if (
+            reusable_results is not None
+            and reuse_search_results(new_search_job, reusable_results)
+            and 0 == len(new_search_job.remaining_archives_for_search)
+        ):
+            _finish_search_job_with_reused_results(db_conn, new_search_job)
+            return
 
     if search_config.aggregation_config is not None:
         new_search_job.search_config.aggregation_config.job_id = int(job_id)
@@ -1381,6 +2591,7 @@ def _handle_new_extraction_job(
     results_cache_uri: str,
     stream_collection_name: str,
     clp_metadata_db_conn_params: dict[str, any],
+    scheduling_policy: QuerySchedulingPolicy,
 ) -> None:
     """
     Validates and dispatches an IR or JSON stream extraction job.
@@ -1398,6 +2609,7 @@ def _handle_new_extraction_job(
     :param results_cache_uri:
     :param stream_collection_name:
     :param clp_metadata_db_conn_params:
+    :param scheduling_policy:
     """
     global active_jobs
 
@@ -1460,7 +2672,7 @@ def _handle_new_extraction_job(
         return
 
     # Check if a required stream file has already been extracted
-    if job_handle.is_stream_extracted(results_cache_uri, stream_collection_name):
+    if job_handle.is_stream_extracted(stream_collection_name):
         logger.info(
             "Stream %s already extracted, so mark job %s as succeeded.",
             job_handle.get_stream_id(),
@@ -1488,6 +2700,12 @@ def _handle_new_extraction_job(
         clp_metadata_db_conn_params,
         results_cache_uri,
         1,
+        # Extractions are interactive (e.g., viewing a search result in context)
+        (
+            TASK_QUEUE_HIGHEST_PRIORITY
+            if QuerySchedulingPolicy.FAIR_SHARE == scheduling_policy
+            else None
+        ),
     )
 
     job_handle.mark_job_as_waiting()
@@ -1,4 +1,5 @@
 import asyncio
+import contextlib
 import enum
 from enum import Enum
 from typing import Any
@@ -11,11 +12,17 @@ from job_orchestration.scheduler.job_config import AggregationConfig
 # Setup logging
 logger = get_logger("reducer_handler")
 
+# Max time (in seconds) to wait for a reducer to stop a cancelled job, i.e., to finish any write to
+# the results cache that's in progress and close its connection
+REDUCER_STOP_TIMEOUT = 5
+
 
 class ReducerHandlerMessageType(Enum):
     SUCCESS = enum.auto()
     FAILURE = enum.auto()
     AGGREGATION_CONFIG = enum.auto()
+    # Sent to the listener once the reducer has stopped a job that the listener cancelled
+    CANCELLED = enum.auto()
 
 
 class ReducerHandlerMessage:
@@ -24,6 +31,23 @@ class ReducerHandlerMessage:
         self.payload = payload
 
 
+class ReducerJobConfig:
+    """
+    Class to encapsulate the config of a job that's assigned to a reducer.
+    """
+
+    def __init__(
+        self, aggregation_config: AggregationConfig, results_collection_name: str | None = None
+    ):
+        """
+        :param aggregation_config:
+        :param results_collection_name: The name of the results cache collection the reducer should
+            write its results to, or None to write them to the job's collection.
+        """
+        self.aggregation_config = aggregation_config
+        self.results_collection_name = results_collection_name
+
+
 class ReducerHandlerMessageQueues:
     """
     Class to encapsulate the incoming and outgoing message queues for the reducer handler.
@@ -110,6 +134,41 @@ async def _send_msg_to_reducer(msg: bytes, writer: asyncio.StreamWriter):
     await writer.drain()
 
 
+async def _handle_cancellation(
+    recv_reducer_msg_task: asyncio.Task,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    msg_queues: ReducerHandlerMessageQueues,
+):
+    """
+    Tells the reducer to stop the job the listener cancelled by shutting down the connection's write
+    side, waits for the reducer to close the connection (which it only does between writes to the
+    results cache), and then tells the listener the reducer has stopped.
+
+    :param recv_reducer_msg_task: The pending task receiving a message from the reducer.
+    :param reader:
+    :param writer:
+    :param msg_queues:
+    """
+
+    async def wait_for_eof():
+        with contextlib.suppress(asyncio.IncompleteReadError):
+            await recv_reducer_msg_task
+        while len(await reader.read(4096)) > 0:
+            pass
+
+    try:
+        if writer.can_write_eof():
+            writer.write_eof()
+        await asyncio.wait_for(wait_for_eof(), REDUCER_STOP_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("Timed out waiting for the reducer to stop the cancelled job.")
+    except OSError:
+        # The connection was already closed
+        pass
+    await msg_queues.put_to_listeners(ReducerHandlerMessage(ReducerHandlerMessageType.CANCELLED))
+
+
 async def handle_reducer_connection(
     reader: asyncio.StreamReader,
     writer: asyncio.StreamWriter,
@@ -158,18 +217,19 @@ async def handle_reducer_connection(
                     await _handle_unexpected_msg_from_listener(
                         current_wait_state, msg.msg_type, msg_queues
                     )
-                aggregation_config: AggregationConfig = msg.payload
+                reducer_job_config: ReducerJobConfig = msg.payload
+                aggregation_config = reducer_job_config.aggregation_config
                 job_id = aggregation_config.job_id
                 time_bucket_size = aggregation_config.count_by_time_bucket_size
-                await _send_msg_to_reducer(
-                    msgpack.packb(
-                        {
-                            "job_id": job_id,
-                            "count_by_time_bucket_size": time_bucket_size,
-                        }
-                    ),
-                    writer,
-                )
+                job_config_msg = {
+                    "job_id": job_id,
+                    "count_by_time_bucket_size": time_bucket_size,
+                }
+                if reducer_job_config.results_collection_name is not None:
+                    job_config_msg["results_collection_name"] = (
+                        reducer_job_config.results_collection_name
+                    )
+                await _send_msg_to_reducer(msgpack.packb(job_config_msg), writer)
 
                 recv_listener_msg_task = asyncio.create_task(msg_queues.get_from_listeners())
                 current_wait_state = _ReducerHandlerWaitState.JOB_CONFIG_ACK
@@ -178,6 +238,9 @@ async def handle_reducer_connection(
                     msg: ReducerHandlerMessage = recv_listener_msg_task.result()
                     if ReducerHandlerMessageType.FAILURE == msg.msg_type:
                         # Listener requested cancellation
+                        await _handle_cancellation(
+                            recv_reducer_msg_task, reader, writer, msg_queues
+                        )
                         return
                     await _handle_unexpected_msg_from_listener(
                         current_wait_state, msg.msg_type, msg_queues
@@ -198,6 +261,7 @@ async def handle_reducer_connection(
                 msg: ReducerHandlerMessage = recv_listener_msg_task.result()
                 if ReducerHandlerMessageType.FAILURE == msg.msg_type:
                     # Listener requested cancellation
+                    await _handle_cancellation(recv_reducer_msg_task, reader, writer, msg_queues)
                     return
                 if ReducerHandlerMessageType.SUCCESS != msg.msg_type:
                     await _handle_unexpected_msg_from_listener(
@@ -215,6 +279,9 @@ async def handle_reducer_connection(
                     msg: ReducerHandlerMessage = recv_listener_msg_task.result()
                     if ReducerHandlerMessageType.FAILURE == msg.msg_type:
                         # Listener requested cancellation
+                        await _handle_cancellation(
+                            recv_reducer_msg_task, reader, writer, msg_queues
+                        )
                         return
                     await _handle_unexpected_msg_from_listener(
                         current_wait_state, msg.msg_type, msg_queues
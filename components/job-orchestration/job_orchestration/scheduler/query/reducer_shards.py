@@ -0,0 +1,81 @@
+"""
+Merging of the partial aggregation results of a job whose search results are partitioned across
+several reducer shards.
+
+Each shard writes its results to its own results cache collection, since the shards' results for
+the same group (e.g., the same time bucket) would otherwise overwrite each other. Once every shard
+has finished, the shards' results are merged into the job's collection by summing the counts of
+each group.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pymongo.database
+
+
+def get_reducer_shard_collection_name(job_id: str, shard_idx: int) -> str:
+    """
+    :param job_id:
+    :param shard_idx:
+    :return: The name of the results cache collection that the given reducer shard of the given job
+    writes its results to.
+    """
+    return f"{job_id}-reducer-shard-{shard_idx}"
+
+
+def merge_reducer_shard_results(
+    results_cache_db: pymongo.database.Database,
+    job_id: str,
+    shard_collection_names: list[str],
+    is_timeline_aggregation: bool,
+) -> None:
+    """
+    Merges the results of a job's reducer shards into the job's collection, replacing the
+    collection's contents, and then drops the shards' collections.
+
+    :param results_cache_db:
+    :param job_id:
+    :param shard_collection_names:
+    :param is_timeline_aggregation: Whether the job counts results by time bucket, in which case
+        each result is `{"timestamp": ..., "count": ...}`. Otherwise, each result is
+        `{"group_tags": [...], "records": [{"count": ...}]}`.
+    :raise: Propagates `pymongo`'s exceptions.
+    """
+    pipeline: list[dict[str, Any]] = [
+        {"$unionWith": {"coll": collection_name}} for collection_name in shard_collection_names[1:]
+    ]
+    if is_timeline_aggregation:
+        pipeline.extend(
+            (
+                {"$group": {"_id": "$timestamp", "count": {"$sum": "$count"}}},
+                {"$project": {"_id": 0, "timestamp": "$_id", "count": 1}},
+            )
+        )
+    else:
+        pipeline.extend(
+            (
+                {"$unwind": "$records"},
+                {"$group": {"_id": "$group_tags", "count": {"$sum": "$records.count"}}},
+                {"$project": {"_id": 0, "group_tags": "$_id", "records": [{"count": "$count"}]}},
+            )
+        )
+    pipeline.append({"$out": job_id})
+
+    results_cache_db[shard_collection_names[0]].aggregate(pipeline)
+    drop_reducer_shard_results(results_cache_db, shard_collection_names)
+
+
+def drop_reducer_shard_results(
+    results_cache_db: pymongo.database.Database, shard_collection_names: list[str]
+) -> None:
+    """
+    Drops the collections of a job's reducer shards.
+
+    :param results_cache_db:
+    :param shard_collection_names:
+    :raise: Propagates `pymongo`'s exceptions.
+    """
+    for collection_name in shard_collection_names:
+        results_cache_db.drop_collection(collection_name)
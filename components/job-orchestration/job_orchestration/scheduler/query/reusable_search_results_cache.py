@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from job_orchestration.scheduler.job_config import SearchJobConfig
+
+# Max number of searches whose results are cached for reuse
+REUSABLE_SEARCH_RESULTS_CACHE_MAX_SIZE = 1024
+
+
+@dataclass
+class ReusableSearchResults:
+    # ID of the job whose results collection contains the results
+    job_id: str
+    # IDs of the archives the results were searched from
+    archive_ids: frozenset[str]
+
+
+def get_search_results_fingerprint(search_config: SearchJobConfig) -> str | None:
+    """
+    :param search_config:
+    :return: A fingerprint of the parts of the search's config that determine its results, or None
+    if the search doesn't write its results to the results cache (so they can't be reused).
+    """
+    if (
+        search_config.aggregation_config is not None
+        or search_config.network_address is not None
+        or search_config.write_to_file
+    ):
+        return None
+
+    datasets = search_config.datasets
+    if datasets is not None:
+        datasets = sorted(set(datasets))
+    fingerprinted_fields = {
+        "datasets": datasets,
+        "query_string": search_config.query_string,
+        "max_num_results": search_config.max_num_results,
+        "begin_timestamp": search_config.begin_timestamp,
+        "end_timestamp": search_config.end_timestamp,
+        "ignore_case": search_config.ignore_case,
+        "path_filter": search_config.path_filter,
+    }
+    return hashlib.sha256(json.dumps(fingerprinted_fields, sort_keys=True).encode()).hexdigest()
+
+
+class ReusableSearchResultsCache:
+    """
+    An LRU cache of the searches whose results were written to the results cache, keyed by their
+    fingerprints (see `get_search_results_fingerprint`), so that a later search with the same
+    fingerprint can reuse the results rather than searching the same archives again.
+
+    Only the latest search with each fingerprint is cached. Since archives are immutable, a search's
+    results stay valid for as long as its results collection exists, which must be checked before
+    reusing them.
+    """
+
+    def __init__(self, max_size: int = REUSABLE_SEARCH_RESULTS_CACHE_MAX_SIZE) -> None:
+        """
+        :param max_size:
+        """
+        self.__max_size = max_size
+        # Ordered from least to most recently used
+        self.__results_by_fingerprint: OrderedDict[str, ReusableSearchResults] = OrderedDict()
+
+    def get(self, fingerprint: str) -> ReusableSearchResults | None:
+        """
+        :param fingerprint:
+        :return: The results of the latest search with the given fingerprint, or None if there are
+        none.
+        """
+        results = self.__results_by_fingerprint.get(fingerprint)
+        if results is not None:
+            self.__results_by_fingerprint.move_to_end(fingerprint)
+        return results
+
+    def add(self, fingerprint: str, job_id: str, archive_ids: frozenset[str]) -> None:
+        """
+        Caches a search's results, replacing those of any earlier search with the same fingerprint
+        and evicting the least recently used results if the cache is full.
+
+        :param fingerprint:
+        :param job_id:
+        :param archive_ids:
+        """
+        self.__results_by_fingerprint[fingerprint] = ReusableSearchResults(job_id, archive_ids)
+        self.__results_by_fingerprint.move_to_end(fingerprint)
+        if len(self.__results_by_fingerprint) > self.__max_size:
+            self.__results_by_fingerprint.popitem(last=False)
+
+    def remove(self, fingerprint: str, job_id: str) -> None:
+        """
+        Removes a search's results (e.g., because its results collection was deleted), unless
+        they've since been replaced by those of a later search.
+
+        :param fingerprint:
+        :param job_id:
+        """
+        results = self.__results_by_fingerprint.get(fingerprint)
+        if results is not None and results.job_id == job_id:
+            del self.__results_by_fingerprint[fingerprint]
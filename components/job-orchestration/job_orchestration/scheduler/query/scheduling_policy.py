@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+
+from job_orchestration.scheduler.constants import (
+    TASK_QUEUE_HIGHEST_PRIORITY,
+    TASK_QUEUE_LOWEST_PRIORITY,
+)
+from job_orchestration.scheduler.job_config import SearchJobConfig
+
+
+@dataclass
+class SearchJobDemand:
+    """The number of search tasks a job has in flight and wants to dispatch."""
+
+    job_id: str
+    priority: int
+    is_fast_lane: bool
+    num_in_flight_tasks: int
+    num_tasks_wanted: int
+
+
+def is_fast_lane_search_job(search_config: SearchJobConfig) -> bool:
+    """
+    Fast-lane jobs are interactive searches for a bounded number of the latest results (e.g., from
+    the WebUI or MCP server). Since they can terminate early after searching only the latest
+    archives, they're served before other jobs.
+
+    :param search_config:
+    :return: Whether the job should be scheduled in the fast lane.
+    """
+    return (
+        search_config.max_num_results > 0
+        and search_config.aggregation_config is None
+        and search_config.network_address is None
+    )
+
+
+def get_search_job_priority(search_config: SearchJobConfig) -> int:
+    """
+    :param search_config:
+    :return: The job's priority, which is also the priority of its tasks in the task queue. If the
+    job doesn't specify one, fast-lane jobs get the highest priority and other jobs get the lowest.
+    """
+    if search_config.priority is not None:
+        return search_config.priority
+    if is_fast_lane_search_job(search_config):
+        return TASK_QUEUE_HIGHEST_PRIORITY
+    return TASK_QUEUE_LOWEST_PRIORITY
+
+
+def allocate_search_task_slots(
+    demands: list[SearchJobDemand], num_free_slots: int | None
+) -> dict[str, int]:
+    """
+    Allocates free search task slots to jobs. Fast-lane jobs are allocated every slot they want,
+    even beyond the free slots, since their demand is bounded and they shouldn't wait for other
+    jobs' tasks to finish. Then, the remaining free slots are shared between the other jobs in
+    proportion to their priorities (weighted max-min fairness), counting the tasks each job already
+    has in flight.
+
+    :param demands:
+    :param num_free_slots: The number of free slots, or None if the number of slots is unlimited.
+    :return: A map from job IDs to the number of tasks each job may dispatch.
+    """
+    if num_free_slots is None:
+        return {demand.job_id: demand.num_tasks_wanted for demand in demands}
+
+    num_slots_by_job_id = {}
+    other_demands = []
+    for demand in demands:
+        if demand.is_fast_lane:
+            num_slots_by_job_id[demand.job_id] = demand.num_tasks_wanted
+            num_free_slots -= demand.num_tasks_wanted
+        else:
+            num_slots_by_job_id[demand.job_id] = 0
+            other_demands.append(demand)
+
+    # Min-heap of (weighted usage, index) so that the job using the smallest share of slots relative
+    # to its priority gets the next slot.
+    heap = [
+        (demand.num_in_flight_tasks / demand.priority, idx)
+        for idx, demand in enumerate(other_demands)
+        if demand.num_tasks_wanted > 0
+    ]
+    heapq.heapify(heap)
+    while num_free_slots > 0 and len(heap) > 0:
+        _, idx = heapq.heappop(heap)
+        demand = other_demands[idx]
+        num_slots = num_slots_by_job_id[demand.job_id] + 1
+        num_slots_by_job_id[demand.job_id] = num_slots
+        num_free_slots -= 1
+        if num_slots < demand.num_tasks_wanted:
+            heapq.heappush(heap, ((demand.num_in_flight_tasks + num_slots) / demand.priority, idx))
+    return num_slots_by_job_id
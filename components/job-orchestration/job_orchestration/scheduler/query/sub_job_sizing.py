@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import math
+
+# Max size of a sub-job, as a multiple of the configured `num_archives_to_search_per_sub_job`
+MAX_SUB_JOB_SIZE_MULTIPLIER = 8
+
+# Min time (in seconds) each of a job's `num_archives_to_search_per_sub_job` concurrent searches
+# should take to finish its share of a sub-job, so that the wait between sub-jobs is amortized
+TARGET_SUB_JOB_DURATION = 10
+
+# The first sub-job of a search for the latest results is `num_archives_to_search_per_sub_job`
+# divided by this, since it may find enough results to terminate early
+LATEST_RESULTS_INITIAL_SUB_JOB_SIZE_DIVISOR = 4
+
+# Min time (in seconds) a search task that searches several archives should take, so that the
+# task's overhead (e.g., loading the worker's config and updating the tasks' metadata) is amortized
+TARGET_SEARCH_TASK_DURATION = 1
+
+# Weight of each new observation in the moving average of a job's per-archive search duration
+ARCHIVE_SEARCH_DURATION_SMOOTHING_FACTOR = 0.3
+
+
+def get_updated_mean_archive_search_duration(
+    mean_archive_search_duration: float | None, archive_search_duration: float
+) -> float:
+    """
+    :param mean_archive_search_duration: The current exponential moving average, or None if no
+        archive search has finished yet.
+    :param archive_search_duration: The duration of an archive search that just finished.
+    :return: The updated exponential moving average.
+    """
+    if mean_archive_search_duration is None:
+        return archive_search_duration
+    return mean_archive_search_duration + ARCHIVE_SEARCH_DURATION_SMOOTHING_FACTOR * (
+        archive_search_duration - mean_archive_search_duration
+    )
+
+
+def get_exhaustive_search_sub_job_size(
+    base_size: int,
+    mean_archive_search_duration: float | None,
+    num_idle_task_slots: int | None,
+) -> int:
+    """
+    Sizes a sub-job of a job that must search every archive (e.g., an aggregation). Since every
+    sub-job waits for its slowest search before the next one is dispatched, sub-jobs grow when
+    archive searches are short so that the wait is amortized over more searches.
+
+    :param base_size: The configured `num_archives_to_search_per_sub_job`.
+    :param mean_archive_search_duration: The moving average of the job's archive search durations,
+        or None if none has finished yet.
+    :param num_idle_task_slots: The number of search task slots that aren't in use, or None if
+        unknown.
+    :return: The number of archives to search in the sub-job.
+    """
+    max_size = base_size * MAX_SUB_JOB_SIZE_MULTIPLIER
+    size = base_size
+    if mean_archive_search_duration is not None and mean_archive_search_duration > 0:
+        num_searches_per_slot = math.ceil(TARGET_SUB_JOB_DURATION / mean_archive_search_duration)
+        size = min(base_size * num_searches_per_slot, max_size)
+    if num_idle_task_slots is not None:
+        size = max(size, min(num_idle_task_slots, max_size))
+    return size
+
+
+def get_latest_results_search_sub_job_size(
+    base_size: int,
+    max_num_results: int,
+    num_results: int,
+    num_archives_searched: int,
+    num_archives_ending_after_bound: int | None,
+    num_idle_task_slots: int | None,
+) -> int:
+    """
+    Sizes a sub-job of a search for the latest `max_num_results` results, which terminates early
+    once it finds enough results. The sub-job is sized to search about as many archives as are
+    expected to contain the results the job still needs, based on the number of results found per
+    archive so far. Once the job has found enough results, it only needs to search the archives that
+    may contain later results than the ones it found, so the sub-job is sized to search those.
+    Idle task slots are used to search more archives, since that doesn't delay other jobs.
+
+    :param base_size: The configured `num_archives_to_search_per_sub_job`, which is also the max
+        size.
+    :param max_num_results:
+    :param num_results: The number of results found so far.
+    :param num_archives_searched:
+    :param num_archives_ending_after_bound: The number of archives left to search that end after the
+        lower bound on the timestamp of the job's `max_num_results`-th latest result, or None if
+        unknown (e.g., because the job hasn't found `max_num_results` results).
+    :param num_idle_task_slots: The number of search task slots that aren't in use, or None if
+        unknown.
+    :return: The number of archives to search in the sub-job.
+    """
+    min_size = math.ceil(base_size / LATEST_RESULTS_INITIAL_SUB_JOB_SIZE_DIVISOR)
+    if 0 == num_archives_searched:
+        size = min_size
+    elif 0 == num_results:
+        # Without any results to extrapolate from, double the number of archives searched
+        size = num_archives_searched
+    elif num_results >= max_num_results:
+        if num_archives_ending_after_bound is None:
+            size = base_size
+        else:
+            size = num_archives_ending_after_bound
+    else:
+        # The extrapolation is noisy when few results are still wanted, so it's floored at the
+        # size of the first sub-job rather than dispatching one archive at a time
+        num_results_wanted = max_num_results - num_results
+        size = max(min_size, math.ceil(num_results_wanted * num_archives_searched / num_results))
+    if num_idle_task_slots is not None:
+        size = max(size, num_idle_task_slots)
+    return max(1, min(size, base_size))
+
+
+def get_num_archives_per_search_task(
+    num_archives: int,
+    base_size: int,
+    mean_archive_search_duration: float | None,
+    max_archives_per_search_task: int,
+) -> int:
+    """
+    Determines how many archives each search task in a sub-job should search. Archives are only
+    batched into a task when their searches are short enough for the task's overhead to matter, and
+    never so much that the sub-job has fewer than `base_size` tasks that can run concurrently.
+
+    :param num_archives: The number of archives in the sub-job.
+    :param base_size: The configured `num_archives_to_search_per_sub_job`.
+    :param mean_archive_search_duration: The moving average of the job's archive search durations,
+        or None if none has finished yet.
+    :param max_archives_per_search_task:
+    :return: The number of archives per search task.
+    """
+    if mean_archive_search_duration is None:
+        return 1
+    num_archives_per_task = max_archives_per_search_task
+    if mean_archive_search_duration > 0:
+        num_archives_per_task = math.ceil(
+            TARGET_SEARCH_TASK_DURATION / mean_archive_search_duration
+        )
+    return max(
+        1, min(num_archives_per_task, max_archives_per_search_task, num_archives // base_size)
+    )
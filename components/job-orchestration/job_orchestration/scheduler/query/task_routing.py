@@ -0,0 +1,194 @@
+"""
+Routing of search tasks to the query workers that are likely to have the tasks' archives in their
+caches (the worker's archive cache and its node's page cache), so that repeated searches of the same
+archives hit warm caches.
+
+Archive IDs are mapped to workers by consistent hashing, so a worker joining or leaving only moves
+the archives that map to it. Each worker consumes its own direct queue (Celery's `worker_direct`)
+besides the shared query queue, and a task is only routed to its preferred worker's direct queue
+while that worker has an idle slot. Otherwise, the task goes to the shared queue, from which any
+idle worker takes (steals) it.
+
+Direct queues are durable, so the tasks in a worker's direct queue are stranded if the worker leaves
+(or is renamed). A worker that's missing from several consecutive discoveries is considered to have
+departed: its direct queue is deleted, and the scheduler fails the jobs with tasks that were routed
+to it and haven't finished.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+from collections.abc import Iterable
+from typing import Any
+
+from celery.utils import worker_direct
+
+# Number of points each worker has on the hash ring, which evens out the share of archives each
+# worker is preferred for
+NUM_VIRTUAL_NODES_PER_WORKER = 64
+
+# Interval (in seconds) at which the query workers and their concurrency are rediscovered
+WORKER_DISCOVERY_INTERVAL = 30
+
+# Timeout (in seconds) for the workers to reply to a discovery broadcast
+WORKER_DISCOVERY_TIMEOUT = 1.0
+
+# Number of consecutive discoveries a worker must be missing from before it's considered to have
+# departed, so that a worker that's slow to reply to a single discovery isn't
+NUM_MISSED_DISCOVERIES_BEFORE_DEPARTURE = 2
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.sha1(key.encode()).digest()[:8], "big")
+
+
+class ConsistentHashRing:
+    def __init__(
+        self, nodes: Iterable[str], num_virtual_nodes: int = NUM_VIRTUAL_NODES_PER_WORKER
+    ) -> None:
+        """
+        :param nodes:
+        :param num_virtual_nodes: The number of points each node has on the ring.
+        """
+        points = sorted(
+            (_hash(f"{node}#{i}"), node) for node in nodes for i in range(num_virtual_nodes)
+        )
+        self.__point_hashes = [point_hash for point_hash, _ in points]
+        self.__point_nodes = [node for _, node in points]
+
+    def get_node(self, key: str) -> str | None:
+        """
+        :param key:
+        :return: The node that owns the given key, or None if the ring is empty.
+        """
+        if 0 == len(self.__point_hashes):
+            return None
+        idx = bisect.bisect(self.__point_hashes, _hash(key)) % len(self.__point_hashes)
+        return self.__point_nodes[idx]
+
+
+class SearchTaskRouter:
+    """Routes search tasks to the direct queues of their archives' preferred workers."""
+
+    def __init__(self) -> None:
+        self.__concurrency_by_worker: dict[str, int] = {}
+        self.__ring = ConsistentHashRing([])
+        # Map from the hostname of each worker that was missing from the latest discoveries (but
+        # isn't yet considered to have departed) to the number of discoveries it was missing from
+        self.__num_missed_discoveries_by_worker: dict[str, int] = {}
+
+    def update_workers(self, concurrency_by_worker: dict[str, int]) -> set[str]:
+        """
+        Updates the workers that tasks are routed to. Tasks are no longer routed to a worker as soon
+        as it's missing from a discovery.
+
+        :param concurrency_by_worker: A map from the hostname of each query worker to the number of
+            tasks it can run concurrently.
+        :return: The hostnames of the workers that are now considered to have departed.
+        """
+        departed_workers = set()
+        for worker in (
+            self.__concurrency_by_worker.keys() | self.__num_missed_discoveries_by_worker.keys()
+        ):
+            if worker in concurrency_by_worker:
+                self.__num_missed_discoveries_by_worker.pop(worker, None)
+                continue
+            num_missed_discoveries = self.__num_missed_discoveries_by_worker.get(worker, 0) + 1
+            if num_missed_discoveries >= NUM_MISSED_DISCOVERIES_BEFORE_DEPARTURE:
+                self.__num_missed_discoveries_by_worker.pop(worker, None)
+                departed_workers.add(worker)
+            else:
+                self.__num_missed_discoveries_by_worker[worker] = num_missed_discoveries
+
+        if concurrency_by_worker.keys() != self.__concurrency_by_worker.keys():
+            self.__ring = ConsistentHashRing(concurrency_by_worker.keys())
+        self.__concurrency_by_worker = dict(concurrency_by_worker)
+        return departed_workers
+
+    def get_preferred_worker(self, archive_id: str) -> str | None:
+        """
+        :param archive_id:
+        :return: The hostname of the worker that should search the given archive, or None if no
+        worker is known.
+        """
+        return self.__ring.get_node(archive_id)
+
+    def group_archives_by_preferred_worker(
+        self, archives: list[dict[str, Any]]
+    ) -> list[list[dict[str, Any]]]:
+        """
+        :param archives:
+        :return: The archives grouped by their preferred workers, preserving their relative order
+        within each group.
+        """
+        archives_by_worker: dict[str | None, list[dict[str, Any]]] = {}
+        for archive in archives:
+            worker = self.get_preferred_worker(archive["archive_id"])
+            archives_by_worker.setdefault(worker, []).append(archive)
+        return list(archives_by_worker.values())
+
+    def route(
+        self,
+        archive_batches: list[list[dict[str, Any]]],
+        num_in_flight_tasks_by_worker: dict[str, int],
+    ) -> list[str | None]:
+        """
+        Routes each search task to the direct queue of the preferred worker of its first archive, if
+        the worker has an idle slot.
+
+        :param archive_batches: The archives each task searches.
+        :param num_in_flight_tasks_by_worker: The number of tasks that have been routed to each
+            worker and are still in flight, which is updated with the newly routed tasks.
+        :return: The hostname of the worker each task is routed to, or None if the task should go to
+        the shared queue.
+        """
+        worker_hostnames = []
+        for archives in archive_batches:
+            worker = self.get_preferred_worker(archives[0]["archive_id"])
+            if worker is not None:
+                num_in_flight_tasks = num_in_flight_tasks_by_worker.get(worker, 0)
+                if num_in_flight_tasks < self.__concurrency_by_worker[worker]:
+                    num_in_flight_tasks_by_worker[worker] = num_in_flight_tasks + 1
+                else:
+                    worker = None
+            worker_hostnames.append(worker)
+        return worker_hostnames
+
+
+def delete_worker_direct_queue(app: Any, worker_hostname: str) -> None:
+    """
+    Deletes a departed worker's direct queue, along with any tasks stranded in it. If the worker
+    rejoins, it redeclares the queue.
+
+    :param app: The Celery app.
+    :param worker_hostname:
+    :raise: Propagates `kombu`'s exceptions.
+    """
+    with app.connection_for_write() as connection:
+        connection.default_channel.queue_delete(worker_direct(worker_hostname).name)
+
+
+def get_query_worker_concurrencies(app: Any, query_queue_name: str) -> dict[str, int]:
+    """
+    Discovers the query workers by broadcasting to all workers connected to the broker.
+
+    NOTE: This blocks for up to `WORKER_DISCOVERY_TIMEOUT` seconds.
+
+    :param app: The Celery app.
+    :param query_queue_name:
+    :return: A map from the hostname of each worker that consumes the query queue to the number of
+    tasks it can run concurrently.
+    """
+    inspect = app.control.inspect(timeout=WORKER_DISCOVERY_TIMEOUT)
+    active_queues_by_worker = inspect.active_queues() or {}
+    stats_by_worker = inspect.stats() or {}
+    concurrency_by_worker = {}
+    for worker, queues in active_queues_by_worker.items():
+        if not any(query_queue_name == queue["name"] for queue in queues):
+            continue
+        stats = stats_by_worker.get(worker)
+        if stats is None:
+            continue
+        concurrency_by_worker[worker] = stats["pool"]["max-concurrency"]
+    return concurrency_by_worker
@@ -7,6 +7,7 @@ from typing import Any
 import msgpack
 from pydantic import BaseModel, ConfigDict, PrivateAttr
 
+from job_orchestration.scheduler.compress.path_discovery import StreamingPathDiscovery
 from job_orchestration.scheduler.compress.task_manager.task_manager import TaskManager
 from job_orchestration.scheduler.constants import (
     QueryJobType,
@@ -18,25 +19,33 @@ from job_orchestration.scheduler.job_config import (
     QueryJobConfig,
     SearchJobConfig,
 )
+from job_orchestration.scheduler.query.latest_results_tracker import LatestResultsTracker
 from job_orchestration.scheduler.query.reducer_handler import ReducerHandlerMessageQueues
 
 
 class CompressionJob(BaseModel):
-    # Allow the use of `TaskManager.ResultHandle`
+    # Allow the use of `TaskManager.ResultHandle` and `StreamingPathDiscovery`
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     id: int
     start_time: datetime.datetime
-    result_handle: TaskManager.ResultHandle
+    # Handles of the tasks that are currently in flight. In batch dispatch mode, this contains a
+    # single handle for the whole batch; in sliding-window dispatch mode, one handle per task.
+    result_handles: list[TaskManager.ResultHandle]
     num_tasks_total: int
     num_tasks_completed: int
     remaining_tasks: list[dict[str, Any]]
     remaining_partition_info: list[dict[str, Any]]
+    # Set while the job's input paths are still being discovered (see `streaming_path_discovery`)
+    path_discovery: StreamingPathDiscovery | None = None
 
 
 class InternalJobState(Enum):
     WAITING_FOR_REDUCER = auto()
     WAITING_FOR_DISPATCH = auto()
+    # Waiting for an in-flight job with the same search results fingerprint to finish, so that its
+    # results can be reused
+    WAITING_FOR_DUPLICATE = auto()
     RUNNING = auto()
 
 
@@ -45,6 +54,9 @@ class QueryJob(BaseModel, ABC):
     state: InternalJobState
     start_time: datetime.datetime | None = None
     current_sub_job_async_task_result: Any | None = None
+    # Total time (in seconds) the job has spent in each stage (see `QueryStage`), summed over its
+    # tasks for the stages that tasks go through
+    stage_durations: dict[str, float] = {}
     _cached_config_blob: bytes | None = PrivateAttr(default=None)
 
     @abstractmethod
@@ -79,6 +91,15 @@ class ExtractJsonJob(QueryJob):
         return self.extract_json_config
 
 
+class InFlightSearchTask(BaseModel):
+    # The archives the task searches
+    archives: list[dict[str, Any]]
+    async_task_result: Any
+    # Hostname of the worker whose direct queue the task was routed to, or None if the task was sent
+    # to the shared queue
+    worker_hostname: str | None = None
+
+
 class SearchJob(QueryJob):
     # To allow asyncio.Task and asyncio.Queue
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -87,8 +108,29 @@ class SearchJob(QueryJob):
     num_archives_to_search: int
     num_archives_searched: int
     remaining_archives_for_search: list[dict[str, Any]]
+    # The search tasks that are currently in flight, in the order they were dispatched. Only used in
+    # sliding-window dispatch mode.
+    in_flight_search_tasks: list[InFlightSearchTask] = []
+    # Hostnames of the workers that the tasks in the current sub-job were routed to (see
+    # `InFlightSearchTask.worker_hostname`). Only used in batch dispatch mode.
+    current_sub_job_worker_hostnames: list[str | None] = []
+    # Set for jobs that search for a bounded number of the latest results
+    latest_results_tracker: LatestResultsTracker | None = None
+    # Exponential moving average of the time (in seconds) the job's archive searches take
+    mean_archive_search_duration: float | None = None
     reducer_acquisition_task: asyncio.Task | None = None
-    reducer_handler_msg_queues: ReducerHandlerMessageQueues | None = None
+    # The message queues of the handlers of the job's reducers, one per shard of the job's results
+    reducer_handler_msg_queues: list[ReducerHandlerMessageQueues] = []
+    # Names of the collections that the job's reducer shards write their results to, which are
+    # merged into the job's collection once the job finishes. Empty if the job has a single reducer,
+    # which writes to the job's collection directly.
+    reducer_shard_collection_names: list[str] = []
+    # Set for jobs whose results can be reused (see `get_search_results_fingerprint`)
+    results_fingerprint: str | None = None
+    # IDs of the archives the job's results cover, including any results reused from another job
+    results_archive_ids: frozenset[str] = frozenset()
+    # IDs of the jobs that are waiting for this job to finish to reuse its results
+    duplicate_job_ids: list[str] = []
 
     def get_type(self) -> QueryJobType:
         return QueryJobType.SEARCH_OR_AGGREGATION
@@ -97,8 +139,23 @@ class SearchJob(QueryJob):
         return self.search_config
 
 
+class SearchResultsSummary(BaseModel):
+    num_results: int
+    min_timestamp: int | None = None
+    max_timestamp: int | None = None
+
+
 class QueryTaskResult(BaseModel):
     status: QueryTaskStatus
     task_id: int
     duration: float
     error_log_path: str | None = None
+    # Time (in seconds) between the scheduler sending the task to the task queue and a worker
+    # starting it, if known
+    queue_duration: float | None = None
+    # Time (in seconds) spent running the task's command, if it ran
+    execution_duration: float | None = None
+    # Whether the task's archive was in the worker's archive cache, if the task used the cache
+    archive_cache_hit: bool | None = None
+    # Only set for search tasks that output their results to the results cache
+    results_summary: SearchResultsSummary | None = None
@@ -0,0 +1,239 @@
+#!/usr/bin/env -S uv run --script
+#
+# /// script
+# dependencies = [
+#   "boto3",
+#   "clp_py_utils",
+#   "job_orchestration",
+# ]
+# [tool.uv.sources]
+# clp-py-utils = { path = "../../../components/clp-py-utils", editable = true }
+# job-orchestration = { path = "../../../components/job-orchestration", editable = true }
+# ///
+
+"""
+Exercises the query worker's archive cache from several processes at once, the way a query worker's
+processes share it, and reports the cache's hit rate and the time spent opening archives.
+
+Each process repeatedly opens a random archive (with a skewed popularity, so some archives are
+reused often) through its own `ArchiveCache` instance and holds it for a short time, while the cache
+is much smaller than the total size of the archives, so archives are evicted concurrently with their
+downloads and uses. The benchmark verifies that:
+
+- Every archive that's yielded from the cache has the same content as its object in S3.
+- Every archive that fits in the cache is served from the cache (i.e., no download or eviction
+  fails and falls back to reading from S3).
+- Once every process is done, the cache's size is within the bound allowed by the archives that
+  couldn't be evicted while they were in use.
+
+The benchmark can be run against a local S3 stand-in, e.g., one started with
+`tools/scripts/localstack/start.py` and a bucket created with
+`tools/scripts/localstack/create-bucket.py`.
+"""
+
+import argparse
+import hashlib
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import boto3
+from clp_py_utils.clp_config import S3Config
+from job_orchestration.executor.query.archive_cache import (
+    ARCHIVE_CACHE_DIRECTORY_NAME,
+    ArchiveCache,
+    DOWNLOAD_FILE_NAME_PREFIX,
+)
+
+KIB = 1024
+DATASET = "default"
+
+
+@dataclass
+class _WorkerArgs:
+    cache_dir: Path
+    max_cache_size: int
+    s3_config: S3Config
+    archive_ids: list[str]
+    archive_weights: list[float]
+    archive_md5s: dict[str, str]
+    archive_sizes: dict[str, int]
+    num_opens: int
+    hold_time: float
+    seed: int
+
+
+@dataclass
+class _WorkerStats:
+    num_hits: int = 0
+    num_misses: int = 0
+    num_too_large: int = 0
+    num_fallbacks: int = 0
+    open_duration: float = 0
+
+
+def _get_file_md5(path: Path) -> str:
+    """
+    :param path:
+    :return: The MD5 digest of the file's content.
+    """
+    digest = hashlib.md5()  # noqa: S324
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(64 * KIB), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _run_worker(args: _WorkerArgs) -> _WorkerStats:
+    """
+    Opens random archives through the cache, verifying the content of each cached archive.
+
+    :param args:
+    :return: The worker's stats.
+    :raise ValueError: If a cached archive's content doesn't match its object in S3.
+    """
+    random.seed(args.seed)
+    archive_cache = ArchiveCache(args.cache_dir, args.max_cache_size, args.s3_config)
+    logger = multiprocessing.get_logger()
+    stats = _WorkerStats()
+    for _ in range(args.num_opens):
+        archive_id = random.choices(args.archive_ids, weights=args.archive_weights)[0]
+        start = time.perf_counter()
+        with archive_cache.open_archive(DATASET, archive_id, logger) as cached_archive:
+            stats.open_duration += time.perf_counter() - start
+            if cached_archive is None:
+                if args.archive_sizes[archive_id] > args.max_cache_size:
+                    stats.num_too_large += 1
+                else:
+                    stats.num_fallbacks += 1
+                continue
+            if cached_archive.is_cache_hit:
+                stats.num_hits += 1
+            else:
+                stats.num_misses += 1
+            if _get_file_md5(cached_archive.path) != args.archive_md5s[archive_id]:
+                raise ValueError(f"Cached archive {archive_id} doesn't match its object in S3.")
+            time.sleep(args.hold_time)
+    return stats
+
+
+def _get_cache_size(cache_dir: Path) -> int:
+    """
+    :param cache_dir:
+    :return: The total size of the archives in the cache.
+    """
+    dataset_dir = cache_dir / DATASET
+    if not dataset_dir.exists():
+        return 0
+    return sum(
+        path.stat().st_size
+        for path in dataset_dir.iterdir()
+        if not path.name.startswith(DOWNLOAD_FILE_NAME_PREFIX)
+    )
+
+
+def main() -> None:
+    """Main."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--endpoint-url", default="http://localhost:4566")
+    parser.add_argument("--region-code", default="us-east-1")
+    parser.add_argument("--bucket", default="clp-benchmark")
+    parser.add_argument("--key-prefix", default="archive-cache-benchmark/")
+    parser.add_argument("--num-archives", type=int, default=64)
+    parser.add_argument("--max-archive-size", type=int, default=512 * KIB)
+    parser.add_argument("--max-cache-size", type=int, default=4 * 1024 * KIB)
+    parser.add_argument("--num-processes", type=int, default=8)
+    parser.add_argument("--num-opens-per-process", type=int, default=200)
+    parser.add_argument("--hold-time", type=float, default=0.005)
+    args = parser.parse_args()
+
+    # The benchmark relies on the default credential chain (e.g., `AWS_ACCESS_KEY_ID`).
+    s3_config = S3Config(
+        endpoint_url=args.endpoint_url,
+        region_code=args.region_code,
+        bucket=args.bucket,
+        key_prefix=args.key_prefix,
+        aws_authentication={"type": "default"},
+    )
+    s3_client = boto3.client("s3", endpoint_url=args.endpoint_url, region_name=args.region_code)
+
+    archive_ids = [f"archive-{idx}" for idx in range(args.num_archives)]
+    archive_md5s = {}
+    archive_sizes = {}
+    for archive_id in archive_ids:
+        # Include a few archives that are larger than the cache
+        size = random.randint(1, args.max_archive_size)
+        if random.random() < 0.05:
+            size = args.max_cache_size + 1
+        content = os.urandom(size)
+        s3_client.put_object(
+            Bucket=args.bucket, Key=f"{args.key_prefix}{DATASET}/{archive_id}", Body=content
+        )
+        archive_md5s[archive_id] = hashlib.md5(content).hexdigest()  # noqa: S324
+        archive_sizes[archive_id] = size
+    # Zipf-like popularity
+    archive_weights = [1 / (rank + 1) for rank in range(args.num_archives)]
+
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_dir = Path(temp_dir) / ARCHIVE_CACHE_DIRECTORY_NAME
+            worker_args = [
+                _WorkerArgs(
+                    cache_dir=cache_dir,
+                    max_cache_size=args.max_cache_size,
+                    s3_config=s3_config,
+                    archive_ids=archive_ids,
+                    archive_weights=archive_weights,
+                    archive_md5s=archive_md5s,
+                    archive_sizes=archive_sizes,
+                    num_opens=args.num_opens_per_process,
+                    hold_time=args.hold_time,
+                    seed=seed,
+                )
+                for seed in range(args.num_processes)
+            ]
+            start = time.perf_counter()
+            with multiprocessing.Pool(args.num_processes) as pool:
+                worker_stats = pool.map(_run_worker, worker_args)
+            duration = time.perf_counter() - start
+            cache_size = _get_cache_size(cache_dir)
+    finally:
+        for archive_id in archive_ids:
+            s3_client.delete_object(
+                Bucket=args.bucket, Key=f"{args.key_prefix}{DATASET}/{archive_id}"
+            )
+
+    num_hits = sum(stats.num_hits for stats in worker_stats)
+    num_misses = sum(stats.num_misses for stats in worker_stats)
+    num_too_large = sum(stats.num_too_large for stats in worker_stats)
+    num_fallbacks = sum(stats.num_fallbacks for stats in worker_stats)
+    num_opens = num_hits + num_misses + num_too_large + num_fallbacks
+    open_duration = sum(stats.open_duration for stats in worker_stats)
+    print(
+        f"{num_opens} opens in {duration:.2f}s: {num_hits} hits, {num_misses} misses,"
+        f" {num_too_large} larger than the cache, {num_fallbacks} fallbacks to S3."
+    )
+    print(
+        f"Hit rate: {num_hits / max(1, num_hits + num_misses):.1%}; mean time to open an archive:"
+        f" {open_duration / max(1, num_opens) * 1000:.2f}ms."
+    )
+    print(f"Cache size after the run: {cache_size} B (max {args.max_cache_size} B).")
+
+    if num_fallbacks > 0:
+        raise ValueError(f"{num_fallbacks} archive(s) that fit in the cache fell back to S3.")
+    # An archive is added to the cache even if the archives that must be evicted to make room for
+    # it are in use, which each process can cause once at a time.
+    max_cacheable_archive_size = max(
+        (size for size in archive_sizes.values() if size <= args.max_cache_size), default=0
+    )
+    if cache_size > args.max_cache_size + args.num_processes * max_cacheable_archive_size:
+        raise ValueError("The cache exceeded its size bound.")
+    print("Every cached archive matched its object in S3.")
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env -S uv run --script
+#
+# /// script
+# dependencies = [
+#   "clp_py_utils",
+# ]
+# [tool.uv.sources]
+# clp-py-utils = { path = "../../../components/clp-py-utils", editable = true }
+# ///
+
+"""
+Benchmarks grouping files by similar filenames the way a compression job's paths buffer does it:
+files are added one at a time, and whenever the buffered size reaches twice the target archive size,
+files are taken from the groups until less than the target archive size remains buffered.
+
+The benchmark compares regrouping the whole buffer with `group_files_by_similar_filenames` at every
+trigger against grouping each file once with `FilenameTemplateGrouper`.
+"""
+
+import argparse
+import collections
+import operator
+import random
+import time
+from pathlib import Path
+
+from clp_py_utils.compression import FilenameTemplateGrouper, group_files_by_similar_filenames
+from clp_py_utils.core import FileMetadata
+
+FILE_SIZE = 1024
+SERVICE_NAMES = [
+    "api-gateway",
+    "auth",
+    "billing",
+    "db-proxy",
+    "ingest",
+    "kafka-broker",
+    "nginx-access",
+    "nginx-error",
+    "scheduler",
+    "worker",
+]
+
+
+def _generate_files(num_files: int, num_apps: int) -> list[FileMetadata]:
+    """
+    Generates files named like rotated logs (e.g., `auth-1.2024-01-02-10.17.log`), in random order.
+
+    :param num_files:
+    :param num_apps:
+    :return: The generated files.
+    """
+    files = []
+    for file_idx in range(num_files):
+        app_idx = file_idx % num_apps
+        day = file_idx // num_apps % 28 + 1
+        hour = file_idx // num_apps // 28 % 24
+        seq = file_idx // num_apps // 28 // 24
+        app_name = f"{SERVICE_NAMES[app_idx % len(SERVICE_NAMES)]}-{app_idx}"
+        name = f"{app_name}.2024-01-{day:02d}-{hour:02d}.{seq}.log"
+        files.append(FileMetadata(Path("/logs") / app_name / name, FILE_SIZE))
+    random.shuffle(files)
+    return files
+
+
+def _run_with_regrouping(files: list[FileMetadata], target_size: int) -> int:
+    """
+    :param files:
+    :param target_size:
+    :return: The number of groups formed at the last trigger.
+    """
+    buffered_files: list[FileMetadata] = []
+    buffered_size = 0
+    num_groups = 0
+    for i, file in enumerate(files):
+        buffered_files.append(file)
+        buffered_size += file.size
+        is_last_file = len(files) - 1 == i
+        if buffered_size < 2 * target_size and not is_last_file:
+            continue
+
+        groups = group_files_by_similar_filenames(buffered_files)
+        num_groups = len(groups)
+        remaining_files = []
+        for group in groups:
+            for group_file in group["files"]:
+                if buffered_size >= target_size or is_last_file:
+                    buffered_size -= group_file.size
+                else:
+                    remaining_files.append(group_file)
+        buffered_files = remaining_files
+    return num_groups
+
+
+def _run_with_template_grouper(files: list[FileMetadata], target_size: int) -> int:
+    """
+    :param files:
+    :param target_size:
+    :return: The number of groups formed.
+    """
+    grouper = FilenameTemplateGrouper()
+    file_groups: dict[int, list[tuple[str, FileMetadata]]] = {}
+    unsorted_group_ids: set[int] = set()
+    buffered_size = 0
+    num_groups = 0
+    for i, file in enumerate(files):
+        group_id = grouper.get_group_id(file)
+        num_groups = max(num_groups, group_id + 1)
+        file_groups.setdefault(group_id, []).append((file.path.name, file))
+        unsorted_group_ids.add(group_id)
+        buffered_size += file.size
+        is_last_file = len(files) - 1 == i
+        if buffered_size < 2 * target_size and not is_last_file:
+            continue
+
+        for unsorted_group_id in unsorted_group_ids:
+            file_groups[unsorted_group_id].sort(key=operator.itemgetter(0), reverse=True)
+        unsorted_group_ids.clear()
+
+        group_ids = collections.deque(file_groups)
+        while len(group_ids) > 0 and (buffered_size >= target_size or is_last_file):
+            group_id = group_ids.popleft()
+            group_files = file_groups[group_id]
+            _, group_file = group_files.pop()
+            buffered_size -= group_file.size
+            if len(group_files) == 0:
+                del file_groups[group_id]
+            else:
+                group_ids.append(group_id)
+    return num_groups
+
+
+def main() -> None:
+    """Main."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num-files", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--num-apps", type=int, default=50)
+    parser.add_argument(
+        "--target-num-files-per-archive",
+        type=int,
+        default=10_000,
+        help="The target archive size, in terms of the number of files.",
+    )
+    args = parser.parse_args()
+
+    target_size = args.target_num_files_per_archive * FILE_SIZE
+    for num_files in args.num_files:
+        files = _generate_files(num_files, args.num_apps)
+
+        start = time.perf_counter()
+        num_groups = _run_with_regrouping(list(files), target_size)
+        duration = time.perf_counter() - start
+        print(
+            f"{num_files} files, regrouping at every trigger: {duration:.2f}s ({num_groups} groups)"
+        )
+
+        start = time.perf_counter()
+        num_groups = _run_with_template_grouper(list(files), target_size)
+        duration = time.perf_counter() - start
+        print(f"{num_files} files, FilenameTemplateGrouper: {duration:.2f}s ({num_groups} groups)")
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env -S uv run --script
+#
+# /// script
+# dependencies = [
+#   "clp_py_utils",
+# ]
+# [tool.uv.sources]
+# clp-py-utils = { path = "../../../components/clp-py-utils", editable = true }
+# ///
+
+"""
+Benchmarks crawling a synthetic directory tree with `crawl_directory_and_get_info` against the
+`Path.rglob` + `validate_path_and_get_info` approach it replaces.
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from clp_py_utils.compression import (
+    crawl_directory_and_get_info,
+    FS_CRAWLER_DEFAULT_NUM_THREADS,
+    validate_path_and_get_info,
+)
+
+
+def _create_tree(root: Path, num_files: int, num_files_per_dir: int, num_dirs_per_dir: int) -> None:
+    """
+    Creates a tree of empty directories and small files under `root`.
+
+    :param root:
+    :param num_files:
+    :param num_files_per_dir:
+    :param num_dirs_per_dir: The fan-out of the directory tree.
+    """
+    num_dirs = (num_files + num_files_per_dir - 1) // num_files_per_dir
+    file_idx = 0
+    for dir_idx in range(num_dirs):
+        # Place directory `dir_idx` under directory `(dir_idx - 1) // num_dirs_per_dir`
+        dir_path_parts = []
+        node_idx = dir_idx
+        while node_idx > 0:
+            dir_path_parts.append(f"dir-{node_idx}")
+            node_idx = (node_idx - 1) // num_dirs_per_dir
+        dir_path = root.joinpath(*reversed(dir_path_parts))
+        dir_path.mkdir(parents=True, exist_ok=True)
+
+        for _ in range(min(num_files_per_dir, num_files - file_idx)):
+            (dir_path / f"app-{file_idx}.log").write_bytes(b"log\n")
+            file_idx += 1
+
+
+def _crawl_with_rglob(root: Path) -> int:
+    """
+    :param root:
+    :return: The number of paths found.
+    """
+    num_paths = 0
+    for path in root.rglob("*"):
+        file, empty_directory = validate_path_and_get_info(root, path)
+        if file is not None or empty_directory is not None:
+            num_paths += 1
+    return num_paths
+
+
+def _crawl_with_crawler(root: Path, num_threads: int) -> int:
+    """
+    :param root:
+    :param num_threads:
+    :return: The number of paths found.
+    """
+    num_paths = 0
+    for _, _, error_msg in crawl_directory_and_get_info(root, root, num_threads):
+        if error_msg is not None:
+            raise ValueError(error_msg)
+        num_paths += 1
+    return num_paths
+
+
+def main() -> None:
+    """Main."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num-files", type=int, default=1_000_000)
+    parser.add_argument("--num-files-per-dir", type=int, default=1000)
+    parser.add_argument("--num-dirs-per-dir", type=int, default=10)
+    parser.add_argument("--num-threads", type=int, default=FS_CRAWLER_DEFAULT_NUM_THREADS)
+    parser.add_argument(
+        "--tree-dir",
+        type=Path,
+        help="Directory to create the tree in (or to reuse if it already exists).",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root: Path = args.tree_dir if args.tree_dir is not None else Path(temp_dir)
+        root = root.resolve()
+        if not root.exists() or next(root.iterdir(), None) is None:
+            print(f"Creating {args.num_files} files under {root}...")
+            _create_tree(root, args.num_files, args.num_files_per_dir, args.num_dirs_per_dir)
+
+        start = time.perf_counter()
+        num_paths = _crawl_with_rglob(root)
+        duration = time.perf_counter() - start
+        print(f"rglob + validate_path_and_get_info: {num_paths} paths in {duration:.2f}s")
+
+        start = time.perf_counter()
+        num_paths = _crawl_with_crawler(root, args.num_threads)
+        duration = time.perf_counter() - start
+        print(
+            f"crawl_directory_and_get_info ({args.num_threads} threads): {num_paths} paths in"
+            f" {duration:.2f}s"
+        )
+
+
+if "__main__" == __name__:
+    main()
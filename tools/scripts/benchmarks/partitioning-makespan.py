@@ -0,0 +1,161 @@
+#!/usr/bin/env -S uv run --script
+#
+# /// script
+# dependencies = [
+#   "clp_py_utils",
+#   "job_orchestration",
+# ]
+# [tool.uv.sources]
+# clp-py-utils = { path = "../../../components/clp-py-utils", editable = true }
+# job-orchestration = { path = "../../../components/job-orchestration", editable = true }
+# ///
+
+"""
+Simulates the makespan of compression jobs whose files are partitioned using each partitioning
+strategy, for files with skewed (log-normal) sizes.
+
+Two scenarios are simulated:
+- `add_files`: The files are split into a fixed number of partitions, each compressed by its own
+  worker, so the makespan is the time to compress the largest partition.
+- `add_file` + `flush`: The files are streamed through a paths buffer for a job whose concurrency
+  is bounded by the number of workers, and the resulting partitions are list-scheduled, in order,
+  onto the workers.
+"""
+
+import argparse
+import heapq
+import json
+import random
+from pathlib import Path
+
+from clp_py_utils.clp_config import PartitioningStrategy
+from clp_py_utils.core import FileMetadata
+from job_orchestration.scheduler.compress.partition import PathsToCompressBuffer
+from job_orchestration.scheduler.job_config import ClpIoConfig, FsInputConfig, OutputConfig
+
+MIB = 1024 * 1024
+
+
+def _generate_files(num_files: int, num_apps: int, sigma: float) -> list[FileMetadata]:
+    """
+    :param num_files:
+    :param num_apps:
+    :param sigma: The standard deviation of the log of the file sizes.
+    :return: Files with log-normally distributed sizes (median 1 MiB), in random order.
+    """
+    files = []
+    for file_idx in range(num_files):
+        app_idx = file_idx % num_apps
+        size = max(1, int(random.lognormvariate(0, sigma) * MIB))
+        path = Path("/logs") / f"app{chr(ord('a') + app_idx % 26)}-{file_idx}.log"
+        files.append(FileMetadata(path, size))
+    random.shuffle(files)
+    return files
+
+
+def _create_buffer(
+    target_archive_size: int,
+    partitioning_strategy: PartitioningStrategy,
+    max_concurrent_tasks: int | None = None,
+) -> PathsToCompressBuffer:
+    """
+    :param target_archive_size:
+    :param partitioning_strategy:
+    :param max_concurrent_tasks:
+    :return: A buffer for a job using the given strategy.
+    """
+    output_config = OutputConfig(
+        target_archive_size=target_archive_size,
+        target_dictionaries_size=target_archive_size,
+        target_segment_size=target_archive_size,
+        target_encoded_file_size=target_archive_size,
+        compression_level=3,
+        partitioning_strategy=partitioning_strategy,
+    )
+    clp_io_config = ClpIoConfig(
+        input=FsInputConfig(paths_to_compress=["/logs"]), output=output_config
+    )
+    return PathsToCompressBuffer(
+        maintain_file_ordering=False,
+        empty_directories_allowed=False,
+        scheduling_job_id=0,
+        clp_io_config=clp_io_config,
+        clp_metadata_db_connection_config={},
+        max_concurrent_tasks=max_concurrent_tasks,
+    )
+
+
+def _get_partition_sizes(buffer: PathsToCompressBuffer) -> list[int]:
+    """
+    :param buffer:
+    :return: The size of each partition the buffer has created, in the order of its tasks.
+    """
+    return [
+        sum(json.loads(task["paths_to_compress_json"])["st_sizes"]) for task in buffer.get_tasks()
+    ]
+
+
+def _get_list_scheduled_makespan(partition_sizes: list[int], num_workers: int) -> int:
+    """
+    :param partition_sizes:
+    :param num_workers:
+    :return: The makespan, in bytes, of running the partitions in order, each on the first worker
+    to become free.
+    """
+    worker_finish_times = [0] * num_workers
+    for partition_size in partition_sizes:
+        heapq.heappush(worker_finish_times, heapq.heappop(worker_finish_times) + partition_size)
+    return max(worker_finish_times)
+
+
+def _print_result(name: str, partition_sizes: list[int], makespan: int, throughput: float) -> None:
+    mean_size = sum(partition_sizes) / len(partition_sizes)
+    print(
+        f"  {name:<12} partitions={len(partition_sizes):<4}"
+        f" max/mean size={max(partition_sizes) / mean_size:.2f}"
+        f" makespan={makespan / MIB / throughput:.1f}s"
+    )
+
+
+def main() -> None:
+    """Main."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num-files", type=int, default=20_000)
+    parser.add_argument("--num-apps", type=int, default=20)
+    parser.add_argument("--sigma", type=float, default=1.5)
+    parser.add_argument("--num-archives", type=int, default=32)
+    parser.add_argument("--num-workers", type=int, default=16)
+    parser.add_argument("--target-archive-size", type=int, default=256 * MIB)
+    parser.add_argument(
+        "--throughput", type=float, default=50.0, help="Compression throughput in MiB/s/worker."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    files = _generate_files(args.num_files, args.num_apps, args.sigma)
+    total_size = sum(file.size for file in files)
+    print(f"{len(files)} files, {total_size / MIB:.0f} MiB in total")
+
+    print(f"add_files into {args.num_archives} archives:")
+    for strategy in PartitioningStrategy:
+        buffer = _create_buffer(args.target_archive_size, strategy)
+        # Allow partitions to grow large enough to hold all the files
+        archive_size_limit = total_size // args.num_archives + max(file.size for file in files)
+        buffer.add_files(args.num_archives, archive_size_limit, list(files))
+        partition_sizes = _get_partition_sizes(buffer)
+        _print_result(strategy.value, partition_sizes, max(partition_sizes), args.throughput)
+
+    print(f"add_file + flush on {args.num_workers} workers:")
+    for strategy in PartitioningStrategy:
+        buffer = _create_buffer(args.target_archive_size, strategy, args.num_workers)
+        for file in files:
+            buffer.add_file(file)
+        buffer.flush()
+        partition_sizes = _get_partition_sizes(buffer)
+        makespan = _get_list_scheduled_makespan(partition_sizes, args.num_workers)
+        _print_result(strategy.value, partition_sizes, makespan, args.throughput)
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env -S uv run --script
+#
+# /// script
+# dependencies = [
+#   "clp_py_utils",
+#   "job_orchestration",
+# ]
+# [tool.uv.sources]
+# clp-py-utils = { path = "../../../components/clp-py-utils", editable = true }
+# job-orchestration = { path = "../../../components/job-orchestration", editable = true }
+# ///
+
+"""
+Simulates the latency of interactive search jobs (searches for a bounded number of the latest
+results, which terminate after searching the latest archives) that arrive while long-running
+background jobs are searching every archive, using each query scheduling policy.
+
+The simulation models the query scheduler's batch dispatch mode: each job dispatches up to
+`num_archives_to_search_per_sub_job` archives at a time, and dispatches its next sub-job once every
+task in the current one finishes. The tasks are consumed from the task queue, in priority order, by
+a fixed number of workers.
+"""
+
+import argparse
+import heapq
+import itertools
+import math
+import random
+import statistics
+from dataclasses import dataclass, field
+
+from clp_py_utils.clp_config import QueryScheduler, QuerySchedulingPolicy
+from job_orchestration.scheduler.job_config import SearchJobConfig
+from job_orchestration.scheduler.query.scheduling_policy import (
+    allocate_search_task_slots,
+    get_search_job_priority,
+    is_fast_lane_search_job,
+    SearchJobDemand,
+)
+
+
+@dataclass
+class _Job:
+    id: str
+    search_config: SearchJobConfig
+    arrival_time: float
+    num_remaining_archives: int
+    num_in_flight_tasks: int = 0
+    completion_time: float | None = None
+    is_interactive: bool = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.is_interactive = self.search_config.max_num_results > 0
+
+
+class _Simulation:
+    def __init__(
+        self,
+        scheduling_policy: QuerySchedulingPolicy,
+        max_concurrent_search_tasks: int,
+        num_workers: int,
+        num_archives_to_search_per_sub_job: int,
+        median_task_duration: float,
+        sigma: float,
+    ) -> None:
+        self.__scheduling_policy = scheduling_policy
+        self.__max_concurrent_search_tasks = max_concurrent_search_tasks
+        self.__num_free_workers = num_workers
+        self.__num_archives_to_search_per_sub_job = num_archives_to_search_per_sub_job
+        self.__median_task_duration = median_task_duration
+        self.__sigma = sigma
+
+        self.__now = 0.0
+        self.__seq = itertools.count()
+        # Min-heap of (time, seq, job) for task completions (job is None for job arrivals)
+        self.__events: list[tuple[float, int, _Job | None]] = []
+        # Min-heap of (-priority, seq, job) for queued tasks
+        self.__task_queue: list[tuple[int, int, _Job]] = []
+        self.__arrivals: dict[int, _Job] = {}
+        self.jobs: list[_Job] = []
+
+    def add_job(self, job: _Job) -> None:
+        seq = next(self.__seq)
+        self.__arrivals[seq] = job
+        heapq.heappush(self.__events, (job.arrival_time, seq, None))
+
+    def run(self) -> None:
+        while len(self.__events) > 0:
+            self.__now, seq, job = heapq.heappop(self.__events)
+            if job is None:
+                self.jobs.append(self.__arrivals.pop(seq))
+            else:
+                self.__num_free_workers += 1
+                job.num_in_flight_tasks -= 1
+                if 0 == job.num_in_flight_tasks and 0 == job.num_remaining_archives:
+                    job.completion_time = self.__now
+            self.__dispatch()
+            self.__start_tasks()
+
+    def __dispatch(self) -> None:
+        # In batch dispatch mode, only jobs whose previous sub-job has finished dispatch tasks.
+        pending_jobs = [
+            job
+            for job in self.jobs
+            if 0 == job.num_in_flight_tasks and job.num_remaining_archives > 0
+        ]
+        demands = [
+            SearchJobDemand(
+                job_id=job.id,
+                priority=get_search_job_priority(job.search_config),
+                is_fast_lane=is_fast_lane_search_job(job.search_config),
+                num_in_flight_tasks=0,
+                num_tasks_wanted=min(
+                    job.num_remaining_archives, self.__num_archives_to_search_per_sub_job
+                ),
+            )
+            for job in pending_jobs
+        ]
+
+        num_free_slots = None
+        is_fair_share = QuerySchedulingPolicy.FAIR_SHARE == self.__scheduling_policy
+        if (
+            is_fair_share
+            and QueryScheduler.UNLIMITED_CONCURRENT_SEARCH_TASKS
+            != self.__max_concurrent_search_tasks
+        ):
+            num_in_flight_tasks = sum(job.num_in_flight_tasks for job in self.jobs)
+            num_free_slots = max(0, self.__max_concurrent_search_tasks - num_in_flight_tasks)
+        num_tasks_by_job_id = allocate_search_task_slots(demands, num_free_slots)
+
+        for job, demand in zip(pending_jobs, demands, strict=True):
+            num_tasks = num_tasks_by_job_id[job.id]
+            priority = demand.priority if is_fair_share else 0
+            job.num_remaining_archives -= num_tasks
+            job.num_in_flight_tasks += num_tasks
+            for _ in range(num_tasks):
+                heapq.heappush(self.__task_queue, (-priority, next(self.__seq), job))
+
+    def __start_tasks(self) -> None:
+        while self.__num_free_workers > 0 and len(self.__task_queue) > 0:
+            _, _, job = heapq.heappop(self.__task_queue)
+            self.__num_free_workers -= 1
+            duration = self.__median_task_duration * random.lognormvariate(0, self.__sigma)
+            heapq.heappush(self.__events, (self.__now + duration, next(self.__seq), job))
+
+
+def _get_percentile(values: list[float], percentile: float) -> float:
+    sorted_values = sorted(values)
+    idx = max(0, math.ceil(percentile / 100 * len(sorted_values)) - 1)
+    return sorted_values[idx]
+
+
+def main() -> None:
+    """Main."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--num-workers", type=int, default=16)
+    parser.add_argument("--num-archives-to-search-per-sub-job", type=int, default=16)
+    parser.add_argument("--max-concurrent-search-tasks", type=int, default=32)
+    parser.add_argument("--num-background-jobs", type=int, default=4)
+    parser.add_argument("--num-archives-per-background-job", type=int, default=5_000)
+    parser.add_argument("--num-interactive-jobs", type=int, default=500)
+    parser.add_argument(
+        "--num-archives-per-interactive-job",
+        type=int,
+        default=16,
+        help="The number of archives an interactive job searches before terminating early.",
+    )
+    parser.add_argument(
+        "--interactive-job-arrival-rate", type=float, default=0.5, help="Jobs per second."
+    )
+    parser.add_argument(
+        "--median-task-duration", type=float, default=0.2, help="Seconds per archive."
+    )
+    parser.add_argument("--sigma", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for scheduling_policy in QuerySchedulingPolicy:
+        random.seed(args.seed)
+        simulation = _Simulation(
+            scheduling_policy,
+            args.max_concurrent_search_tasks,
+            args.num_workers,
+            args.num_archives_to_search_per_sub_job,
+            args.median_task_duration,
+            args.sigma,
+        )
+        for job_idx in range(args.num_background_jobs):
+            simulation.add_job(
+                _Job(
+                    id=f"background-{job_idx}",
+                    search_config=SearchJobConfig(query_string="*", max_num_results=0),
+                    arrival_time=0.0,
+                    num_remaining_archives=args.num_archives_per_background_job,
+                )
+            )
+        arrival_time = 0.0
+        for job_idx in range(args.num_interactive_jobs):
+            arrival_time += random.expovariate(args.interactive_job_arrival_rate)
+            simulation.add_job(
+                _Job(
+                    id=f"interactive-{job_idx}",
+                    search_config=SearchJobConfig(query_string="error", max_num_results=1000),
+                    arrival_time=arrival_time,
+                    num_remaining_archives=args.num_archives_per_interactive_job,
+                )
+            )
+        simulation.run()
+
+        interactive_latencies = [
+            job.completion_time - job.arrival_time for job in simulation.jobs if job.is_interactive
+        ]
+        background_completion_times = [
+            job.completion_time for job in simulation.jobs if not job.is_interactive
+        ]
+        print(
+            f"{scheduling_policy.value:<10}"
+            f" interactive p50={_get_percentile(interactive_latencies, 50):.2f}s"
+            f" p99={_get_percentile(interactive_latencies, 99):.2f}s"
+            f" mean={statistics.mean(interactive_latencies):.2f}s"
+            f" | background makespan={max(background_completion_times):.0f}s"
+        )
+
+
+if "__main__" == __name__:
+    main()
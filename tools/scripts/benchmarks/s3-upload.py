@@ -0,0 +1,106 @@
+#!/usr/bin/env -S uv run --script
+#
+# /// script
+# dependencies = [
+#   "boto3",
+#   "clp_py_utils",
+# ]
+# [tool.uv.sources]
+# clp-py-utils = { path = "../../../components/clp-py-utils", editable = true }
+# ///
+
+"""
+Benchmarks uploading a file with `s3_put` (multipart for large files, with concurrent part uploads)
+against a single PutObject operation, and verifies that both uploads round-trip the file's content.
+
+The benchmark can be run against a local S3 stand-in, e.g., one started with
+`tools/scripts/localstack/start.py` and a bucket created with
+`tools/scripts/localstack/create-bucket.py`.
+"""
+
+import argparse
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import boto3
+from clp_py_utils.clp_config import S3Config
+from clp_py_utils.s3_utils import s3_put
+
+MIB = 1024 * 1024
+
+
+def _get_object_md5(s3_client, bucket: str, key: str) -> str:
+    """
+    :param s3_client:
+    :param bucket:
+    :param key:
+    :return: The MD5 digest of the object's content.
+    """
+    digest = hashlib.md5()  # noqa: S324
+    for chunk in s3_client.get_object(Bucket=bucket, Key=key)["Body"].iter_chunks(MIB):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def main() -> None:
+    """Main."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--endpoint-url", default="http://localhost:4566")
+    parser.add_argument("--region-code", default="us-east-1")
+    parser.add_argument("--bucket", default="clp-benchmark")
+    parser.add_argument("--key-prefix", default="s3-upload-benchmark/")
+    parser.add_argument("--file-size", type=int, default=1024 * MIB)
+    parser.add_argument("--part-size", type=int, default=64 * MIB)
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    # The benchmark relies on the default credential chain (e.g., `AWS_ACCESS_KEY_ID`).
+    s3_config = S3Config(
+        endpoint_url=args.endpoint_url,
+        region_code=args.region_code,
+        bucket=args.bucket,
+        key_prefix=args.key_prefix,
+        aws_authentication={"type": "default"},
+        upload_part_size=args.part_size,
+        upload_max_concurrency=args.max_concurrency,
+    )
+    s3_client = boto3.client("s3", endpoint_url=args.endpoint_url, region_name=args.region_code)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        src_file = Path(temp_dir) / "file.bin"
+        digest = hashlib.md5()  # noqa: S324
+        with src_file.open("wb") as f:
+            for _ in range(0, args.file_size, MIB):
+                chunk = os.urandom(MIB)
+                f.write(chunk)
+                digest.update(chunk)
+        src_md5 = digest.hexdigest()
+        file_size = src_file.stat().st_size
+
+        single_key = args.key_prefix + "single-put"
+        start = time.perf_counter()
+        with src_file.open("rb") as f:
+            s3_client.put_object(Bucket=args.bucket, Key=single_key, Body=f)
+        duration = time.perf_counter() - start
+        print(f"PutObject: {file_size / MIB / duration:.1f} MiB/s ({duration:.2f}s)")
+
+        start = time.perf_counter()
+        s3_put(s3_config, src_file, "s3-put")
+        duration = time.perf_counter() - start
+        print(
+            f"s3_put (part size {args.part_size // MIB} MiB, concurrency {args.max_concurrency}):"
+            f" {file_size / MIB / duration:.1f} MiB/s ({duration:.2f}s)"
+        )
+
+        for key in (single_key, args.key_prefix + "s3-put"):
+            if _get_object_md5(s3_client, args.bucket, key) != src_md5:
+                raise ValueError(f"Content of {key} doesn't match the uploaded file.")
+            s3_client.delete_object(Bucket=args.bucket, Key=key)
+        print("Both uploads match the source file.")
+
+
+if "__main__" == __name__:
+    main()